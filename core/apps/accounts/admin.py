@@ -1,12 +1,186 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.utils import lookup_spawns_duplicates
+from django.contrib.admin.views.main import ALL_VAR, ORDER_VAR, ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.sites.shortcuts import get_current_site
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
 
-from . import models
+from . import admin_search, approval, models
+from .pagination import (
+    ORDERING,
+    ApproximateCountPaginator,
+    InvalidCursor,
+    KeysetPaginator,
+)
+
+CURSOR_VAR = "cursor"
+
+
+def is_autocomplete(request, admin_site) -> bool:
+    match = getattr(request, "resolver_match", None)
+    return match is not None and match.view_name == f"{admin_site.name}:autocomplete"
+
+
+class ProjectedChangeList(ChangeList):
+    """
+    A changelist that reads only the model admin's list_only columns of the
+    rows it shows. Actions and list_editable saves still get whole rows.
+    """
+
+    def get_results(self, request):
+        if self.model_admin.list_only:
+            self.queryset = self.queryset.only(*self.model_admin.list_only)
+        self.paginate(request)
+
+    def paginate(self, request):
+        super().get_results(request)
+
+
+class KeysetChangeList(ProjectedChangeList):
+    """
+    A changelist that pages by (created_at, id) cursors instead of page
+    numbers while it is in its default order. Sorting by a column or showing
+    all rows falls back to the usual pagination.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.keyset_page = None
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(CURSOR_VAR, None)
+        return params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # A cursor only makes sense for the listing it came from, so links
+        # that change filters or order drop it.
+        return super().get_query_string(
+            {CURSOR_VAR: None, **(new_params or {})}, remove
+        )
+
+    def paginate(self, request):
+        if ORDER_VAR in self.params or ALL_VAR in self.params:
+            return super().paginate(request)
+
+        paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        )
+        result_count = paginator.count
+        if self.model_admin.show_full_result_count:
+            full_result_count = self.root_queryset.count()
+        else:
+            full_result_count = None
+
+        try:
+            page = KeysetPaginator(self.queryset, self.list_per_page).page(self.cursor)
+        except InvalidCursor:
+            raise IncorrectLookupParameters
+
+        # list_editable builds its formset from a queryset; hand it one that
+        # already holds the page's rows.
+        result_list = self.queryset.filter(pk__in=[obj.pk for obj in page])
+        result_list._result_cache = list(page)
+        result_list._prefetch_done = True
+
+        self.result_count = result_count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(
+            full_result_count
+        )
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = result_count <= self.list_max_show_all
+        self.multi_page = page.has_other_pages()
+        self.paginator = paginator
+        self.keyset_page = page
+
+    def keyset_url(self, cursor):
+        return self.get_query_string({CURSOR_VAR: cursor})
+
+    @property
+    def first_page_url(self):
+        return self.get_query_string()
+
+    @property
+    def next_page_url(self):
+        return self.keyset_url(self.keyset_page.next_cursor)
+
+    @property
+    def previous_page_url(self):
+        return self.keyset_url(self.keyset_page.previous_cursor)
+
+
+class ListQueryMixin:
+    """
+    Loads a ModelAdmin's changelist page and autocomplete results in a fixed
+    number of queries, however many rows they hold. list_select_related
+    joins the relations that list_display and __str__ go through. list_only
+    names the columns a changelist row reads, including those of __str__,
+    which labels the action checkbox; autocomplete_only those of __str__
+    alone, the text of a result. The primary key is always loaded.
+    """
+
+    list_only = ()
+    autocomplete_only = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ProjectedChangeList
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if is_autocomplete(request, self.admin_site):
+            if isinstance(self.list_select_related, (list, tuple)):
+                queryset = queryset.select_related(*self.list_select_related)
+            if self.autocomplete_only:
+                queryset = queryset.only(*self.autocomplete_only)
+        return queryset
+
+
+class KeysetPaginationMixin(ListQueryMixin):
+    """Pages a ModelAdmin's changelist with KeysetChangeList."""
+
+    ordering = list(ORDERING)
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+class IndexedSearchMixin:
+    """
+    Answers changelist and autocomplete searches with
+    apps.accounts.admin_search, from the indexes it installs.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        if not search_fields or not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        may_have_duplicates = any(
+            lookup_spawns_duplicates(self.opts, path) for path in search_fields
+        )
+        queryset = admin_search.search(queryset, search_fields, search_term)
+        return queryset, may_have_duplicates
+
+
+class ApproximateCountMixin:
+    """
+    Counts a large table's changelist from the planner's estimate, and skips
+    the second, unfiltered count next to the filtered one.
+    """
+
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(models.User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(
+    IndexedSearchMixin, ApproximateCountMixin, KeysetPaginationMixin, BaseUserAdmin
+):
     list_display = (
         "email",
         "username",
@@ -15,10 +189,11 @@ class UserAdmin(BaseUserAdmin):
         "is_superuser",
         "last_login",
     )
+    list_only = list_display + ("created_at",)
+    autocomplete_only = ("email",)
     list_filter = ("is_active", "is_staff", "is_superuser")
     search_fields = ("email", "username")
     readonly_fields = ("last_login", "created_at", "updated_at")
-    ordering = ["-created_at"]
 
     fieldsets = (
         (None, {"fields": ("email", "username", "password")}),
@@ -58,7 +233,9 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(models.Profile)
-class ProfileAdmin(admin.ModelAdmin):
+class ProfileAdmin(
+    IndexedSearchMixin, ApproximateCountMixin, ListQueryMixin, admin.ModelAdmin
+):
     list_display = (
         "user",
         "first_name",
@@ -67,6 +244,16 @@ class ProfileAdmin(admin.ModelAdmin):
         "phone",
         "is_public",
     )
+    list_select_related = ("user",)
+    list_only = (
+        "user__email",
+        "user__username",
+        "first_name",
+        "last_name",
+        "gender",
+        "phone",
+        "is_public",
+    )
     list_filter = ("gender", "is_public")
     search_fields = (
         "user__email",
@@ -104,7 +291,9 @@ class ProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Instructor)
-class InstructorAdmin(admin.ModelAdmin):
+class InstructorAdmin(
+    IndexedSearchMixin, ApproximateCountMixin, KeysetPaginationMixin, admin.ModelAdmin
+):
     list_display = (
         "user",
         "job_title",
@@ -112,13 +301,26 @@ class InstructorAdmin(admin.ModelAdmin):
         "experience_year",
         "job_start_date",
     )
+    list_select_related = ("user",)
+    list_only = (
+        "user__email",
+        "user__username",
+        "job_title",
+        "status",
+        "experience_year",
+        "job_start_date",
+        "created_at",
+    )
+    autocomplete_only = ("user__username", "job_title")
     list_editable = ["status"]
     list_filter = ["status", "job_title", "job_start_date"]
     search_fields = ["user__username", "user__email", "job_title"]
 
 
 @admin.register(models.ApplyInstructor)
-class ApplyInstructorAdmin(admin.ModelAdmin):
+class ApplyInstructorAdmin(
+    ApproximateCountMixin, KeysetPaginationMixin, admin.ModelAdmin
+):
     list_display = (
         "phone",
         "email",
@@ -126,16 +328,71 @@ class ApplyInstructorAdmin(admin.ModelAdmin):
         "status",
         "updated_at",
     )
-    list_editable = [
-        "status",
-    ]
+    list_only = list_display + ("first_name", "last_name", "created_at")
     list_filter = ["gender", "status"]
     search_fields = ["first_name", "last_name", "email", "phone"]
+    # Approving provisions the instructor, which only approve_selected does,
+    # so the status isn't editable by hand.
+    readonly_fields = ["status"]
+    actions = ["approve_selected", "reject_selected"]
+
+    @admin.action(
+        description=_("Approve selected applications"),
+        permissions=["change"],
+    )
+    def approve_selected(self, request, queryset):
+        result = approval.approve(queryset, get_current_site(request).domain)
+        self.message_user(
+            request,
+            ngettext(
+                "%d application was approved.",
+                "%d applications were approved.",
+                len(result.approved),
+            )
+            % len(result.approved),
+            messages.SUCCESS,
+        )
+        if result.conflicts:
+            self.message_user(
+                request,
+                _("Left pending, their email already has an account: %s")
+                % ", ".join(application.email for application in result.conflicts),
+                messages.WARNING,
+            )
+
+    @admin.action(
+        description=_("Reject selected applications"),
+        permissions=["change"],
+    )
+    def reject_selected(self, request, queryset):
+        rejected = queryset.filter(status=models.ApplyInstructor.STATUS.PENDING).update(
+            status=models.ApplyInstructor.STATUS.REJECTED, updated_at=timezone.now()
+        )
+        self.message_user(
+            request,
+            ngettext(
+                "%d application was rejected.",
+                "%d applications were rejected.",
+                rejected,
+            )
+            % rejected,
+            messages.SUCCESS,
+        )
 
 
 @admin.register(models.Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(
+    IndexedSearchMixin, ApproximateCountMixin, ListQueryMixin, admin.ModelAdmin
+):
     list_display = ("instructor", "name", "level", "created_at")
+    list_select_related = ("instructor__user",)
+    list_only = (
+        "instructor__user__username",
+        "instructor__job_title",
+        "name",
+        "level",
+        "created_at",
+    )
     list_filter = ("level",)
     search_fields = ("instructor__user__email", "name")
     autocomplete_fields = ("instructor",)
@@ -143,7 +400,9 @@ class SkillAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Education)
-class EducationAdmin(admin.ModelAdmin):
+class EducationAdmin(
+    IndexedSearchMixin, ApproximateCountMixin, ListQueryMixin, admin.ModelAdmin
+):
     list_display = (
         "instructor",
         "major",
@@ -153,6 +412,16 @@ class EducationAdmin(admin.ModelAdmin):
         "end",
         "is_finished",
     )
+    list_select_related = ("instructor__user",)
+    list_only = (
+        "instructor__user__username",
+        "instructor__job_title",
+        "major",
+        "degree",
+        "institution",
+        "start",
+        "end",
+    )
     list_filter = ("degree", "institution")
     search_fields = ("instructor__user__email", "major", "institution")
     autocomplete_fields = ("instructor",)
@@ -160,7 +429,9 @@ class EducationAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Experience)
-class ExperienceAdmin(admin.ModelAdmin):
+class ExperienceAdmin(
+    IndexedSearchMixin, ApproximateCountMixin, ListQueryMixin, admin.ModelAdmin
+):
     list_display = (
         "instructor",
         "job_title",
@@ -170,6 +441,16 @@ class ExperienceAdmin(admin.ModelAdmin):
         "end",
         "is_finished",
     )
+    list_select_related = ("instructor__user",)
+    list_only = (
+        "instructor__user__username",
+        "instructor__job_title",
+        "job_title",
+        "company",
+        "level",
+        "start",
+        "end",
+    )
     list_filter = ("level", "company")
     search_fields = ("instructor__user__email", "job_title", "company")
     autocomplete_fields = ("instructor",)
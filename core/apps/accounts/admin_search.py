@@ -0,0 +1,180 @@
+"""
+Indexed substring search for the accounts admin.
+
+The admin's own search turns every search field into an
+``UPPER(column::text) LIKE '%term%'``, ORs them together across joins, and
+leaves the database nothing to answer them with but a sequential scan.
+``install()`` indexes the searched columns instead; migrations 0010 and 0013
+hold copies of the same SQL, 0013 creating pg_trgm where the database role
+is allowed to:
+
+* on PostgreSQL, with pg_trgm GIN indexes on ``UPPER(column::text)``, the
+  expression icontains and istartswith compare, for substrings, and
+  text_pattern_ops indexes on the same expression for prefixes too short to
+  hold a trigram;
+* without pg_trgm, with prefix indexes alone: the text_pattern_ops ones on
+  PostgreSQL, NOCASE indexes on SQLite.
+
+``search()`` builds the admin's search condition the way those indexes can
+answer it. A word matches anywhere in a field where there are trigram
+indexes and it is MIN_TRIGRAM_LENGTH long, and as a prefix otherwise. Such
+a word is selective, so when the search fields span related models each
+table is searched with its own indexes and the matches are combined by
+primary key; shorter words are left to the admin's join.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import connection, connections
+from django.db.models import Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.text import smart_split, unescape_string_literal
+
+from .models import Education, Experience, Instructor, Profile, Skill, User
+
+logger = logging.getLogger(__name__)
+
+# Words shorter than a trigram can't narrow a trigram index scan.
+MIN_TRIGRAM_LENGTH = 3
+
+# The columns the accounts admins search, by model.
+INDEXED_FIELDS = {
+    User: ["email", "username"],
+    Profile: ["first_name", "last_name", "phone"],
+    Instructor: ["job_title"],
+    Skill: ["name"],
+    Education: ["major", "institution"],
+    Experience: ["job_title", "company"],
+}
+
+
+def _columns():
+    for model, fields in INDEXED_FIELDS.items():
+        for name in fields:
+            yield model._meta.db_table, model._meta.get_field(name).column
+
+
+TRIGRAM_INSTALL = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+POSTGRESQL_INSTALL = []
+POSTGRESQL_UNINSTALL = []
+SQLITE_INSTALL = []
+SQLITE_UNINSTALL = []
+for table, column in _columns():
+    TRIGRAM_INSTALL.append(
+        f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} "
+        f"USING gin (UPPER({column}::text) gin_trgm_ops)"
+    )
+    POSTGRESQL_INSTALL.append(
+        f"CREATE INDEX IF NOT EXISTS {table}_{column}_prefix ON {table} "
+        f"(UPPER({column}::text) text_pattern_ops)"
+    )
+    POSTGRESQL_UNINSTALL += [
+        f"DROP INDEX IF EXISTS {table}_{column}_trgm",
+        f"DROP INDEX IF EXISTS {table}_{column}_prefix",
+    ]
+    SQLITE_INSTALL.append(
+        f"CREATE INDEX IF NOT EXISTS {table}_{column}_prefix "
+        f"ON {table} ({column} COLLATE NOCASE)"
+    )
+    SQLITE_UNINSTALL.append(f"DROP INDEX IF EXISTS {table}_{column}_prefix")
+
+# Whether each database has the trigram indexes, by connection alias.
+_trigrams = {}
+
+
+def install(connection=connection) -> None:
+    """Create the search indexes in the connection's database."""
+    statements = {"postgresql": POSTGRESQL_INSTALL, "sqlite": SQLITE_INSTALL}
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+            )
+            available = cursor.fetchone() is not None
+        if available:
+            statements["postgresql"] = TRIGRAM_INSTALL + POSTGRESQL_INSTALL
+        else:
+            logger.warning(
+                "pg_trgm is not available; admin searches will match prefixes only."
+            )
+    _execute(connection, statements)
+    _trigrams.pop(connection.alias, None)
+
+
+def uninstall(connection=connection) -> None:
+    # pg_trgm stays; other indexes may have come to depend on it.
+    _execute(
+        connection, {"postgresql": POSTGRESQL_UNINSTALL, "sqlite": SQLITE_UNINSTALL}
+    )
+    _trigrams.pop(connection.alias, None)
+
+
+def _execute(connection, statements: dict) -> None:
+    # Other databases get no index, and search() still works on them.
+    with connection.cursor() as cursor:
+        for sql in statements.get(connection.vendor, []):
+            cursor.execute(sql)
+
+
+def has_trigrams(connection=connection) -> bool:
+    """Whether install() created trigram indexes in the connection's database."""
+    if connection.alias not in _trigrams:
+        found = False
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM pg_indexes WHERE indexname = %s",
+                    [f"{User._meta.db_table}_email_trgm"],
+                )
+                found = cursor.fetchone() is not None
+        _trigrams[connection.alias] = found
+    return _trigrams[connection.alias]
+
+
+def search(queryset: QuerySet, search_fields: Iterable[str], term: str) -> QuerySet:
+    """
+    Filter the queryset to rows that match every word of the search term in
+    one of the search fields, plain field paths such as "user__email". Words
+    are split like the admin splits them, quoted phrases included.
+    """
+    trigrams = has_trigrams(connections[queryset.db])
+    for word in smart_split(term):
+        if word[0] in "\"'" and word[0] == word[-1]:
+            word = unescape_string_literal(word)
+        if len(word) < MIN_TRIGRAM_LENGTH:
+            # A prefix this short matches a large share of the rows. Joined,
+            # the conditions let the database walk the listing in order and
+            # stop once a page is full.
+            condition = Q()
+            for path in search_fields:
+                condition |= Q(**{f"{path}__istartswith": word})
+        else:
+            lookup = "icontains" if trigrams else "istartswith"
+            condition = _matching(queryset.model, search_fields, lookup, word)
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def _matching(model, search_fields: Iterable[str], lookup: str, word: str) -> Q:
+    by_relation = defaultdict(Q)
+    for path in search_fields:
+        *relation, name = path.split(LOOKUP_SEP)
+        by_relation[LOOKUP_SEP.join(relation)] |= Q(**{f"{name}__{lookup}": word})
+    if list(by_relation) == [""]:
+        return by_relation[""]
+
+    # ORed across tables, the conditions leave the database nothing but a
+    # scan of this one; a union of the rows each table's own indexes find
+    # does not.
+    matches = []
+    for relation, condition in by_relation.items():
+        if relation:
+            related = model
+            for name in relation.split(LOOKUP_SEP):
+                related = related._meta.get_field(name).related_model
+            rows = related._base_manager.filter(condition).order_by().values("pk")
+            condition = Q(**{f"{relation}__in": rows})
+        matches.append(model._base_manager.filter(condition).order_by().values("pk"))
+    return Q(pk__in=matches[0].union(*matches[1:], all=True))
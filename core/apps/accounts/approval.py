@@ -0,0 +1,127 @@
+"""
+Bulk approval of instructor applications, driven by the admin's approve
+action and the ``approve_instructor_applications`` management command.
+
+Applications are approved in batches, each in its own transaction: the
+batch's pending applications are locked, their users and profiles are
+written through ``UserManager.bulk_create_users()`` and their instructors
+with one more bulk insert. An instructor keeps its application's resume;
+only the stored file name is copied, the file itself stays where it is.
+
+Approved users are created inactive, without a password, and their approval
+emails, each carrying a link to choose a password, which also activates the
+account, are queued in the outbox with a single insert per batch. The
+``dispatch_outbox`` task then renders and sends them together.
+
+Applications whose email already belongs to a user, compared
+case-insensitively, are left pending and reported back, for a reviewer to resolve.
+"""
+
+from typing import Iterable, List, NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import outbox, search, summaries
+from .importing import batched
+from .models import ApplyInstructor, Instructor
+
+
+class Approval(NamedTuple):
+    approved: List[ApplyInstructor]
+    conflicts: List[ApplyInstructor]
+
+
+def approve(applications: QuerySet, domain: str, *, batch_size: int = 500) -> Approval:
+    """
+    Approve the pending applications among the given ones, batch_size at a
+    time. Applications that aren't pending are ignored.
+    """
+    ids = (
+        applications.filter(status=ApplyInstructor.STATUS.PENDING)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    approved, conflicts = [], []
+    for batch in batched(list(ids), batch_size):
+        result = approve_batch(batch, domain)
+        approved += result.approved
+        conflicts += result.conflicts
+    return Approval(approved, conflicts)
+
+
+def approve_batch(ids: Iterable[int], domain: str) -> Approval:
+    """
+    Provision an instructor for each of the given applications still pending,
+    in one transaction.
+    """
+    User = get_user_model()
+    manager = User._default_manager
+
+    with transaction.atomic():
+        applications = list(
+            ApplyInstructor.objects.select_for_update()
+            .filter(pk__in=list(ids), status=ApplyInstructor.STATUS.PENDING)
+            .order_by("pk")
+        )
+        emails = {
+            application.pk: manager.normalize_email(application.email)
+            for application in applications
+        }
+        # Emails are unique case-insensitively.
+        taken = {
+            email.lower()
+            for email in manager.filter_by_login("email", emails.values()).values_list(
+                "email", flat=True
+            )
+        }
+
+        approved, conflicts = [], []
+        for application in applications:
+            if emails[application.pk].lower() in taken:
+                conflicts.append(application)
+            else:
+                taken.add(emails[application.pk].lower())
+                approved.append(application)
+        if not approved:
+            return Approval([], conflicts)
+
+        users = manager.bulk_create_users(
+            {
+                "email": emails[application.pk],
+                "username": manager.generate_username(emails[application.pk]),
+                "is_active": False,
+                "profile": {
+                    "first_name": application.first_name,
+                    "last_name": application.last_name,
+                    "phone": application.phone,
+                    "gender": application.gender,
+                    "full_address": application.address,
+                },
+            }
+            for application in approved
+        )
+        instructors = Instructor.objects.bulk_create(
+            Instructor(user=user, resume=application.resume.name)
+            for user, application in zip(users, approved)
+        )
+
+        # bulk_create() sends no post_save, which would otherwise create the
+        # summaries and search documents one instructor at a time.
+        instructor_ids = [instructor.pk for instructor in instructors]
+        summaries.rebuild(instructor_ids)
+        search.rebuild(instructor_ids)
+
+        outbox.queue_approval_emails(users, domain)
+
+        now = timezone.now()
+        ApplyInstructor.objects.filter(
+            pk__in=[application.pk for application in approved]
+        ).update(status=ApplyInstructor.STATUS.APPROVED, updated_at=now)
+        for application in approved:
+            application.status = ApplyInstructor.STATUS.APPROVED
+            application.updated_at = now
+
+    return Approval(approved, conflicts)
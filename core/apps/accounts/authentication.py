@@ -1,23 +1,100 @@
-from django.contrib.auth import get_user_model
-from django.contrib.auth.backends import BaseBackend
-from django.db.models import Q
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import (
+    _clean_credentials,
+    get_user_model,
+    load_backend,
+)
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import PermissionDenied
+from django.views.decorators.debug import sensitive_variables
+
+from . import hashing
+from .cache import user_cache
 
 User = get_user_model()
 
 
-class EmailOrUsernameAuthentication(BaseBackend):
-    def authenticate(self, request, username, password=None):
-        try:
-            user = User.objects.filter(Q(email=username) | Q(username=username)).first()
+class EmailOrUsernameAuthentication(ModelBackend):
+    """
+    Authenticates against either the email address or the username.
+
+    The user is resolved with a single query and the password is hashed
+    exactly once per attempt, including a dummy hash for unknown logins so
+    both cases cost the same. ``aauthenticate`` does the same without
+    leaving the event loop, hashing on the hashing executor.
+    """
+
+    def authenticate(
+        self, request, username=None, password=None, login_field=None, **kwargs
+    ):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = User.objects.get_by_login(username, login_field)
+
+        if user is None:
+            User().set_password(password)
+            return None
 
-            if user and user.check_password(password):
-                return user
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def aauthenticate(
+        self, request, username=None, password=None, login_field=None, **kwargs
+    ):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
             return None
-        except User.DoesNotExist:
+
+        user = await User.objects.aget_by_login(username, login_field)
+
+        if user is None:
+            await hashing.amake_password(password)
             return None
 
+        if await user.acheck_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
     def get_user(self, user_id):
+        user = user_cache.get(user_id)
+        return user if user and self.user_can_authenticate(user) else None
+
+
+@sensitive_variables("credentials")
+async def aauthenticate(request=None, **credentials):
+    """
+    django.contrib.auth.aauthenticate(), which in this Django version runs
+    authenticate() on the single thread-sensitive executor, but awaiting the
+    backends' own aauthenticate() where they define one.
+    """
+    for backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        method = getattr(backend, "aauthenticate", None)
+        if method is None:
+            method = sync_to_async(backend.authenticate)
         try:
-            return User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return None
+            inspect.signature(backend.authenticate).bind(request, **credentials)
+        except TypeError:
+            # This backend doesn't accept these credentials as arguments.
+            continue
+        try:
+            user = await method(request, **credentials)
+        except PermissionDenied:
+            break
+        if user is None:
+            continue
+        user.backend = backend_path
+        return user
+
+    await user_login_failed.asend(
+        sender=__name__, credentials=_clean_credentials(credentials), request=request
+    )
@@ -0,0 +1,160 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+
+class LocalLRUCache:
+    """
+    A small, thread-safe, in-process LRU with a per-entry time to live.
+
+    Entries expire quickly on purpose: invalidations only reach the shared
+    cache, so the local copy of another process must age out on its own.
+    """
+
+    def __init__(self, maxsize: int = 1024, timeout: float = 5):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class UserCache:
+    """
+    Resolves users by primary key through an in-process LRU backed by a
+    shared Django cache, falling back to a single database query.
+
+    Users are stored pickled so every caller gets its own instance and
+    per-request state (such as permission caches) is never shared.
+    """
+
+    key_prefix = "accounts:user"
+
+    def __init__(
+        self,
+        *,
+        alias: str = "default",
+        timeout: int = 300,
+        local_size: int = 1024,
+        local_timeout: float = 5,
+        select_profile: bool = True,
+    ):
+        self.alias = alias
+        self.timeout = timeout
+        self.select_profile = select_profile
+        self.local = LocalLRUCache(maxsize=local_size, timeout=local_timeout)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            alias=getattr(settings, "ACCOUNTS_USER_CACHE_ALIAS", "default"),
+            timeout=getattr(settings, "ACCOUNTS_USER_CACHE_TIMEOUT", 300),
+            local_size=getattr(settings, "ACCOUNTS_USER_CACHE_LOCAL_SIZE", 1024),
+            local_timeout=getattr(settings, "ACCOUNTS_USER_CACHE_LOCAL_TIMEOUT", 5),
+            select_profile=getattr(
+                settings, "ACCOUNTS_USER_CACHE_SELECT_PROFILE", True
+            ),
+        )
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, user_id) -> str:
+        return f"{self.key_prefix}:{user_id}"
+
+    def get(self, user_id):
+        """
+        Return the user with the given primary key, or None if it does not exist.
+        """
+        User = get_user_model()
+        try:
+            user_id = User._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
+
+        key = self.make_key(user_id)
+        payload = self.local.get(key)
+        if payload is None:
+            payload = self.cache.get(key)
+            if payload is None:
+                user = self.fetch(user_id)
+                if user is None:
+                    return None
+                payload = pickle.dumps(user, protocol=pickle.HIGHEST_PROTOCOL)
+                self.cache.set(key, payload, self.timeout)
+            self.local.set(key, payload)
+
+        return pickle.loads(payload)
+
+    def fetch(self, user_id):
+        User = get_user_model()
+        queryset = User._default_manager.order_by()
+        if self.select_profile:
+            queryset = queryset.select_related("profile")
+
+        try:
+            return queryset.get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+
+    def invalidate(self, *user_ids) -> None:
+        """
+        Drop the given users now and again once the current transaction
+        commits, so a concurrent reader can't re-cache the old row.
+        """
+        keys = [self.make_key(user_id) for user_id in user_ids if user_id is not None]
+        if not keys:
+            return
+
+        def delete():
+            for key in keys:
+                self.local.delete(key)
+            self.cache.delete_many(keys)
+
+        delete()
+        transaction.on_commit(delete)
+
+    def clear_local(self) -> None:
+        self.local.clear()
+
+
+user_cache = UserCache.from_settings()
@@ -0,0 +1,51 @@
+"""
+System checks for the settings the accounts app relies on.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries no other process sees.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def _cache_users() -> dict:
+    # What each cache alias holds, by feature.
+    features = {
+        "the user cache": getattr(settings, "ACCOUNTS_USER_CACHE_ALIAS", "default"),
+        "activation resend coalescing": "default",
+    }
+    if settings.SESSION_ENGINE == "apps.accounts.sessions" and not getattr(
+        settings, "ACCOUNTS_SESSION_WRITE_THROUGH", True
+    ):
+        features["sessions"] = settings.SESSION_CACHE_ALIAS
+    return features
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warn when, outside of DEBUG, features that must be shared by every worker
+    keep their state in a process-local cache.
+    """
+    if settings.DEBUG:
+        return []
+
+    by_alias = {}
+    for feature, alias in _cache_users().items():
+        by_alias.setdefault(alias, []).append(feature)
+
+    return [
+        Warning(
+            f"The {alias!r} cache is local to each process, so {', '.join(features)} "
+            "won't be shared between workers and is lost on restart.",
+            hint="Configure a shared backend such as Redis with CACHE_BACKEND "
+            "and CACHE_LOCATION.",
+            id="accounts.W001",
+        )
+        for alias, features in by_alias.items()
+        if isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+    ]
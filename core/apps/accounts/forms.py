@@ -1,15 +1,48 @@
 import re
 
 from django import forms
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import authenticate
+from django.contrib.auth import forms as auth_forms
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email, validate_slug
 from django.utils.translation import gettext_lazy as _
 
+from . import validators
+from .authentication import aauthenticate
+from .hashing import HashingQueueFull
+from .models import Profile
+
 User = get_user_model()
 
 
-class LoginForm(forms.Form):
+class AsyncValidationMixin:
+    """
+    Adds ais_valid() for async views.
+
+    Field validation is pure Python and runs as usual, but checks that hit
+    the database or the password hasher are skipped while ``defer_io`` is
+    set and performed by the awaitable aclean() instead.
+    """
+
+    defer_io = False
+
+    async def ais_valid(self):
+        self.defer_io = True
+        try:
+            if not self.is_valid():
+                return False
+        finally:
+            self.defer_io = False
+
+        await self.aclean()
+        return not self.errors
+
+    async def aclean(self):
+        pass
+
+
+class LoginForm(AsyncValidationMixin, forms.Form):
     login = forms.CharField(
         max_length=255,
         error_messages={
@@ -55,9 +88,11 @@ class LoginForm(forms.Form):
                 validate_email(login)
             except ValidationError:
                 raise ValidationError(_("Enter a valid email address."))
+            self._login_field = "email"
         else:
             if not re.fullmatch(r"^[-a-zA-Z0-9_]+$", login):
                 raise ValidationError(_("Enter a valid username."))
+            self._login_field = "username"
 
         return login
 
@@ -74,17 +109,42 @@ class LoginForm(forms.Form):
         login = cleaned_data.get("login")
         password = cleaned_data.get("password")
 
-        if login and password:
-            user = authenticate(username=login, password=password)
+        if login and password and not self.defer_io:
+            try:
+                user = authenticate(
+                    username=login, password=password, login_field=self._login_field
+                )
+            except HashingQueueFull:
+                raise ValidationError(
+                    _("The server is busy right now. Please try again in a moment.")
+                )
             if not user:
                 raise ValidationError(_("The username or password is incorrect"))
             self._user = user
 
+    async def aclean(self):
+        try:
+            user = await aauthenticate(
+                username=self.cleaned_data["login"],
+                password=self.cleaned_data["password"],
+                login_field=self._login_field,
+            )
+        except HashingQueueFull:
+            self.add_error(
+                None, _("The server is busy right now. Please try again in a moment.")
+            )
+            return
+
+        if not user:
+            self.add_error(None, _("The username or password is incorrect"))
+            return
+        self._user = user
+
     def get_user(self):
         return getattr(self, "_user", None)
 
 
-class RegisterForm(forms.Form):
+class RegisterForm(AsyncValidationMixin, forms.Form):
     email = forms.EmailField(
         widget=forms.TextInput(
             attrs={
@@ -138,39 +198,21 @@ class RegisterForm(forms.Form):
 
     def clean_email(self):
         email = self.cleaned_data.get("email")
-        if User.objects.filter(email=email).exists():
+        if (
+            not self.defer_io
+            and User.objects.filter_by_login("email", [email]).exists()
+        ):
             raise ValidationError(_("Email already exists."))
         return email
 
+    async def aclean(self):
+        email = self.cleaned_data.get("email")
+        if await User.objects.filter_by_login("email", [email]).aexists():
+            self.add_error("email", _("Email already exists."))
+
     def clean_password1(self):
         password1 = self.cleaned_data.get("password1")
-
-        if len(password1) < 8:
-            raise ValidationError(_("Password must be at least 8 characters long."))
-
-        if not any(char.isupper() for char in password1):
-            raise ValidationError(
-                _("Password must contain at least one uppercase letter.")
-            )
-
-        if not any(char.islower() for char in password1):
-            raise ValidationError(
-                _("Password must contain at least one lowercase letter.")
-            )
-
-        special_chars = "@#$%!_"
-        if not any(char in special_chars for char in password1):
-            raise ValidationError(
-                _("Password must contain at least one special character (@ # $ % ! _).")
-            )
-
-        if not re.fullmatch(r"[a-zA-Z0-9@#$%!_]+", password1):
-            raise ValidationError(
-                _(
-                    "Password can only contain English letters, numbers, and special characters (@ # $ % ! _)."
-                )
-            )
-
+        validators.validate_password_strength(password1)
         return password1
 
     def clean(self):
@@ -184,6 +226,45 @@ class RegisterForm(forms.Form):
         return cleaned_data
 
 
+class SetPasswordForm(auth_forms.SetPasswordForm):
+    """
+    Sets the password of a user arriving from an emailed link, with the same
+    strength rules as registration.
+    """
+
+    new_password1 = forms.CharField(
+        widget=forms.PasswordInput(
+            attrs={
+                "class": "form-control border-0 bg-light rounded-end ps-1",
+                "placeholder": "********",
+                "dir": "rtl",
+            }
+        ),
+        strip=False,
+        error_messages={
+            "required": _("Password is required."),
+        },
+    )
+    new_password2 = forms.CharField(
+        widget=forms.PasswordInput(
+            attrs={
+                "class": "form-control border-0 bg-light rounded-end ps-1",
+                "placeholder": "********",
+                "dir": "rtl",
+            }
+        ),
+        strip=False,
+        error_messages={
+            "required": _("Password confirmation is required."),
+        },
+    )
+
+    def clean_new_password1(self):
+        password = self.cleaned_data.get("new_password1")
+        validators.validate_password_strength(password)
+        return password
+
+
 class ResendActivateForm(forms.Form):
     email = forms.EmailField(
         widget=forms.EmailInput(
@@ -201,6 +282,36 @@ class ResendActivateForm(forms.Form):
 
     def clean_email(self):
         email = self.cleaned_data.get("email")
-        if not User.objects.filter(email=email).exists():
+        self._user = User.objects.get_by_login(email, "email")
+        if self._user is None:
             raise ValidationError(_("Email not exists."))
         return email
+
+    def get_user(self):
+        return getattr(self, "_user", None)
+
+
+class UserImportForm(forms.Form):
+    """
+    Validates one row of a bulk user import with the same rules as
+    registration. Uniqueness is checked per batch by the importer.
+    """
+
+    email = forms.EmailField(max_length=255)
+    username = forms.CharField(
+        max_length=255, required=False, validators=[validate_slug]
+    )
+    password = forms.CharField(
+        required=False,
+        strip=False,
+        validators=[validators.validate_password_strength],
+    )
+    first_name = forms.CharField(max_length=255, required=False)
+    last_name = forms.CharField(max_length=255, required=False)
+    phone = forms.CharField(
+        max_length=11, required=False, validators=[validators.validate_phone]
+    )
+    gender = forms.ChoiceField(choices=Profile.Gender.choices, required=False)
+
+    def clean_email(self):
+        return User.objects.normalize_email(self.cleaned_data.get("email"))
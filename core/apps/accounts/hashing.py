@@ -0,0 +1,291 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 is deliberately slow, so running it inline blocks a sync worker for
+the whole hash and stalls the event loop under ASGI. Hashes are handed to a
+pluggable executor instead, selected by ``ACCOUNTS_HASHING_EXECUTOR``:
+
+* ``ProcessPoolHashingExecutor`` runs them in a bounded pool of processes and
+  rejects new work with ``HashingQueueFull`` once ``ACCOUNTS_HASHING_MAX_QUEUE``
+  hashes are queued or running.
+* ``InlineHashingExecutor`` hashes in the calling thread, as Django does.
+
+Both record hash latency and queue wait in ``executor.metrics``.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class HashingQueueFull(Exception):
+    """Raised when the executor already holds as many hashes as it may queue."""
+
+
+def _timed(func, *args):
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at, time.time()
+
+
+def _make_password(password):
+    return _timed(hashers.make_password, password)
+
+
+def _verify_password(password, encoded):
+    return _timed(hashers.verify_password, password, encoded)
+
+
+class HashingMetrics:
+    """Per-process counters for hash latency and time spent waiting in the queue."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hashes = 0
+            self.rejected = 0
+            self.hash_seconds_total = 0.0
+            self.hash_seconds_max = 0.0
+            self.queue_wait_seconds_total = 0.0
+            self.queue_wait_seconds_max = 0.0
+
+    def observe(self, queue_wait: float, latency: float) -> None:
+        queue_wait = max(queue_wait, 0.0)
+        with self._lock:
+            self.hashes += 1
+            self.hash_seconds_total += latency
+            self.hash_seconds_max = max(self.hash_seconds_max, latency)
+            self.queue_wait_seconds_total += queue_wait
+            self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, queue_wait)
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hashes = self.hashes or 1
+            return {
+                "hashes": self.hashes,
+                "rejected": self.rejected,
+                "hash_seconds_avg": self.hash_seconds_total / hashes,
+                "hash_seconds_max": self.hash_seconds_max,
+                "queue_wait_seconds_avg": self.queue_wait_seconds_total / hashes,
+                "queue_wait_seconds_max": self.queue_wait_seconds_max,
+            }
+
+
+class BaseHashingExecutor:
+    def __init__(self):
+        self.metrics = HashingMetrics()
+
+    @classmethod
+    def from_settings(cls):
+        return cls()
+
+    def submit(self, func, *args, block: bool = False) -> Future:
+        """
+        Schedule func(*args). Unless block is set, raise HashingQueueFull
+        instead of waiting when the executor is saturated.
+        """
+        raise NotImplementedError(
+            "subclasses of BaseHashingExecutor must provide a submit() method"
+        )
+
+    def shutdown(self) -> None:
+        pass
+
+    def _unwrap(self, submitted_at, payload):
+        result, started_at, finished_at = payload
+        self.metrics.observe(started_at - submitted_at, finished_at - started_at)
+        return result
+
+    def _run(self, func, *args):
+        submitted_at = time.time()
+        return self._unwrap(submitted_at, self.submit(func, *args).result())
+
+    async def _arun(self, func, *args):
+        submitted_at = time.time()
+        payload = await asyncio.wrap_future(self.submit(func, *args))
+        return self._unwrap(submitted_at, payload)
+
+    def make_password(self, password: Optional[str]) -> str:
+        if password is None:
+            return hashers.make_password(None)
+        return self._run(_make_password, password)
+
+    def make_passwords(self, passwords: Iterable[Optional[str]]) -> List[str]:
+        """
+        Hash many passwords at once, spreading them over the executor.
+        """
+        submitted_at = time.time()
+        futures = [
+            (
+                None
+                if password is None
+                else self.submit(_make_password, password, block=True)
+            )
+            for password in passwords
+        ]
+        return [
+            (
+                hashers.make_password(None)
+                if future is None
+                else self._unwrap(submitted_at, future.result())
+            )
+            for future in futures
+        ]
+
+    def verify_password(
+        self, password: Optional[str], encoded: str
+    ) -> Tuple[bool, bool]:
+        """
+        Return whether the password matches and whether it must be rehashed.
+        """
+        return self._run(_verify_password, password, encoded)
+
+    async def amake_password(self, password: Optional[str]) -> str:
+        if password is None:
+            return hashers.make_password(None)
+        return await self._arun(_make_password, password)
+
+    async def averify_password(
+        self, password: Optional[str], encoded: str
+    ) -> Tuple[bool, bool]:
+        return await self._arun(_verify_password, password, encoded)
+
+
+class InlineHashingExecutor(BaseHashingExecutor):
+    """Hashes in the calling thread."""
+
+    def submit(self, func, *args, block: bool = False) -> Future:
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
+
+
+class ProcessPoolHashingExecutor(BaseHashingExecutor):
+    """
+    Hashes in a pool of worker processes.
+
+    The pool is created lazily and recreated after a fork, so it can be set
+    up at import time in a pre-forking server without sharing processes
+    between workers.
+    """
+
+    def __init__(
+        self, workers: int = 2, max_queue: int = 64, start_method: str = "forkserver"
+    ):
+        super().__init__()
+        self.workers = workers
+        self.max_queue = max_queue
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            workers=getattr(settings, "ACCOUNTS_HASHING_WORKERS", 2),
+            max_queue=getattr(settings, "ACCOUNTS_HASHING_MAX_QUEUE", 64),
+            start_method=getattr(
+                settings, "ACCOUNTS_HASHING_START_METHOD", "forkserver"
+            ),
+        )
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+                self._slots = threading.BoundedSemaphore(self.max_queue)
+                self._pid = os.getpid()
+            return self._pool
+
+    def submit(self, func, *args, block: bool = False) -> Future:
+        pool, slots = self.pool, self._slots
+        if not slots.acquire(blocking=block):
+            self.metrics.reject()
+            logger.warning(
+                "Password hashing queue is full (%s pending).", self.max_queue
+            )
+            raise HashingQueueFull
+
+        try:
+            future = pool.submit(func, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+@functools.cache
+def get_hashing_executor() -> BaseHashingExecutor:
+    executor_class = import_string(
+        getattr(
+            settings,
+            "ACCOUNTS_HASHING_EXECUTOR",
+            "apps.accounts.hashing.InlineHashingExecutor",
+        )
+    )
+    return executor_class.from_settings()
+
+
+@receiver(setting_changed)
+def reset_hashing_executor(*, setting, **kwargs):
+    if setting.startswith("ACCOUNTS_HASHING_") or setting == "PASSWORD_HASHERS":
+        get_hashing_executor().shutdown()
+        get_hashing_executor.cache_clear()
+
+
+def make_password(password: Optional[str]) -> str:
+    return get_hashing_executor().make_password(password)
+
+
+def make_passwords(passwords: Iterable[Optional[str]]) -> List[str]:
+    return get_hashing_executor().make_passwords(passwords)
+
+
+def verify_password(password: Optional[str], encoded: str) -> Tuple[bool, bool]:
+    return get_hashing_executor().verify_password(password, encoded)
+
+
+async def amake_password(password: Optional[str]) -> str:
+    return await get_hashing_executor().amake_password(password)
+
+
+async def averify_password(password: Optional[str], encoded: str) -> Tuple[bool, bool]:
+    return await get_hashing_executor().averify_password(password, encoded)
@@ -0,0 +1,308 @@
+"""
+Bulk user import, driven by the ``import_users`` management command.
+
+Rows are streamed from CSV or JSONL files and handled in batches: each batch
+is validated with ``UserImportForm``, checked for duplicate emails and
+usernames with one query per column, hashed on the hashing executor and
+written in its own transaction, either through
+``UserManager.bulk_create_users()`` or, on PostgreSQL, with COPY.
+"""
+
+import csv
+import io
+import json
+import os
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.translation import gettext as _
+
+from . import hashing
+from .forms import UserImportForm
+from .models import Profile
+
+PROFILE_FIELDS = ("first_name", "last_name", "phone", "gender")
+
+FORMATS = ("csv", "jsonl")
+METHODS = ("auto", "bulk", "copy")
+
+
+class MalformedRow(NamedTuple):
+    """Stands in for a JSONL line that doesn't hold a JSON object."""
+
+    message: str
+
+
+def read_rows(
+    path: str, format: Optional[str] = None
+) -> Iterator[Tuple[int, Union[dict, MalformedRow]]]:
+    """
+    Yields (line number, row) pairs from a CSV file with a header row or from
+    a file holding one JSON object per line. A line that isn't a JSON object
+    is yielded as a MalformedRow, to be reported like any rejected row.
+    """
+
+    if format is None:
+        format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+    with open(path, newline="", encoding="utf-8") as file:
+        if format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as error:
+                    row = MalformedRow(_("Invalid JSON: %s.") % error.msg)
+                else:
+                    if not isinstance(row, dict):
+                        row = MalformedRow(_("Expected a JSON object."))
+                yield line_number, row
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Checkpoint:
+    """
+    Remembers how many input rows have been handled, so an interrupted import
+    can resume after the last finished batch.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        try:
+            with open(self.path) as file:
+                return json.load(file)["rows"]
+        except FileNotFoundError:
+            return 0
+
+    def save(self, rows: int) -> None:
+        # Write then rename, so a crash never leaves a truncated checkpoint.
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"rows": rows}, file)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class UserImporter:
+    def __init__(
+        self,
+        *,
+        method: str = "auto",
+        activate: bool = False,
+        using: str = DEFAULT_DB_ALIAS,
+    ):
+        if method not in METHODS:
+            raise ValueError(f"Unknown import method {method!r}.")
+
+        vendor = connections[using].vendor
+        if method == "auto":
+            method = "copy" if vendor == "postgresql" else "bulk"
+        elif method == "copy" and vendor != "postgresql":
+            raise ValueError("COPY is only available on PostgreSQL.")
+
+        self.method = method
+        self.activate = activate
+        self.using = using
+
+    def validate(self, rows: List[Tuple[int, dict]]) -> Tuple[list, list]:
+        """
+        Returns the create_user() arguments of the valid rows, with their line
+        numbers, and an error entry for every rejected row.
+        """
+
+        User = get_user_model()
+        candidates, errors = [], []
+        for line, row in rows:
+            if isinstance(row, MalformedRow):
+                errors.append(
+                    {"line": line, "email": None, "errors": {"__all__": [row.message]}}
+                )
+                continue
+            form = UserImportForm(row)
+            if form.is_valid():
+                candidates.append((line, form.cleaned_data))
+            else:
+                errors.append(
+                    {
+                        "line": line,
+                        "email": row.get("email"),
+                        "errors": {
+                            field: [error["message"] for error in field_errors]
+                            for field, field_errors in form.errors.get_json_data().items()
+                        },
+                    }
+                )
+
+        emails = {data["email"] for _, data in candidates}
+        usernames = {data["username"] for _, data in candidates if data["username"]}
+        # Emails and usernames are unique case-insensitively, so both sides
+        # are compared lowercased.
+        manager = User._default_manager.db_manager(self.using)
+        taken = {
+            "email": {
+                email.lower()
+                for email in manager.filter_by_login("email", emails).values_list(
+                    "email", flat=True
+                )
+            },
+            "username": {
+                username.lower()
+                for username in manager.filter_by_login(
+                    "username", usernames
+                ).values_list("username", flat=True)
+            },
+        }
+
+        users = []
+        for line, data in candidates:
+            duplicate = next(
+                (
+                    field
+                    for field in ("email", "username")
+                    if data[field] and data[field].lower() in taken[field]
+                ),
+                None,
+            )
+            if duplicate:
+                errors.append(
+                    {
+                        "line": line,
+                        "email": data["email"],
+                        "errors": {
+                            duplicate: [
+                                _("%s already exists.") % duplicate.capitalize()
+                            ]
+                        },
+                    }
+                )
+                continue
+
+            taken["email"].add(data["email"].lower())
+            if data["username"]:
+                taken["username"].add(data["username"].lower())
+            users.append((line, self.build(data)))
+
+        return users, errors
+
+    def build(self, data: dict) -> dict:
+        User = get_user_model()
+        return {
+            "email": data["email"],
+            "username": data["username"]
+            or User._default_manager.generate_username(data["email"]),
+            "password": data["password"] or None,
+            "is_active": self.activate,
+            "profile": {field: data[field] for field in PROFILE_FIELDS if data[field]},
+        }
+
+    def load(self, users: List[dict]) -> None:
+        if self.method == "copy":
+            copy_users(users, using=self.using)
+        else:
+            get_user_model()._default_manager.db_manager(self.using).bulk_create_users(
+                users
+            )
+
+
+def copy_users(users: List[dict], using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Writes users and their profiles with PostgreSQL COPY.
+
+    COPY can't return the generated primary keys, so users are matched back to
+    their rows by the uuid assigned here before the profiles are written.
+    """
+
+    User = get_user_model()
+    manager = User._default_manager.db_manager(using)
+
+    built, profiles, passwords = [], [], []
+    for fields in users:
+        fields = dict(fields)
+        profiles.append(fields.pop("profile", None) or {})
+        passwords.append(fields.pop("password", None) or None)
+        built.append(manager._build_user(**fields))
+
+    for user, encoded in zip(built, hashing.make_passwords(passwords)):
+        user.password = encoded
+
+    with transaction.atomic(using=using):
+        copy_objects(built, using)
+        pks = dict(
+            manager.filter(uuid__in=[user.uuid for user in built]).values_list(
+                "uuid", "pk"
+            )
+        )
+        for user in built:
+            user.pk = pks[user.uuid]
+            user._state.adding = False
+            user._state.db = using
+
+        copy_objects(
+            [
+                Profile(user=user, **profile_fields)
+                for user, profile_fields in zip(built, profiles)
+            ],
+            using,
+        )
+
+
+def copy_objects(objs: list, using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Inserts unsaved model instances with COPY, preparing every value the way
+    an INSERT from save() would.
+    """
+
+    if not objs:
+        return
+
+    connection = connections[using]
+    opts = type(objs[0])._meta
+    fields = [field for field in opts.concrete_fields if not field.primary_key]
+    quote_name = connection.ops.quote_name
+    sql = "COPY %s (%s) FROM STDIN WITH (FORMAT csv, NULL '\\N')" % (
+        quote_name(opts.db_table),
+        ", ".join(quote_name(field.column) for field in fields),
+    )
+
+    buffer = io.StringIO()
+    for obj in objs:
+        values = (
+            field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+            for field in fields
+        )
+        buffer.write(",".join(_copy_value(value) for value in values) + "\n")
+
+    with connection.cursor() as cursor:
+        if hasattr(cursor.cursor, "copy_expert"):
+            buffer.seek(0)
+            cursor.cursor.copy_expert(sql, buffer)
+        else:
+            with cursor.cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    # Quoting every value keeps empty strings and a literal \N distinct from
+    # NULL.
+    return '"%s"' % str(value).replace('"', '""')
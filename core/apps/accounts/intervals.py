@@ -0,0 +1,73 @@
+"""
+Experience as the union of job intervals.
+
+Jobs often overlap, e.g. two part-time positions held at once, so adding up
+their durations overstates experience. ``experience_totals`` sweeps intervals
+sorted by start date and merges the ones that overlap, counting every day
+once: overall, and separately for each ``Experience.Level``.
+
+Dates are turned into day ordinals up front so the sweep only compares and
+subtracts integers. Intervals are half-open, ``[start, end)``, and an ongoing
+job (no end date) runs until ``today``.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# instructor id, level, start, end
+ExperienceRow = Tuple[int, str, date, Optional[date]]
+
+
+def experience_totals(
+    rows: Iterable[ExperienceRow], today: date
+) -> Iterator[Tuple[int, int, Dict[str, int]]]:
+    """
+    Yield (instructor id, days, days per level) for rows sorted by instructor
+    id and then start date, as the database returns them for
+    ``order_by("instructor_id", "start")``.
+    """
+    today = today.toordinal()
+    instructor = None
+    # The interval being merged, overall and per level: [start, end, total].
+    overall = None
+    levels = {}
+
+    for instructor_id, level, start, end in rows:
+        if instructor_id != instructor:
+            if instructor is not None:
+                yield instructor, _close(overall), {
+                    name: _close(sweep) for name, sweep in levels.items()
+                }
+            instructor, overall, levels = instructor_id, None, {}
+
+        start = start.toordinal()
+        end = today if end is None else end.toordinal()
+        if end < start:
+            end = start
+
+        if overall is None:
+            overall = [start, end, 0]
+        elif start > overall[1]:
+            overall[2] += overall[1] - overall[0]
+            overall[0], overall[1] = start, end
+        elif end > overall[1]:
+            overall[1] = end
+
+        sweep = levels.get(level)
+        if sweep is None:
+            levels[level] = [start, end, 0]
+        elif start > sweep[1]:
+            sweep[2] += sweep[1] - sweep[0]
+            sweep[0], sweep[1] = start, end
+        elif end > sweep[1]:
+            sweep[1] = end
+
+    if instructor is not None:
+        yield instructor, _close(overall), {
+            name: _close(sweep) for name, sweep in levels.items()
+        }
+
+
+def _close(sweep) -> int:
+    start, end, total = sweep
+    return total + end - start
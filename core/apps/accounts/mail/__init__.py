@@ -0,0 +1,10 @@
+from .dispatcher import DeliveryResult, MailDispatcher, get_mail_dispatcher
+from .rendering import render_verification_emails, template_cache
+
+__all__ = [
+    "DeliveryResult",
+    "MailDispatcher",
+    "get_mail_dispatcher",
+    "render_verification_emails",
+    "template_cache",
+]
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.message import sanitize_address
+
+from .smtp import AsyncSMTPPool
+
+
+class AsyncSMTPEmailBackend(BaseEmailBackend):
+    """
+    Email backend that sends through an AsyncSMTPPool.
+
+    The pool runs on an event loop in a background thread owned by the
+    backend, so it works the same from sync code, Celery tasks and async
+    views. Connection settings are read like Django's SMTP backend does;
+    ACCOUNTS_MAIL_POOL_SIZE, ACCOUNTS_MAIL_DOMAIN_RATE_LIMITS and
+    ACCOUNTS_MAIL_DEFAULT_DOMAIN_RATE configure the pool. The rate limiters
+    belong to the backend, so reopening it doesn't reset them.
+    """
+
+    def __init__(
+        self,
+        host=None,
+        port=None,
+        username=None,
+        password=None,
+        use_tls=None,
+        use_ssl=None,
+        timeout=None,
+        pool_size=None,
+        rate_limits=None,
+        default_rate=None,
+        fail_silently=False,
+        **kwargs,
+    ):
+        super().__init__(fail_silently=fail_silently)
+        self.pool_options = {
+            "host": host or settings.EMAIL_HOST,
+            "port": int(port or settings.EMAIL_PORT),
+            "username": settings.EMAIL_HOST_USER if username is None else username,
+            "password": (
+                settings.EMAIL_HOST_PASSWORD if password is None else password
+            ),
+            "use_tls": settings.EMAIL_USE_TLS if use_tls is None else use_tls,
+            "use_ssl": settings.EMAIL_USE_SSL if use_ssl is None else use_ssl,
+            "timeout": settings.EMAIL_TIMEOUT if timeout is None else timeout,
+            "size": pool_size or getattr(settings, "ACCOUNTS_MAIL_POOL_SIZE", 8),
+            "rate_limits": (
+                getattr(settings, "ACCOUNTS_MAIL_DOMAIN_RATE_LIMITS", {})
+                if rate_limits is None
+                else rate_limits
+            ),
+            "default_rate": (
+                getattr(settings, "ACCOUNTS_MAIL_DEFAULT_DOMAIN_RATE", None)
+                if default_rate is None
+                else default_rate
+            ),
+        }
+        self._limiters = {}
+        self._loop = None
+        self._thread = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        with self._lock:
+            if self._loop is not None:
+                return False
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="async-smtp", daemon=True
+            )
+            self._thread.start()
+            self._pool = AsyncSMTPPool(limiters=self._limiters, **self.pool_options)
+            return True
+
+    def close(self):
+        with self._lock:
+            if self._loop is None:
+                return
+            loop, thread, pool = self._loop, self._thread, self._pool
+            self._loop = self._thread = self._pool = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(pool.close(), loop).result()
+        except Exception:
+            if not self.fail_silently:
+                raise
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def send_batch(self, email_messages) -> List[Optional[Exception]]:
+        """
+        Send the messages concurrently and return, for each, None or the
+        error it failed with.
+        """
+        if not email_messages:
+            return []
+        new_connection = self.open()
+        try:
+            envelopes = [self._envelope(message) for message in email_messages]
+            future = asyncio.run_coroutine_threadsafe(
+                self._pool.send_many(envelopes), self._loop
+            )
+            return future.result()
+        finally:
+            if new_connection:
+                self.close()
+
+    def send_messages(self, email_messages):
+        email_messages = [message for message in email_messages if message.recipients()]
+        errors = self.send_batch(email_messages)
+        failed = [error for error in errors if error is not None]
+        if failed and not self.fail_silently:
+            raise failed[0]
+        return len(errors) - len(failed)
+
+    def _envelope(self, message):
+        encoding = message.encoding or settings.DEFAULT_CHARSET
+        return (
+            sanitize_address(message.from_email, encoding),
+            [sanitize_address(address, encoding) for address in message.recipients()],
+            message.message().as_bytes(linesep="\r\n"),
+        )
@@ -0,0 +1,129 @@
+"""
+Batched email delivery over a persistent connection.
+
+Opening an SMTP connection per message dominates the cost of sending and
+gets us throttled by the relay. ``MailDispatcher`` keeps one connection open
+for as long as it is usable, reconnects when the server drops it, and
+reports the outcome of every message separately. The outbox hands it each
+batch of due emails.
+"""
+
+import functools
+import logging
+import smtplib
+import threading
+from typing import List, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the connection can't be trusted and is reopened.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+class DeliveryResult(NamedTuple):
+    message: EmailMessage
+    sent: bool
+    error: Optional[Exception] = None
+
+
+class MailDispatcher:
+    def __init__(self, *, retries: int = 1, backend: Optional[str] = None):
+        self.retries = retries
+        self.backend = backend
+        self._send_lock = threading.Lock()
+        self._connection = None
+
+    @classmethod
+    def from_settings(cls):
+        return cls(backend=getattr(settings, "ACCOUNTS_MAIL_BACKEND", None))
+
+    @property
+    def sends_batches(self) -> bool:
+        """
+        Whether the backend sends a whole batch itself through send_batch(),
+        as AsyncSMTPEmailBackend does, instead of one message at a time.
+        """
+        backend = import_string(self.backend or settings.EMAIL_BACKEND)
+        return hasattr(backend, "send_batch")
+
+    def send(self, messages: List[EmailMessage]) -> List[DeliveryResult]:
+        """
+        Send the messages over a single connection and return one result per
+        message, in order. Failures are logged rather than raised.
+        """
+        with self._send_lock:
+            if self.sends_batches:
+                results = self._deliver_batch(messages)
+            else:
+                results = [self._deliver(message) for message in messages]
+
+        failed = [result for result in results if not result.sent]
+        if failed:
+            logger.error("Failed to send %s of %s emails.", len(failed), len(results))
+            for result in failed:
+                logger.warning(
+                    "Email to %s failed: %r", result.message.to, result.error
+                )
+        return results
+
+    def _deliver(self, message: EmailMessage) -> DeliveryResult:
+        error = None
+        for _ in range(self.retries + 1):
+            try:
+                self._open().send_messages([message])
+                return DeliveryResult(message, True)
+            except CONNECTION_ERRORS as exc:
+                error = exc
+            except smtplib.SMTPException as exc:
+                # Rejected by the server; the connection itself is fine.
+                return DeliveryResult(message, False, exc)
+            except OSError as exc:
+                error = exc
+            self.close()
+        return DeliveryResult(message, False, error)
+
+    def _deliver_batch(self, messages: List[EmailMessage]) -> List[DeliveryResult]:
+        # Backends with send_batch() (such as AsyncSMTPEmailBackend) send
+        # concurrently and handle reconnects themselves.
+        try:
+            errors = self._open().send_batch(messages)
+        except Exception as exc:
+            self.close()
+            errors = [exc] * len(messages)
+        return [
+            DeliveryResult(message, error is None, error)
+            for message, error in zip(messages, errors)
+        ]
+
+    def _open(self):
+        if self._connection is None:
+            connection = get_connection(self.backend, fail_silently=False)
+            connection.open()
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+@functools.cache
+def get_mail_dispatcher() -> MailDispatcher:
+    return MailDispatcher.from_settings()
+
+
+@receiver(setting_changed)
+def reset_mail_dispatcher(*, setting, **kwargs):
+    if setting.startswith("ACCOUNTS_MAIL_") or setting.startswith("EMAIL_"):
+        get_mail_dispatcher().close()
+        get_mail_dispatcher.cache_clear()
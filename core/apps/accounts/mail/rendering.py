@@ -0,0 +1,165 @@
+"""
+Email rendering for batches of recipients.
+
+Templates are compiled once per process and kept until their file changes
+on disk. A batch is rendered once with placeholder values for the per-user
+``uid`` and ``token``, which are then substituted for every recipient, so
+static parts such as inlined CSS are only rendered once.
+
+Templates that use ``user`` itself, or that transform the placeholders, fall
+back to a full render per recipient.
+"""
+
+import os
+import threading
+from typing import List, NamedTuple
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMessage
+from django.template import Template, engines
+from django.template.context import make_context
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+UID_PLACEHOLDER = "uidplaceholder0b0b0b"
+TOKEN_PLACEHOLDER = "tokenplaceholder0b0b0b"
+
+
+class _UserProbe:
+    """Stands in for the user and records whether the template looks at it."""
+
+    def __init__(self):
+        self.used = False
+
+    def __getattr__(self, name):
+        self.used = True
+        return ""
+
+    def __str__(self):
+        self.used = True
+        return ""
+
+    def __bool__(self):
+        self.used = True
+        return True
+
+
+class CompiledTemplate(NamedTuple):
+    template: Template
+    mtime: float
+    uses_user: bool
+
+
+class TemplateCache:
+    """Compiled templates keyed by name, recompiled when the file changes."""
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CompiledTemplate:
+        cached = self._templates.get(name)
+        if cached is not None and _mtime(cached.template.origin.name) == cached.mtime:
+            return cached
+
+        compiled = self._compile(name)
+        with self._lock:
+            self._templates[name] = compiled
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+    def _compile(self, name: str) -> CompiledTemplate:
+        engine = engines["django"].engine
+        _, origin = engine.find_template(name)
+        mtime = _mtime(origin.name)
+        with open(origin.name, encoding=engine.file_charset) as file:
+            template = Template(file.read(), origin, name, engine)
+
+        probe = _UserProbe()
+        render(template, _placeholder_context(probe, "example.com"))
+        return CompiledTemplate(template, mtime, probe.used)
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return -1
+
+
+template_cache = TemplateCache()
+
+
+def render(template: Template, context: dict) -> str:
+    return template.render(make_context(context, autoescape=template.engine.autoescape))
+
+
+def _context(user, domain: str, token_generator) -> dict:
+    return {
+        "user": user,
+        "domain": domain,
+        "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+        "token": token_generator.make_token(user),
+    }
+
+
+def _placeholder_context(user, domain: str) -> dict:
+    return {
+        "user": user,
+        "domain": domain,
+        "uid": UID_PLACEHOLDER,
+        "token": TOKEN_PLACEHOLDER,
+    }
+
+
+def render_verification_emails(
+    users,
+    domain: str,
+    mail_subject: str,
+    email_template: str,
+    *,
+    token_generator=default_token_generator,
+) -> List[EmailMessage]:
+    """
+    Return one verification email per user, in order, with a token from
+    token_generator.
+    """
+    users = list(users)
+    if not users:
+        return []
+
+    compiled = template_cache.get(email_template)
+    template = compiled.template
+
+    bodies = None
+    if len(users) > 1 and not compiled.uses_user:
+        shared = render(template, _placeholder_context(None, domain))
+        contexts = [_context(user, domain, token_generator) for user in users]
+        bodies = [
+            shared.replace(UID_PLACEHOLDER, context["uid"]).replace(
+                TOKEN_PLACEHOLDER, context["token"]
+            )
+            for context in contexts
+        ]
+        # Filters applied to uid or token would hide the placeholders; check
+        # the first recipient against a full render.
+        if bodies[0] != render(template, contexts[0]):
+            bodies = None
+
+    if bodies is None:
+        bodies = [
+            render(template, _context(user, domain, token_generator)) for user in users
+        ]
+
+    messages = []
+    for user, body in zip(users, bodies):
+        message = EmailMessage(
+            mail_subject, body, settings.DEFAULT_FROM_EMAIL, [user.email]
+        )
+        message.content_subtype = "html"
+        messages.append(message)
+    return messages
@@ -0,0 +1,316 @@
+"""
+A small asyncio SMTP client and a pool of sessions built on it.
+
+The blocking smtplib conversation costs a worker one round trip per command
+and message. ``AsyncSMTPPool`` keeps up to ``size`` sessions open and sends
+that many messages concurrently, while per-domain rate limits keep us under
+the limits of the receiving providers.
+
+Errors are reported with smtplib's exception classes, so callers handle them
+the same way as with Django's SMTP backend.
+"""
+
+import asyncio
+import base64
+import re
+import smtplib
+import socket
+import ssl
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# One message: envelope sender, envelope recipients and the raw message.
+Envelope = Tuple[str, List[str], bytes]
+
+CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    ConnectionError,
+    asyncio.IncompleteReadError,
+    asyncio.TimeoutError,
+)
+
+
+class AsyncSMTPSession:
+    """One SMTP conversation: connect, EHLO, optional STARTTLS and AUTH."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        use_ssl: bool = False,
+        timeout: Optional[float] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        local_hostname: Optional[str] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.local_hostname = local_hostname or socket.getfqdn()
+        self.extensions = {}
+        self._reader = None
+        self._writer = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        context = self.ssl_context or ssl.create_default_context()
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self.host, self.port, ssl=context if self.use_ssl else None
+            ),
+            self.timeout,
+        )
+        try:
+            await self._expect(220)
+            await self.ehlo()
+            if self.use_tls:
+                await self.command("STARTTLS", 220)
+                await self._writer.start_tls(context, server_hostname=self.host)
+                await self.ehlo()
+            if self.username and self.password:
+                await self.login()
+        except BaseException:
+            self.abort()
+            raise
+
+    async def ehlo(self) -> None:
+        _, lines = await self.command(f"EHLO {self.local_hostname}", 250)
+        self.extensions = {}
+        for line in lines[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.upper()] = params.upper().split()
+
+    async def login(self) -> None:
+        methods = self.extensions.get("AUTH", [])
+        if "PLAIN" in methods:
+            token = _b64(f"\0{self.username}\0{self.password}")
+            await self._auth(f"AUTH PLAIN {token}", 235)
+        elif "LOGIN" in methods:
+            await self._auth("AUTH LOGIN", 334)
+            await self._auth(_b64(self.username), 334)
+            await self._auth(_b64(self.password), 235)
+        else:
+            raise smtplib.SMTPNotSupportedError(
+                "No supported authentication method found."
+            )
+
+    async def _auth(self, line: str, expected: int) -> None:
+        code, lines = await self.command(line)
+        if code != expected:
+            raise smtplib.SMTPAuthenticationError(code, "\n".join(lines))
+
+    async def sendmail(
+        self, from_addr: str, recipients: Iterable[str], data: bytes
+    ) -> Dict[str, Tuple[int, str]]:
+        """
+        Send one message and return the recipients the server refused, like
+        smtplib.SMTP.sendmail().
+        """
+        recipients = list(recipients)
+        code, lines = await self.command(f"MAIL FROM:<{from_addr}>")
+        if code != 250:
+            await self.reset()
+            raise smtplib.SMTPSenderRefused(code, "\n".join(lines), from_addr)
+
+        refused = {}
+        for recipient in recipients:
+            code, lines = await self.command(f"RCPT TO:<{recipient}>")
+            if code not in (250, 251):
+                refused[recipient] = (code, "\n".join(lines))
+        if len(refused) == len(recipients):
+            await self.reset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, lines = await self.command("DATA")
+        if code != 354:
+            await self.reset()
+            raise smtplib.SMTPDataError(code, "\n".join(lines))
+
+        self._writer.write(_dot_stuff(data) + b".\r\n")
+        code, lines = await self._read_reply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, "\n".join(lines))
+        return refused
+
+    async def reset(self) -> None:
+        await self.command("RSET")
+
+    async def quit(self) -> None:
+        if not self.connected:
+            return
+        try:
+            await self.command("QUIT")
+        except (smtplib.SMTPException, *CONNECTION_ERRORS):
+            pass
+        self.abort()
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def command(
+        self, line: str, expected: Optional[int] = None
+    ) -> Tuple[int, List[str]]:
+        if not self.connected:
+            raise smtplib.SMTPServerDisconnected("Not connected.")
+        self._writer.write(line.encode("ascii") + b"\r\n")
+        if expected is None:
+            return await self._read_reply()
+        return await self._expect(expected)
+
+    async def _expect(self, expected: int) -> Tuple[int, List[str]]:
+        code, lines = await self._read_reply()
+        if code != expected:
+            raise smtplib.SMTPResponseException(code, "\n".join(lines))
+        return code, lines
+
+    async def _read_reply(self) -> Tuple[int, List[str]]:
+        lines = []
+        while True:
+            raw = await asyncio.wait_for(self._reader.readline(), self.timeout)
+            if not raw:
+                self.abort()
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed.")
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            lines.append(line[4:])
+            if line[3:4] != "-":
+                break
+
+        code = int(line[:3])
+        if code == 421:
+            # The server is closing the session (e.g. after an idle timeout).
+            self.abort()
+            raise smtplib.SMTPServerDisconnected("\n".join(lines))
+        return code, lines
+
+
+class RateLimiter:
+    """
+    Spaces out acquisitions so at most `rate` happen per second. It isn't
+    tied to an event loop, so it can outlive the loop it was first used on.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AsyncSMTPPool:
+    """
+    Sends messages over up to `size` concurrent sessions, reusing them
+    between messages and reconnecting when the server drops one.
+
+    `rate_limits` maps recipient domains to messages per second;
+    `default_rate`, if set, applies to every other domain. Pass `limiters`
+    to share the per-domain RateLimiters with pools created later.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int = 8,
+        rate_limits: Optional[Dict[str, float]] = None,
+        default_rate: Optional[float] = None,
+        limiters: Optional[Dict[str, RateLimiter]] = None,
+        **session_options,
+    ):
+        self.size = size
+        self.rate_limits = {
+            domain.lower(): rate for domain, rate in (rate_limits or {}).items()
+        }
+        self.default_rate = default_rate
+        self.session_options = session_options
+        self._limiters = {} if limiters is None else limiters
+        self._idle = None
+        self._created = 0
+
+    async def send_many(self, envelopes: List[Envelope]) -> List[Optional[Exception]]:
+        """
+        Send every message and return, for each, None or the error it failed
+        with.
+        """
+        return await asyncio.gather(*(self.send(*envelope) for envelope in envelopes))
+
+    async def send(
+        self, from_addr: str, recipients: List[str], data: bytes
+    ) -> Optional[Exception]:
+        for domain in {
+            recipient.rpartition("@")[2].lower() for recipient in recipients
+        }:
+            limiter = self._limiter(domain)
+            if limiter is not None:
+                await limiter.acquire()
+
+        session = await self._checkout()
+        try:
+            for attempt in range(2):
+                try:
+                    if not session.connected:
+                        await session.connect()
+                    await session.sendmail(from_addr, recipients, data)
+                    return None
+                except CONNECTION_ERRORS as error:
+                    session.abort()
+                    if attempt:
+                        return error
+                except (smtplib.SMTPException, OSError) as error:
+                    return error
+        finally:
+            self._idle.put_nowait(session)
+
+    async def close(self) -> None:
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            await self._idle.get_nowait().quit()
+        self._idle = None
+        self._created = 0
+
+    async def _checkout(self) -> AsyncSMTPSession:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            return AsyncSMTPSession(**self.session_options)
+        return await self._idle.get()
+
+    def _limiter(self, domain: str) -> Optional[RateLimiter]:
+        rate = self.rate_limits.get(domain, self.default_rate)
+        if not rate:
+            return None
+        if domain not in self._limiters:
+            self._limiters[domain] = RateLimiter(rate)
+        return self._limiters[domain]
+
+
+def _b64(value: str) -> str:
+    return base64.b64encode(value.encode("utf-8")).decode("ascii")
+
+
+def _dot_stuff(data: bytes) -> bytes:
+    data = re.sub(rb"(?:\r\n|\n|\r(?!\n))", b"\r\n", data)
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return re.sub(rb"(?m)^\.", b"..", data)
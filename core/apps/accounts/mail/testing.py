@@ -0,0 +1,176 @@
+"""
+An in-process SMTP server for tests and load tests.
+
+It speaks enough SMTP for AsyncSMTPSession and smtplib (EHLO, AUTH PLAIN and
+LOGIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT), keeps every accepted message and
+can add a fixed latency to each reply to imitate a remote relay.
+"""
+
+import asyncio
+import base64
+import threading
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+
+class ReceivedMessage(NamedTuple):
+    mail_from: str
+    recipients: List[str]
+    data: bytes
+
+
+class SMTPStandIn:
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        credentials: Optional[Tuple[str, str]] = None,
+        auth_methods: Tuple[str, ...] = ("PLAIN", "LOGIN"),
+        refuse: Optional[Set[str]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.credentials = credentials
+        self.auth_methods = auth_methods
+        self.refuse = refuse or set()
+        self.messages: List[ReceivedMessage] = []
+        self.connections = 0
+        self.max_concurrent = 0
+        # Set to drop the next connection that starts a transaction.
+        self.drop_next = False
+        self._active = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def start(self) -> "SMTPStandIn":
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._active += 1
+        self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            await self._session(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._active -= 1
+            writer.close()
+
+    async def _reply(self, writer, *lines):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for index, line in enumerate(lines):
+            separator = " " if index == len(lines) - 1 else "-"
+            writer.write(f"{line[:3]}{separator}{line[4:]}\r\n".encode())
+        await writer.drain()
+
+    async def _readline(self, reader) -> str:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError
+        return line.decode().rstrip("\r\n")
+
+    async def _session(self, reader, writer):
+        await self._reply(writer, "220 stand-in ESMTP")
+        mail_from, recipients = None, []
+
+        while True:
+            line = await self._readline(reader)
+            verb, _, argument = line.partition(" ")
+            verb = verb.upper()
+
+            if verb in ("EHLO", "HELO"):
+                extensions = ["250 stand-in", "250 8BITMIME"]
+                if self.credentials:
+                    extensions.insert(1, f"250 AUTH {' '.join(self.auth_methods)}")
+                await self._reply(writer, *extensions)
+            elif verb == "AUTH":
+                await self._auth(reader, writer, argument)
+            elif verb == "MAIL":
+                if self.drop_next:
+                    self.drop_next = False
+                    return
+                mail_from, recipients = _address(argument), []
+                await self._reply(writer, "250 OK")
+            elif verb == "RCPT":
+                recipient = _address(argument)
+                if recipient in self.refuse:
+                    await self._reply(writer, "550 No such user")
+                else:
+                    recipients.append(recipient)
+                    await self._reply(writer, "250 OK")
+            elif verb == "DATA":
+                await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := await reader.readline()) != b".\r\n":
+                    if not chunk:
+                        raise ConnectionError
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                self.messages.append(
+                    ReceivedMessage(mail_from, recipients, b"".join(data))
+                )
+                mail_from, recipients = None, []
+                await self._reply(writer, "250 Queued")
+            elif verb in ("RSET", "NOOP"):
+                mail_from, recipients = None, []
+                await self._reply(writer, "250 OK")
+            elif verb == "QUIT":
+                await self._reply(writer, "221 Bye")
+                return
+            else:
+                await self._reply(writer, "502 Command not implemented")
+
+    async def _auth(self, reader, writer, argument):
+        method, _, initial = argument.partition(" ")
+        method = method.upper()
+        if method not in self.auth_methods:
+            await self._reply(writer, "504 Unrecognized authentication type")
+            return
+
+        if method == "PLAIN":
+            _, username, password = _decode(initial).split("\0")
+        else:
+            await self._reply(writer, "334 VXNlcm5hbWU6")
+            username = _decode(await self._readline(reader))
+            await self._reply(writer, "334 UGFzc3dvcmQ6")
+            password = _decode(await self._readline(reader))
+
+        if (username, password) == self.credentials:
+            await self._reply(writer, "235 Authentication successful")
+        else:
+            await self._reply(writer, "535 Authentication failed")
+
+
+def _address(argument: str) -> str:
+    return argument.partition(":")[2].strip().strip("<>")
+
+
+def _decode(value: str) -> str:
+    return base64.b64decode(value).decode()
@@ -0,0 +1,52 @@
+from apps.accounts import approval
+from apps.accounts.models import ApplyInstructor
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Approve pending instructor applications, creating the user, profile "
+        "and instructor of each one and queueing their approval emails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "application_ids",
+            nargs="*",
+            type=int,
+            help="Applications to approve (default: every pending one).",
+        )
+        parser.add_argument(
+            "--domain",
+            required=True,
+            help="Domain the activation links in the approval emails point to.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Applications approved per transaction (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive number.")
+
+        applications = ApplyInstructor.objects.all()
+        if options["application_ids"]:
+            applications = applications.filter(pk__in=options["application_ids"])
+
+        result = approval.approve(
+            applications, options["domain"], batch_size=options["batch_size"]
+        )
+        for application in result.conflicts:
+            self.stderr.write(
+                f"Application {application.pk} left pending: {application.email} "
+                "already has an account."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Approved {len(result.approved)} applications, "
+                f"{len(result.conflicts)} left pending."
+            )
+        )
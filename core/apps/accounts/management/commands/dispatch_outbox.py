@@ -0,0 +1,69 @@
+import time
+
+from apps.accounts import outbox
+from apps.accounts.mail import get_mail_dispatcher
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Send due outbox emails. With --loop it keeps polling, so it can run "
+        "as a dedicated mail process instead of the dispatch_outbox task."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "ACCOUNTS_OUTBOX_BATCH_SIZE", 100),
+            help="Emails claimed and sent together (default: "
+            "ACCOUNTS_OUTBOX_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only print the number of waiting emails and the age of the "
+            "oldest due one.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, polling for due emails.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when no email is due (default: 1).",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            stats = outbox.stats()
+            self.stdout.write(
+                f"{stats['pending']} emails waiting, {stats['due']} due, oldest "
+                f"due {stats['oldest_due_age_seconds']:.1f}s ago."
+            )
+            return
+
+        dispatcher = get_mail_dispatcher()
+        sent = 0
+        try:
+            while True:
+                processed = outbox.dispatch(
+                    batch_size=options["batch_size"], max_batches=1
+                )
+                sent += processed
+                if processed:
+                    self.stdout.write(f"Processed {processed} emails.")
+                elif not options["loop"]:
+                    break
+                else:
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            dispatcher.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {sent} emails."))
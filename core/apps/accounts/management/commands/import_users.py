@@ -0,0 +1,114 @@
+import json
+import os
+from itertools import islice
+
+from apps.accounts import importing
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users and their profiles from a CSV file (with a header row) or "
+        "a JSONL file. Recognised columns are email, username, password, "
+        "first_name, last_name, phone and gender; only email is required."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--format",
+            choices=importing.FORMATS,
+            help="Input format (default: guessed from the file extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows validated and written per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--method",
+            choices=importing.METHODS,
+            default="auto",
+            help="How rows are written: bulk_create, PostgreSQL COPY, or COPY "
+            "when available (default: auto).",
+        )
+        parser.add_argument(
+            "--activate",
+            action="store_true",
+            help="Mark imported users as active, skipping email verification.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Progress file used to resume an interrupted import "
+            "(default: <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--errors",
+            help="File that receives one JSON line per rejected row "
+            "(default: <path>.errors.jsonl).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and start from the first row.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive number.")
+
+        try:
+            importer = importing.UserImporter(
+                method=options["method"], activate=options["activate"]
+            )
+        except ValueError as error:
+            raise CommandError(error)
+
+        if not os.path.isfile(path):
+            raise CommandError(f"{path} does not exist.")
+
+        checkpoint = importing.Checkpoint(options["checkpoint"] or f"{path}.checkpoint")
+        done = 0 if options["restart"] else checkpoint.load()
+        if done:
+            self.stdout.write(f"Resuming after {done} rows.")
+
+        rows = importing.read_rows(path, options["format"])
+        batches = importing.batched(islice(rows, done, None), batch_size)
+
+        imported = rejected = 0
+        with open(options["errors"] or f"{path}.errors.jsonl", "a") as report:
+            for number, batch in enumerate(batches, start=done // batch_size + 1):
+                users, errors = importer.validate(batch)
+
+                try:
+                    if users:
+                        importer.load([user for _, user in users])
+                except DatabaseError as error:
+                    errors += [
+                        {"line": line, "email": user["email"], "errors": str(error)}
+                        for line, user in users
+                    ]
+                    users = []
+
+                for entry in errors:
+                    report.write(json.dumps({"batch": number, **entry}) + "\n")
+                report.flush()
+
+                done += len(batch)
+                imported += len(users)
+                rejected += len(errors)
+                checkpoint.save(done)
+
+                self.stdout.write(
+                    f"Batch {number}: {len(users)} imported, {len(errors)} "
+                    f"rejected ({done} rows processed)."
+                )
+
+        checkpoint.clear()
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {imported} users, rejected {rejected}.")
+        )
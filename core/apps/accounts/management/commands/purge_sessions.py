@@ -0,0 +1,53 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete rows from the django_session table in small chunks, so the "
+        "purge doesn't hold long locks or bloat a single transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Delete every session, not only expired ones.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of rows deleted per statement (default: 5000).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between chunks (default: 0).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Session.objects.order_by()
+        if not options["all"]:
+            queryset = queryset.filter(expire_date__lt=timezone.now())
+
+        deleted = 0
+        while True:
+            keys = list(
+                queryset.values_list("session_key", flat=True)[: options["chunk_size"]]
+            )
+            if not keys:
+                break
+
+            count, _ = Session.objects.filter(session_key__in=keys).delete()
+            deleted += count
+            self.stdout.write(f"Deleted {deleted} sessions so far.")
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} sessions."))
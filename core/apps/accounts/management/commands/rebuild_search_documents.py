@@ -0,0 +1,32 @@
+from apps.accounts import search
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite the full-text search documents of instructors from their job "
+        "titles, skills, educations and experiences."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "instructor_ids",
+            nargs="*",
+            type=int,
+            help="Instructors to rebuild (default: all of them).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Instructors rewritten per query batch (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive number.")
+
+        written = search.rebuild(
+            options["instructor_ids"] or None, batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} search documents."))
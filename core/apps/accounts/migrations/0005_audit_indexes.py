@@ -0,0 +1,67 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:23
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_outboxemail"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="uuid",
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name="applyinstructor",
+            index=models.Index(
+                fields=["status", "-created_at"], name="apply_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="education",
+            index=models.Index(
+                fields=["institution"], name="education_institution_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="experience",
+            index=models.Index(
+                fields=["company", "-created_at", "-updated_at"],
+                name="experience_company_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="experience",
+            index=models.Index(
+                fields=["-created_at", "-updated_at"], name="experience_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                fields=["status", "-created_at"], name="instructor_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                condition=models.Q(("is_public", True)),
+                fields=["-created_at"],
+                name="profile_public_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(fields=["level"], name="skill_level_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["-created_at"], name="user_created_idx"),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_audit_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InstructorSummary",
+            fields=[
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "instructor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="accounts.instructor",
+                        verbose_name="instructor",
+                    ),
+                ),
+                (
+                    "skill_count",
+                    models.PositiveIntegerField(default=0, verbose_name="skills"),
+                ),
+                (
+                    "max_skill_rank",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="highest skill level"
+                    ),
+                ),
+                (
+                    "highest_degree_rank",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="highest degree"
+                    ),
+                ),
+                (
+                    "experience_days",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="experience days"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Instructor summary",
+                "verbose_name_plural": "Instructor summaries",
+                "indexes": [
+                    models.Index(
+                        fields=["skill_count"], name="summary_skill_count_idx"
+                    ),
+                    models.Index(
+                        fields=["max_skill_rank"], name="summary_skill_rank_idx"
+                    ),
+                    models.Index(
+                        fields=["highest_degree_rank"], name="summary_degree_rank_idx"
+                    ),
+                    models.Index(
+                        fields=["experience_days"], name="summary_experience_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
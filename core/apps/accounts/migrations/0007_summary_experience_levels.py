@@ -0,0 +1,57 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_instructorsummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="instructorsummary",
+            name="intern_days",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="intern experience days"
+            ),
+        ),
+        migrations.AddField(
+            model_name="instructorsummary",
+            name="junior_days",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="junior experience days"
+            ),
+        ),
+        migrations.AddField(
+            model_name="instructorsummary",
+            name="mid_days",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="mid-level experience days"
+            ),
+        ),
+        migrations.AddField(
+            model_name="instructorsummary",
+            name="senior_days",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="senior experience days"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructorsummary",
+            index=models.Index(fields=["intern_days"], name="summary_intern_days_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instructorsummary",
+            index=models.Index(fields=["junior_days"], name="summary_junior_days_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instructorsummary",
+            index=models.Index(fields=["mid_days"], name="summary_mid_days_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instructorsummary",
+            index=models.Index(fields=["senior_days"], name="summary_senior_days_idx"),
+        ),
+    ]
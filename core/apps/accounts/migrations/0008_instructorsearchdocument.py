@@ -0,0 +1,141 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# The full-text index as of this migration: a generated tsvector column and
+# GIN index on PostgreSQL, an external content FTS5 table kept in sync by
+# triggers on SQLite. The SQL is copied here rather than imported from
+# apps.accounts.search, so later changes to that module can't change what
+# this migration does.
+INSTALL = {
+    "postgresql": [
+        """
+        ALTER TABLE accounts_instructorsearchdocument
+        ADD COLUMN IF NOT EXISTS document tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', headline), 'A')
+            || setweight(to_tsvector('english', roles), 'B')
+            || setweight(to_tsvector('english', organizations), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS search_document_idx "
+        "ON accounts_instructorsearchdocument USING gin (document)",
+    ],
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS accounts_instructorsearchdocument_fts
+        USING fts5(
+            headline, roles, organizations,
+            content='accounts_instructorsearchdocument',
+            content_rowid='instructor_id',
+            tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS accounts_instructorsearchdocument_fts_insert
+        AFTER INSERT ON accounts_instructorsearchdocument BEGIN
+            INSERT INTO accounts_instructorsearchdocument_fts
+                (rowid, headline, roles, organizations)
+            VALUES (new.instructor_id, new.headline, new.roles, new.organizations);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS accounts_instructorsearchdocument_fts_delete
+        AFTER DELETE ON accounts_instructorsearchdocument BEGIN
+            INSERT INTO accounts_instructorsearchdocument_fts
+                (accounts_instructorsearchdocument_fts, rowid,
+                 headline, roles, organizations)
+            VALUES ('delete', old.instructor_id,
+                    old.headline, old.roles, old.organizations);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS accounts_instructorsearchdocument_fts_update
+        AFTER UPDATE ON accounts_instructorsearchdocument BEGIN
+            INSERT INTO accounts_instructorsearchdocument_fts
+                (accounts_instructorsearchdocument_fts, rowid,
+                 headline, roles, organizations)
+            VALUES ('delete', old.instructor_id,
+                    old.headline, old.roles, old.organizations);
+            INSERT INTO accounts_instructorsearchdocument_fts
+                (rowid, headline, roles, organizations)
+            VALUES (new.instructor_id, new.headline, new.roles, new.organizations);
+        END
+        """,
+        "INSERT INTO accounts_instructorsearchdocument_fts "
+        "(accounts_instructorsearchdocument_fts) VALUES ('rebuild')",
+    ],
+}
+UNINSTALL = {
+    "postgresql": [
+        "DROP INDEX IF EXISTS search_document_idx",
+        "ALTER TABLE accounts_instructorsearchdocument "
+        "DROP COLUMN IF EXISTS document",
+    ],
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS accounts_instructorsearchdocument_fts_insert",
+        "DROP TRIGGER IF EXISTS accounts_instructorsearchdocument_fts_delete",
+        "DROP TRIGGER IF EXISTS accounts_instructorsearchdocument_fts_update",
+        "DROP TABLE IF EXISTS accounts_instructorsearchdocument_fts",
+    ],
+}
+
+
+def execute(statements):
+    # Other databases get no index.
+    def operation(apps, schema_editor):
+        with schema_editor.connection.cursor() as cursor:
+            for sql in statements.get(schema_editor.connection.vendor, []):
+                cursor.execute(sql)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_summary_experience_levels"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InstructorSearchDocument",
+            fields=[
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "instructor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="accounts.instructor",
+                        verbose_name="instructor",
+                    ),
+                ),
+                (
+                    "headline",
+                    models.TextField(blank=True, verbose_name="job title and skills"),
+                ),
+                (
+                    "roles",
+                    models.TextField(blank=True, verbose_name="roles and majors"),
+                ),
+                (
+                    "organizations",
+                    models.TextField(
+                        blank=True, verbose_name="companies and institutions"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Instructor search document",
+                "verbose_name_plural": "Instructor search documents",
+            },
+        ),
+        migrations.RunPython(execute(INSTALL), execute(UNINSTALL)),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_instructorsearchdocument"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="applyinstructor",
+            name="apply_status_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="instructor",
+            name="instructor_status_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="applyinstructor",
+            index=models.Index(fields=["-created_at", "-id"], name="apply_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="applyinstructor",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"], name="apply_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="instructor_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="instructor_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["-created_at", "-id"], name="user_created_idx"),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:40
+
+from django.db import migrations
+
+# The columns the accounts admins search, as (table, column). The SQL is
+# written here rather than imported from apps.accounts.admin_search, so later
+# changes to that module can't change what this migration does. The trigram
+# indexes need pg_trgm and are created by 0013_admin_search_trigrams.
+COLUMNS = [
+    ("accounts_user", "email"),
+    ("accounts_user", "username"),
+    ("accounts_profile", "first_name"),
+    ("accounts_profile", "last_name"),
+    ("accounts_profile", "phone"),
+    ("accounts_instructor", "job_title"),
+    ("accounts_skill", "name"),
+    ("accounts_education", "major"),
+    ("accounts_education", "institution"),
+    ("accounts_experience", "job_title"),
+    ("accounts_experience", "company"),
+]
+
+# Prefix indexes on the expressions istartswith compares.
+INSTALL = {
+    "postgresql": [
+        f"CREATE INDEX IF NOT EXISTS {table}_{column}_prefix ON {table} "
+        f"(UPPER({column}::text) text_pattern_ops)"
+        for table, column in COLUMNS
+    ],
+    "sqlite": [
+        f"CREATE INDEX IF NOT EXISTS {table}_{column}_prefix "
+        f"ON {table} ({column} COLLATE NOCASE)"
+        for table, column in COLUMNS
+    ],
+}
+UNINSTALL = {
+    vendor: [
+        f"DROP INDEX IF EXISTS {table}_{column}_prefix" for table, column in COLUMNS
+    ]
+    for vendor in ("postgresql", "sqlite")
+}
+
+
+def execute(statements):
+    # Other databases get no index.
+    def operation(apps, schema_editor):
+        with schema_editor.connection.cursor() as cursor:
+            for sql in statements.get(schema_editor.connection.vendor, []):
+                cursor.execute(sql)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(execute(INSTALL), execute(UNINSTALL)),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:36
+
+from django.db import migrations, models
+
+# SQLite alters a column by rebuilding its table, which drops the raw
+# job_title prefix index 0010_admin_search_indexes created on it.
+SQLITE_PREFIX_INDEX = (
+    "CREATE INDEX IF NOT EXISTS accounts_instructor_job_title_prefix "
+    "ON accounts_instructor (job_title COLLATE NOCASE)"
+)
+
+
+def restore_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(SQLITE_PREFIX_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0010_admin_search_indexes"),
+    ]
+
+    # Restored after the columns are altered in either direction.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_prefix_index),
+        migrations.AlterField(
+            model_name="instructor",
+            name="birthdate",
+            field=models.DateField(blank=True, null=True, verbose_name="date of birth"),
+        ),
+        migrations.AlterField(
+            model_name="instructor",
+            name="experience_year",
+            field=models.PositiveSmallIntegerField(
+                default=0, verbose_name="experience years"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="instructor",
+            name="job_start_date",
+            field=models.DateField(
+                blank=True, null=True, verbose_name="job start date"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="instructor",
+            name="job_title",
+            field=models.CharField(
+                blank=True, default="", max_length=100, verbose_name="job title"
+            ),
+        ),
+        migrations.RunPython(restore_prefix_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:53
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0011_instructor_optional_profile_fields"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    # The unique indexes are built before the plain ones are dropped, so
+    # login lookups always have one. Emails or usernames that differ only by
+    # case must be resolved first, or building them fails.
+    operations = [
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="user_email_lower_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("username"),
+                name="user_username_lower_uniq",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_email_lower_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_username_lower_idx",
+        ),
+    ]
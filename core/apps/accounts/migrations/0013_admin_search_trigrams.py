@@ -0,0 +1,101 @@
+"""
+Creates the pg_trgm extension and the trigram indexes the admin searches
+match substrings with (see apps.accounts.admin_search).
+
+Creating an extension needs elevated rights: a superuser, or, pg_trgm being
+a trusted extension since PostgreSQL 13, CREATE on the database. Where the
+application role has neither, this migration logs a warning and carries on
+without the trigram indexes, and admin searches match prefixes only. To add
+them later, have a superuser run ``CREATE EXTENSION pg_trgm;`` in the
+database, then rerun this migration with::
+
+    python manage.py migrate accounts 0012
+    python manage.py migrate accounts
+
+On other databases it does nothing.
+"""
+
+import logging
+
+from django.db import DatabaseError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+# The columns the accounts admins search, as (table, column); see 0010.
+COLUMNS = [
+    ("accounts_user", "email"),
+    ("accounts_user", "username"),
+    ("accounts_profile", "first_name"),
+    ("accounts_profile", "last_name"),
+    ("accounts_profile", "phone"),
+    ("accounts_instructor", "job_title"),
+    ("accounts_skill", "name"),
+    ("accounts_education", "major"),
+    ("accounts_education", "institution"),
+    ("accounts_experience", "job_title"),
+    ("accounts_experience", "company"),
+]
+
+
+def create_extension(cursor, alias) -> bool:
+    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    if cursor.fetchone():
+        return True
+
+    cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    if not cursor.fetchone():
+        logger.warning(
+            "pg_trgm is not available; admin searches will match prefixes only."
+        )
+        return False
+
+    try:
+        # A failed statement aborts the transaction; the savepoint keeps the
+        # rest of the migration running.
+        with transaction.atomic(using=alias):
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError as error:
+        logger.warning(
+            "Could not create pg_trgm (%s); admin searches will match prefixes "
+            "only. See the %s migration to add it later.",
+            error,
+            __name__,
+        )
+        return False
+    return True
+
+
+def install(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        if not create_extension(cursor, connection.alias):
+            return
+        for table, column in COLUMNS:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} "
+                f"USING gin (UPPER({column}::text) gin_trgm_ops)"
+            )
+
+
+def uninstall(apps, schema_editor):
+    # pg_trgm stays; other indexes may have come to depend on it.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in COLUMNS:
+            cursor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_user_login_lower_unique"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.1.3 on 2026-10-18 18:10
+
+from django.db import migrations
+from django.utils import timezone
+
+# Creates the summaries of instructors that existed before summaries were
+# maintained. The ranks and the interval sweep are copied here rather than
+# imported from apps.accounts.summaries, so later changes to that module can't
+# change what this migration does. Existing summaries are left alone.
+BATCH_SIZE = 500
+
+SKILL_LEVEL_RANKS = {"BASIC": 1, "INTERMEDIATE": 2, "ADVANCED": 3}
+DEGREE_RANKS = {
+    "Other": 1,
+    "Diploma": 2,
+    "Bachelor": 3,
+    "Master": 4,
+    "Professional": 5,
+    "Doctorate": 6,
+}
+LEVEL_DAYS_FIELDS = {
+    "INTERN": "intern_days",
+    "JUNIOR": "junior_days",
+    "MID": "mid_days",
+    "SENIOR": "senior_days",
+}
+
+
+def union_days(intervals):
+    # Intervals are (start, end) day ordinals sorted by start.
+    total = 0
+    current_start = current_end = None
+    for start, end in intervals:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        elif end > current_end:
+            current_end = end
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def backfill(apps, schema_editor):
+    Instructor = apps.get_model("accounts", "Instructor")
+    InstructorSummary = apps.get_model("accounts", "InstructorSummary")
+    Skill = apps.get_model("accounts", "Skill")
+    Education = apps.get_model("accounts", "Education")
+    Experience = apps.get_model("accounts", "Experience")
+
+    instructor_ids = list(
+        Instructor.objects.filter(summary__isnull=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    today = timezone.localdate().toordinal()
+
+    for offset in range(0, len(instructor_ids), BATCH_SIZE):
+        batch = instructor_ids[offset : offset + BATCH_SIZE]
+        summaries = {pk: InstructorSummary(instructor_id=pk) for pk in batch}
+
+        for instructor_id, level in Skill.objects.filter(
+            instructor_id__in=batch
+        ).values_list("instructor_id", "level"):
+            summary = summaries[instructor_id]
+            summary.skill_count += 1
+            summary.max_skill_rank = max(
+                summary.max_skill_rank, SKILL_LEVEL_RANKS.get(level, 0)
+            )
+
+        for instructor_id, degree in Education.objects.filter(
+            instructor_id__in=batch
+        ).values_list("instructor_id", "degree"):
+            summary = summaries[instructor_id]
+            summary.highest_degree_rank = max(
+                summary.highest_degree_rank, DEGREE_RANKS.get(degree, 0)
+            )
+
+        jobs = {}
+        for instructor_id, level, start, end in (
+            Experience.objects.filter(instructor_id__in=batch)
+            .order_by("instructor_id", "start")
+            .values_list("instructor_id", "level", "start", "end")
+        ):
+            start = start.toordinal()
+            end = today if end is None else max(end.toordinal(), start)
+            jobs.setdefault(instructor_id, []).append((level, start, end))
+        for instructor_id, rows in jobs.items():
+            summary = summaries[instructor_id]
+            summary.experience_days = union_days((start, end) for _, start, end in rows)
+            for level, field in LEVEL_DAYS_FIELDS.items():
+                setattr(
+                    summary,
+                    field,
+                    union_days(
+                        (start, end) for row, start, end in rows if row == level
+                    ),
+                )
+
+        InstructorSummary.objects.bulk_create(summaries.values(), ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0013_admin_search_trigrams"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 import uuid
-from typing import Optional
+from typing import Callable, Iterable, List, Optional
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import (
     AbstractBaseUser,
@@ -9,11 +10,12 @@ from django.contrib.auth.models import (
 )
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator, validate_email
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from . import validators
+from . import hashing, validators
 
 
 class BaseModel(models.Model):
@@ -39,12 +41,99 @@ class UserManager(BaseUserManager):
         username: str,
         email: str,
         password: Optional[str] = None,
+        profile: Optional[dict] = None,
+        on_create: Optional[Callable] = None,
         **extra_fields,
     ):
         """
-        Creates and saves a new user with given username, email and password
+        Creates and saves a new user with given username, email and password,
+        together with its profile. on_create(user) runs in the same transaction
         """
 
+        user = self._build_user(username=username, email=email, **extra_fields)
+
+        if password:
+            user.set_password(password)
+        else:
+            user.set_unusable_password()
+
+        self._save_with_profile(user, profile, on_create)
+        return user
+
+    async def acreate_user(
+        self,
+        *,
+        username: str,
+        email: str,
+        password: Optional[str] = None,
+        profile: Optional[dict] = None,
+        on_create: Optional[Callable] = None,
+        **extra_fields,
+    ):
+        """
+        Async counterpart of create_user(); the password is hashed without
+        blocking the event loop.
+        """
+
+        user = self._build_user(username=username, email=email, **extra_fields)
+
+        if password:
+            await user.aset_password(password)
+        else:
+            user.set_unusable_password()
+
+        await sync_to_async(self._save_with_profile)(user, profile, on_create)
+        return user
+
+    def bulk_create_users(
+        self, users: Iterable[dict], batch_size: Optional[int] = None
+    ) -> List["User"]:
+        """
+        Creates many users and their profiles in one transaction.
+
+        Each item holds the create_user() arguments, with the profile fields
+        under an optional "profile" key. Passwords are hashed in parallel and
+        each table is written with a single bulk insert.
+        """
+
+        built, passwords, profiles = [], [], []
+        for fields in users:
+            fields = dict(fields)
+            profiles.append(fields.pop("profile", None) or {})
+            passwords.append(fields.pop("password", None) or None)
+            built.append(self._build_user(**fields))
+
+        for user, encoded in zip(built, hashing.make_passwords(passwords)):
+            user.password = encoded
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(built, batch_size=batch_size)
+            Profile.objects.using(self.db).bulk_create(
+                [
+                    Profile(user=user, **profile_fields)
+                    for user, profile_fields in zip(built, profiles)
+                ],
+                batch_size=batch_size,
+            )
+
+        return built
+
+    def _save_with_profile(
+        self,
+        user,
+        profile: Optional[dict] = None,
+        on_create: Optional[Callable] = None,
+    ) -> None:
+        # The profile is created here rather than by the post_save signal, so
+        # a user never exists without one.
+        user._create_profile = False
+        with transaction.atomic(using=self.db):
+            user.save(using=self.db)
+            Profile.objects.using(self.db).create(user=user, **(profile or {}))
+            if on_create is not None:
+                on_create(user)
+
+    def _build_user(self, *, username: str, email: str, **extra_fields):
         if not username:
             raise ValueError(_("Users must have an username."))
 
@@ -54,19 +143,57 @@ class UserManager(BaseUserManager):
         email = self.normalize_email(email)
         self.email_validator(email)
 
-        user = self.model(username=username, email=email, **extra_fields)
+        return self.model(username=username, email=email, **extra_fields)
 
-        if password:
-            user.set_password(password)
-        else:
-            user.set_unusable_password()
+    def generate_username(self, email: str) -> str:
+        """
+        Returns a unique-enough username derived from the email's local part
+        """
 
-        extra_fields.setdefault("is_active", True)
-        extra_fields.setdefault("is_staff", False)
-        extra_fields.setdefault("is_superuser", False)
+        base_username = email.split("@")[0]
+        return f"{base_username}-{uuid.uuid4().hex[:8]}"
 
-        user.save(using=self._db)
-        return user
+    def get_by_login(self, login: str, login_field: Optional[str] = None):
+        """
+        Returns the user whose email or username matches the given login,
+        case-insensitively, or None.
+
+        Only one of the two columns is searched, so the lookup is served by a
+        single functional index instead of an OR across both.
+        """
+
+        if login_field is None:
+            login_field = "email" if "@" in login else "username"
+
+        # Emails and usernames are unique case-insensitively, so at most one
+        # user matches.
+        users = list(self.filter_by_login(login_field, [login])[:1])
+        return users[0] if users else None
+
+    async def aget_by_login(self, login: str, login_field: Optional[str] = None):
+        """See get_by_login()."""
+
+        if login_field is None:
+            login_field = "email" if "@" in login else "username"
+
+        async for user in self.filter_by_login(login_field, [login])[:1]:
+            return user
+        return None
+
+    def filter_by_login(self, login_field: str, logins: Iterable[str]):
+        """
+        Returns the users whose email or username is one of the given logins,
+        case-insensitively, through the column's unique functional index.
+        """
+
+        if login_field not in ("email", "username"):
+            raise ValueError(_("Login field must be either email or username."))
+
+        return (
+            self.alias(login_key=Lower(login_field))
+            .filter(login_key__in={login.lower() for login in logins})
+            .order_by()
+        )
 
     def create_superuser(
         self, *, username: str, email: str, password: str, **extra_fields
@@ -98,9 +225,7 @@ class UserManager(BaseUserManager):
 
 class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     id = models.BigAutoField(primary_key=True, editable=False)
-    uuid = models.UUIDField(
-        default=uuid.uuid4, editable=False, unique=True, db_index=True
-    )
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     email = models.EmailField(
         verbose_name=_("email"),
         max_length=255,
@@ -135,10 +260,45 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         ordering = ["-created_at"]
+        constraints = [
+            # Logins are looked up case-insensitively through these.
+            models.UniqueConstraint(Lower("email"), name="user_email_lower_uniq"),
+            models.UniqueConstraint(Lower("username"), name="user_username_lower_uniq"),
+        ]
+        indexes = [
+            # Keyset pages, see apps.accounts.pagination.
+            models.Index(fields=["-created_at", "-id"], name="user_created_idx"),
+        ]
 
     def __str__(self):
         return self.email
 
+    def set_password(self, raw_password):
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        is_correct, must_update = hashing.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+        return is_correct
+
+    async def aset_password(self, raw_password):
+        self.password = await hashing.amake_password(raw_password)
+        self._password = raw_password
+
+    async def acheck_password(self, raw_password):
+        is_correct, must_update = await hashing.averify_password(
+            raw_password, self.password
+        )
+        if is_correct and must_update:
+            await self.aset_password(raw_password)
+            self._password = None
+            await self.asave(update_fields=["password"])
+        return is_correct
+
 
 class Profile(BaseModel):
     class Gender(models.TextChoices):
@@ -216,6 +376,14 @@ class Profile(BaseModel):
     class Meta:
         verbose_name = _("Profile")
         verbose_name_plural = _("Profiles")
+        indexes = [
+            # Public profiles are listed newest first; private ones never are.
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(is_public=True),
+                name="profile_public_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s Profile" if self.user else "Profile"
@@ -236,12 +404,18 @@ class Instructor(BaseModel):
         related_name="instructor",
     )
     status = models.BooleanField(verbose_name="instructor status", default=False)
-    birthdate = models.DateField(verbose_name=_("date of birth"))
+    # Instructors provisioned from an approved application fill these in
+    # themselves; the application doesn't ask for them.
+    birthdate = models.DateField(verbose_name=_("date of birth"), null=True, blank=True)
     experience_year = models.PositiveSmallIntegerField(
-        verbose_name=_("experience years")
+        verbose_name=_("experience years"), default=0
+    )
+    job_title = models.CharField(
+        verbose_name=_("job title"), max_length=100, blank=True, default=""
+    )
+    job_start_date = models.DateField(
+        verbose_name=_("job start date"), null=True, blank=True
     )
-    job_title = models.CharField(verbose_name=_("job title"), max_length=100)
-    job_start_date = models.DateField(verbose_name=_("job start date"))
     job_end_date = models.DateField(
         verbose_name=_("job end date"), null=True, blank=True
     )
@@ -250,6 +424,15 @@ class Instructor(BaseModel):
     class Meta:
         verbose_name = _("Instructor")
         verbose_name_plural = _("Instructors")
+        indexes = [
+            # Keyset pages, see apps.accounts.pagination, unfiltered and
+            # filtered by status.
+            models.Index(fields=["-created_at", "-id"], name="instructor_created_idx"),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="instructor_status_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Teacher: {self.user.username} - {self.job_title}"
@@ -297,6 +480,15 @@ class ApplyInstructor(BaseModel):
     class Meta:
         verbose_name = _("Apply Instructor")
         verbose_name_plural = _("Apply Instructors")
+        indexes = [
+            # Keyset pages, see apps.accounts.pagination, and pending
+            # applications, oldest or newest first.
+            models.Index(fields=["-created_at", "-id"], name="apply_created_idx"),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="apply_status_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.status}"
@@ -320,6 +512,7 @@ class Skill(BaseModel):
     class Meta:
         verbose_name = _("Skill")
         verbose_name_plural = _("Skills")
+        indexes = [models.Index(fields=["level"], name="skill_level_idx")]
 
 
 class Education(BaseModel):
@@ -346,6 +539,9 @@ class Education(BaseModel):
     class Meta:
         verbose_name = _("Eduction")
         verbose_name_plural = _("Eductions")
+        indexes = [
+            models.Index(fields=["institution"], name="education_institution_idx")
+        ]
 
     @property
     def is_finished(self):
@@ -371,6 +567,205 @@ class Experience(BaseModel):
     start = models.DateField(verbose_name="job start date")
     end = models.DateField(verbose_name="job end date", blank=True, null=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["company", "-created_at", "-updated_at"],
+                name="experience_company_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-updated_at"], name="experience_created_idx"
+            ),
+        ]
+
     @property
     def is_finished(self):
         return self.end is not None
+
+
+class InstructorSummary(BaseModel):
+    """
+    Per-instructor aggregates of skills, educations and experiences, kept in
+    step with them by apps.accounts.summaries so listings can filter and sort
+    on them without joining the child tables.
+
+    Skill levels and degrees are stored as ranks (0 when there are none) so
+    they compare and index as integers.
+    """
+
+    SKILL_LEVEL_RANKS = {
+        Skill.Level.BASIC: 1,
+        Skill.Level.INTERMEDIATE: 2,
+        Skill.Level.ADVANCED: 3,
+    }
+    LEVEL_DAYS_FIELDS = {
+        Experience.Level.INTERN: "intern_days",
+        Experience.Level.JUNIOR: "junior_days",
+        Experience.Level.MID: "mid_days",
+        Experience.Level.SENIOR: "senior_days",
+    }
+    DEGREE_RANKS = {
+        Education.Degree.OTHER: 1,
+        Education.Degree.DIPLOMA: 2,
+        Education.Degree.BACHELOR: 3,
+        Education.Degree.MASTER: 4,
+        Education.Degree.PROFESSIONAL: 5,
+        Education.Degree.DOCTORATE: 6,
+    }
+
+    instructor = models.OneToOneField(
+        Instructor,
+        verbose_name=_("instructor"),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    skill_count = models.PositiveIntegerField(verbose_name=_("skills"), default=0)
+    max_skill_rank = models.PositiveSmallIntegerField(
+        verbose_name=_("highest skill level"), default=0
+    )
+    highest_degree_rank = models.PositiveSmallIntegerField(
+        verbose_name=_("highest degree"), default=0
+    )
+    # Days covered by at least one job, overall and per job level, counting
+    # overlapping jobs once. Ongoing jobs count up to the day they were last
+    # summarized; the nightly rebuild moves them forward.
+    experience_days = models.PositiveIntegerField(
+        verbose_name=_("experience days"), default=0
+    )
+    intern_days = models.PositiveIntegerField(
+        verbose_name=_("intern experience days"), default=0
+    )
+    junior_days = models.PositiveIntegerField(
+        verbose_name=_("junior experience days"), default=0
+    )
+    mid_days = models.PositiveIntegerField(
+        verbose_name=_("mid-level experience days"), default=0
+    )
+    senior_days = models.PositiveIntegerField(
+        verbose_name=_("senior experience days"), default=0
+    )
+
+    class Meta:
+        verbose_name = _("Instructor summary")
+        verbose_name_plural = _("Instructor summaries")
+        indexes = [
+            models.Index(fields=["skill_count"], name="summary_skill_count_idx"),
+            models.Index(fields=["max_skill_rank"], name="summary_skill_rank_idx"),
+            models.Index(
+                fields=["highest_degree_rank"], name="summary_degree_rank_idx"
+            ),
+            models.Index(fields=["experience_days"], name="summary_experience_idx"),
+            models.Index(fields=["intern_days"], name="summary_intern_days_idx"),
+            models.Index(fields=["junior_days"], name="summary_junior_days_idx"),
+            models.Index(fields=["mid_days"], name="summary_mid_days_idx"),
+            models.Index(fields=["senior_days"], name="summary_senior_days_idx"),
+        ]
+
+    def __str__(self):
+        return f"Summary of {self.instructor}"
+
+    @property
+    def experience_years(self) -> float:
+        return self.experience_days / 365.25
+
+    def experience_years_at(self, level: str) -> float:
+        return getattr(self, self.LEVEL_DAYS_FIELDS[level]) / 365.25
+
+    @property
+    def max_skill_level(self) -> Optional[str]:
+        return _label(self.SKILL_LEVEL_RANKS, self.max_skill_rank)
+
+    @property
+    def highest_degree(self) -> Optional[str]:
+        return _label(self.DEGREE_RANKS, self.highest_degree_rank)
+
+
+def _label(ranks: dict, rank: int) -> Optional[str]:
+    return next((value for value, r in ranks.items() if r == rank), None)
+
+
+class InstructorSearchDocument(BaseModel):
+    """
+    The searchable text of an instructor, gathered from their job title,
+    skills, educations and experiences by apps.accounts.search.
+
+    The text is split by weight. On PostgreSQL a generated ``document``
+    tsvector column with a GIN index is built from it, and on SQLite an FTS5
+    table mirrors it. Neither is a model field; both are created by the
+    migration.
+    """
+
+    instructor = models.OneToOneField(
+        Instructor,
+        verbose_name=_("instructor"),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    # Weight A: the instructor's job title and skill names.
+    headline = models.TextField(verbose_name=_("job title and skills"), blank=True)
+    # Weight B: past job titles and education majors.
+    roles = models.TextField(verbose_name=_("roles and majors"), blank=True)
+    # Weight C: companies and institutions.
+    organizations = models.TextField(
+        verbose_name=_("companies and institutions"), blank=True
+    )
+
+    class Meta:
+        verbose_name = _("Instructor search document")
+        verbose_name_plural = _("Instructor search documents")
+
+    def __str__(self):
+        return f"Search document of {self.instructor}"
+
+
+class OutboxEmail(BaseModel):
+    """
+    An email waiting to be sent, written in the same transaction as the
+    change that triggers it and delivered by the dispatch_outbox task.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", _("PENDING")
+        SENDING = "SENDING", _("SENDING")
+        SENT = "SENT", _("SENT")
+        FAILED = "FAILED", _("FAILED")
+
+    user = models.ForeignKey(
+        get_user_model(),
+        verbose_name=_("recipient"),
+        on_delete=models.CASCADE,
+        related_name="outbox_emails",
+    )
+    domain = models.CharField(verbose_name=_("site domain"), max_length=255)
+    subject = models.CharField(verbose_name=_("subject"), max_length=255)
+    template = models.CharField(verbose_name=_("template"), max_length=255)
+    status = models.CharField(
+        verbose_name=_("status"),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(verbose_name=_("attempts"), default=0)
+    # When the email may next be claimed: the retry time of a pending email,
+    # or the end of the lease of one being sent.
+    available_at = models.DateTimeField(
+        verbose_name=_("available at"), default=timezone.now
+    )
+    sent_at = models.DateTimeField(verbose_name=_("sent at"), null=True, blank=True)
+    last_error = models.TextField(verbose_name=_("last error"), blank=True)
+
+    class Meta:
+        verbose_name = _("Outbox email")
+        verbose_name_plural = _("Outbox emails")
+        indexes = [
+            models.Index(
+                fields=["available_at"],
+                name="outbox_due_idx",
+                condition=models.Q(status__in=["PENDING", "SENDING"]),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.user_id} - {self.status}"
@@ -0,0 +1,187 @@
+"""
+Transactional outbox for account emails.
+
+Views write an ``OutboxEmail`` row in the same transaction as the user
+instead of publishing to the broker, so a slow or unavailable broker can't
+slow down or lose a signup. The ``dispatch_outbox`` task claims due rows in
+batches with ``SELECT ... FOR UPDATE SKIP LOCKED``, sends them over one
+connection and schedules failed emails for retry with exponential backoff.
+
+A claimed row is leased for ``ACCOUNTS_OUTBOX_LEASE`` seconds; if the worker
+dies before recording the outcome, the row becomes claimable again once the
+lease runs out.
+
+``stats()`` reports the depth of the outbox and how long its oldest due
+email has been waiting, for monitoring (``dispatch_outbox --stats``).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .mail import get_mail_dispatcher, render_verification_emails
+from .models import OutboxEmail
+from .tokens import set_password_token_generator
+
+logger = logging.getLogger(__name__)
+
+VERIFICATION_SUBJECT = "Please activate your account"
+VERIFICATION_TEMPLATE = "emails/account_verification_email.html"
+APPROVAL_SUBJECT = "Your instructor application was approved"
+APPROVAL_TEMPLATE = "emails/instructor_approval_email.html"
+
+# Templates whose links are checked by another generator than the activation
+# view's default_token_generator.
+TOKEN_GENERATORS = {APPROVAL_TEMPLATE: set_password_token_generator}
+
+
+def queue_verification_email(user, domain: str) -> OutboxEmail:
+    return OutboxEmail.objects.create(
+        user=user,
+        domain=domain,
+        subject=VERIFICATION_SUBJECT,
+        template=VERIFICATION_TEMPLATE,
+    )
+
+
+def queue_approval_emails(users, domain: str) -> List[OutboxEmail]:
+    return OutboxEmail.objects.bulk_create(
+        OutboxEmail(
+            user=user,
+            domain=domain,
+            subject=APPROVAL_SUBJECT,
+            template=APPROVAL_TEMPLATE,
+        )
+        for user in users
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    base = getattr(settings, "ACCOUNTS_OUTBOX_RETRY_DELAY", 30)
+    limit = getattr(settings, "ACCOUNTS_OUTBOX_RETRY_DELAY_MAX", 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), limit))
+
+
+def claim(batch_size: int) -> List[OutboxEmail]:
+    """
+    Lock up to batch_size due emails, skipping rows other workers hold, and
+    mark them as being sent.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, "ACCOUNTS_OUTBOX_LEASE", 300))
+
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutboxEmail.Status.PENDING, OutboxEmail.Status.SENDING],
+                available_at__lte=now,
+            )
+            .order_by("available_at")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=ids).update(
+            status=OutboxEmail.Status.SENDING,
+            attempts=F("attempts") + 1,
+            available_at=now + lease,
+        )
+
+    return list(
+        OutboxEmail.objects.filter(pk__in=ids)
+        .select_related("user")
+        .order_by("available_at", "pk")
+    )
+
+
+def deliver(emails: List[OutboxEmail]) -> None:
+    """
+    Send the claimed emails and record the outcome of each one.
+    """
+    max_attempts = getattr(settings, "ACCOUNTS_OUTBOX_MAX_ATTEMPTS", 5)
+
+    # Emails sharing a domain, subject and template are rendered together.
+    groups = defaultdict(list)
+    for email in emails:
+        groups[email.domain, email.subject, email.template].append(email)
+
+    outcomes = []
+    for (domain, subject, template), group in groups.items():
+        try:
+            messages = render_verification_emails(
+                [email.user for email in group],
+                domain,
+                subject,
+                template,
+                token_generator=TOKEN_GENERATORS.get(template, default_token_generator),
+            )
+            errors = [result.error for result in get_mail_dispatcher().send(messages)]
+        except Exception as exc:
+            # A template that fails to render or a backend that raises fails
+            # the group like a refused send, so its emails are retried and
+            # eventually given up on rather than left SENDING.
+            logger.exception("Failed to send %s outbox emails.", len(group))
+            errors = [exc] * len(group)
+        outcomes += zip(group, errors)
+
+    now = timezone.now()
+    for email, error in outcomes:
+        email.updated_at = now
+        if error is None:
+            email.status = OutboxEmail.Status.SENT
+            email.sent_at = now
+            email.last_error = ""
+        elif email.attempts >= max_attempts:
+            email.status = OutboxEmail.Status.FAILED
+            email.last_error = repr(error)
+        else:
+            email.status = OutboxEmail.Status.PENDING
+            email.available_at = now + retry_delay(email.attempts)
+            email.last_error = repr(error)
+
+    OutboxEmail.objects.bulk_update(
+        [email for email, _ in outcomes],
+        ["status", "sent_at", "available_at", "last_error", "updated_at"],
+    )
+
+
+def stats() -> dict:
+    """
+    The number of emails waiting to be sent, how many of them are due, and
+    the age in seconds of the oldest due one (0 when none is due).
+    """
+    now = timezone.now()
+    due = Q(available_at__lte=now)
+    totals = OutboxEmail.objects.filter(
+        status__in=[OutboxEmail.Status.PENDING, OutboxEmail.Status.SENDING]
+    ).aggregate(
+        pending=Count("pk"),
+        due=Count("pk", filter=due),
+        oldest_due=Min("available_at", filter=due),
+    )
+    oldest_due = totals.pop("oldest_due")
+    totals["oldest_due_age_seconds"] = (
+        (now - oldest_due).total_seconds() if oldest_due else 0.0
+    )
+    return totals
+
+
+def dispatch(batch_size: int = 100, max_batches: int = 10) -> int:
+    """
+    Deliver due emails batch by batch until none are left or max_batches
+    have been sent, and return how many emails were processed.
+    """
+    processed = 0
+    for _ in range(max_batches):
+        emails = claim(batch_size)
+        if not emails:
+            break
+        deliver(emails)
+        processed += len(emails)
+    return processed
@@ -0,0 +1,250 @@
+"""
+Pagination for large tables.
+
+Keyset pagination over (created_at, id), newest first.
+
+OFFSET pagination makes the database read and throw away every row before
+the page, so page 1000 costs a thousand pages. A keyset page instead starts
+right after the last row of the previous one, found through an index on
+(created_at, id), and costs the same at any depth. The trade-off is that
+pages are addressed by opaque cursors rather than numbers::
+
+    paginator = KeysetPaginator(User.objects.all(), per_page=50)
+    page = paginator.page(request.GET.get("cursor"))
+    for user in page: ...
+    page.next_cursor  # None on the last page
+
+Cursors are signed, so clients can't forge positions, and salted with the
+model, so a cursor from one listing is rejected by another. The queryset's
+own ordering is replaced by the keyset's.
+
+ApproximateCountPaginator is a drop-in Paginator whose count comes from
+PostgreSQL's row estimates once they pass
+ACCOUNTS_APPROXIMATE_COUNT_THRESHOLD: pg_class.reltuples for a whole table,
+the planner's EXPLAIN estimate for a filtered queryset. Smaller results and
+other databases are counted exactly. Either way the count is cached for
+ACCOUNTS_COUNT_CACHE_TIMEOUT seconds.
+"""
+
+import hashlib
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+# The order pages are returned in; the matching indexes are declared on the
+# models.
+ORDERING = ("-created_at", "-pk")
+
+FORWARD = "next"
+BACKWARD = "previous"
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class KeysetPage(Sequence):
+    def __init__(
+        self,
+        object_list: list,
+        paginator: "KeysetPaginator",
+        *,
+        has_next: bool,
+        has_previous: bool,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        if not self._has_next:
+            return None
+        return self.paginator.cursor(self.object_list[-1], FORWARD)
+
+    @property
+    def previous_cursor(self) -> Optional[str]:
+        if not self._has_previous:
+            return None
+        return self.paginator.cursor(self.object_list[0], BACKWARD)
+
+
+class KeysetPaginator:
+    def __init__(self, queryset: QuerySet, per_page: int):
+        if per_page < 1:
+            raise ValueError("per_page must be a positive number.")
+        self.queryset = queryset
+        self.per_page = per_page
+        self.salt = f"{__name__}.{queryset.model._meta.label_lower}"
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return the first page, or the page a cursor from a previous page
+        points to. Raises InvalidCursor if the cursor isn't one of ours.
+        """
+        if not cursor:
+            return self._forward(self.queryset)
+
+        direction, created_at, pk = self._decode(cursor)
+        if direction == FORWARD:
+            after = Q(created_at__lte=created_at) & (
+                Q(created_at__lt=created_at) | Q(pk__lt=pk)
+            )
+            return self._forward(self.queryset.filter(after), has_previous=True)
+
+        before = Q(created_at__gte=created_at) & (
+            Q(created_at__gt=created_at) | Q(pk__gt=pk)
+        )
+        rows = list(
+            self.queryset.filter(before).order_by("created_at", "pk")[
+                : self.per_page + 1
+            ]
+        )
+        if len(rows) <= self.per_page:
+            # Back at the start, where rows may have been added since; the
+            # first page is always full.
+            return self._forward(self.queryset)
+        rows = rows[: self.per_page]
+        rows.reverse()
+        return KeysetPage(rows, self, has_next=True, has_previous=True)
+
+    def cursor(self, obj, direction: str) -> str:
+        """The cursor of the page right after or before obj."""
+        return signing.dumps(
+            [direction, obj.created_at.isoformat(), obj.pk], salt=self.salt
+        )
+
+    def _forward(self, queryset: QuerySet, has_previous: bool = False) -> KeysetPage:
+        rows = list(queryset.order_by(*ORDERING)[: self.per_page + 1])
+        return KeysetPage(
+            rows[: self.per_page],
+            self,
+            has_next=len(rows) > self.per_page,
+            # Past the end, e.g. after the last rows were deleted, there is no
+            # row to page back from.
+            has_previous=has_previous and bool(rows),
+        )
+
+    def _decode(self, cursor: str):
+        try:
+            direction, created_at, pk = signing.loads(cursor, salt=self.salt)
+            if direction not in (FORWARD, BACKWARD):
+                raise ValueError(direction)
+            return direction, datetime.fromisoformat(created_at), pk
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidCursor("Invalid cursor.")
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    A Paginator that estimates large counts instead of running COUNT(*).
+    ``approximate`` tells whether ``count`` is an estimate; pages past an
+    underestimated end are still served, and come back empty past the real
+    one.
+    """
+
+    _approximate = False
+
+    @property
+    def approximate(self) -> bool:
+        self.count
+        return self._approximate
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        key = (
+            "accounts:count:"
+            + hashlib.md5(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+        )
+        cached = cache.get(key)
+        if cached is None:
+            cached = self._count(queryset)
+            cache.set(
+                key, cached, getattr(settings, "ACCOUNTS_COUNT_CACHE_TIMEOUT", 30)
+            )
+        count, self._approximate = cached
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.approximate and int(number) > 1:
+                return int(number)
+            raise
+
+    def page(self, number):
+        if not self.approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom : bottom + self.per_page], number, self
+        )
+
+    def _count(self, queryset: QuerySet):
+        threshold = getattr(settings, "ACCOUNTS_APPROXIMATE_COUNT_THRESHOLD", 100_000)
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = estimate_count(queryset)
+            if estimate >= threshold:
+                return estimate, True
+        return queryset.count(), False
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """PostgreSQL's estimate of how many rows a queryset returns."""
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 until the table is first analysed.
+            if row and row[0] >= 0:
+                return int(row[0])
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,240 @@
+"""
+Full-text search over instructors.
+
+Every instructor has an InstructorSearchDocument holding their searchable
+text in three weights:
+
+* A, ``headline``: the instructor's job title and skill names;
+* B, ``roles``: the job titles of their experiences and education majors;
+* C, ``organizations``: companies and institutions.
+
+On PostgreSQL the table gets a generated ``document`` tsvector column,
+weighted with setweight() and indexed with GIN. On SQLite an external
+content FTS5 table mirrors it, kept in sync by triggers. ``install()``
+creates either one; migration 0008 holds a copy of the same SQL.
+
+Saving or deleting an instructor, skill, education or experience rewrites
+that instructor's document (see apps.accounts.signals), and ``rebuild()``
+rewrites documents in bulk. ``rank()`` runs a query against the index and
+returns instructor ids, best match first.
+"""
+
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from django.db import NotSupportedError, connection
+from django.utils import timezone
+
+from .models import (
+    Education,
+    Experience,
+    Instructor,
+    InstructorSearchDocument,
+    Skill,
+)
+
+TABLE = InstructorSearchDocument._meta.db_table
+FTS_TABLE = f"{TABLE}_fts"
+SEARCH_CONFIG = "english"
+# bm25() weights of the FTS5 columns, in the ratio of PostgreSQL's default
+# ts_rank() weights for A, B and C.
+FTS_WEIGHTS = (1.0, 0.4, 0.2)
+
+DOCUMENT_FIELDS = ["headline", "roles", "organizations", "updated_at"]
+
+# The fields each child model contributes to the document through, read
+# before an update so unrelated changes don't rewrite it.
+TRACKED_FIELDS = {
+    Skill: ["instructor_id", "name"],
+    Education: ["instructor_id", "major", "institution"],
+    Experience: ["instructor_id", "job_title", "company"],
+}
+
+POSTGRESQL_INSTALL = [
+    f"""
+    ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS document tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', headline), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', roles), 'B')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', organizations), 'C')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS search_document_idx ON {TABLE} USING gin (document)",
+]
+POSTGRESQL_UNINSTALL = [
+    "DROP INDEX IF EXISTS search_document_idx",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS document",
+]
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        headline, roles, organizations,
+        content='{TABLE}', content_rowid='instructor_id',
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, headline, roles, organizations)
+        VALUES (new.instructor_id, new.headline, new.roles, new.organizations);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, headline, roles, organizations)
+        VALUES ('delete', old.instructor_id, old.headline, old.roles, old.organizations);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, headline, roles, organizations)
+        VALUES ('delete', old.instructor_id, old.headline, old.roles, old.organizations);
+        INSERT INTO {FTS_TABLE} (rowid, headline, roles, organizations)
+        VALUES (new.instructor_id, new.headline, new.roles, new.organizations);
+    END
+    """,
+    # Index the documents already in the table.
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def install(connection=connection) -> None:
+    """Create the full-text index in the connection's database."""
+    _execute(connection, {"postgresql": POSTGRESQL_INSTALL, "sqlite": SQLITE_INSTALL})
+
+
+def uninstall(connection=connection) -> None:
+    _execute(
+        connection, {"postgresql": POSTGRESQL_UNINSTALL, "sqlite": SQLITE_UNINSTALL}
+    )
+
+
+def _execute(connection, statements: dict) -> None:
+    # Other databases get no index; rank() refuses to run on them.
+    with connection.cursor() as cursor:
+        for sql in statements.get(connection.vendor, []):
+            cursor.execute(sql)
+
+
+def rank(
+    query: str, *, active: Optional[bool] = None, limit: int = 20
+) -> List[Tuple[int, float]]:
+    """
+    Return (instructor id, score) pairs of the instructors matching every
+    word of the query, best match first, optionally only active or inactive
+    ones. The last word also matches as a prefix, so partly typed queries
+    find results.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms or limit < 1:
+        return []
+
+    instructors = Instructor._meta.db_table
+    if connection.vendor == "postgresql":
+        sql = (
+            f"SELECT d.instructor_id, ts_rank(d.document, q) AS score "
+            f"FROM {TABLE} d CROSS JOIN to_tsquery(%s, %s) q "
+        )
+        params = [SEARCH_CONFIG, " & ".join([*terms[:-1], f"{terms[-1]}:*"])]
+        if active is not None:
+            sql += f"JOIN {instructors} i ON i.id = d.instructor_id AND i.status = %s "
+            params.append(active)
+        sql += "WHERE d.document @@ q ORDER BY score DESC, d.instructor_id LIMIT %s"
+    elif connection.vendor == "sqlite":
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        # Prefix queries aren't stemmed, so the last word is also matched
+        # whole: "teaching" is indexed as "teach".
+        last = f'("{terms[-1]}" OR "{terms[-1]}"*)'
+        sql = (
+            f"SELECT {FTS_TABLE}.rowid, -bm25({FTS_TABLE}, {weights}) AS score "
+            f"FROM {FTS_TABLE} "
+        )
+        params = [" AND ".join([*(f'"{term}"' for term in terms[:-1]), last])]
+        if active is not None:
+            sql += (
+                f"JOIN {instructors} i ON i.id = {FTS_TABLE}.rowid AND i.status = %s "
+            )
+            params.insert(0, active)
+        sql += (
+            f"WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY score DESC, {FTS_TABLE}.rowid LIMIT %s"
+        )
+    else:
+        raise NotSupportedError(
+            f"Instructor search is not available on {connection.vendor}."
+        )
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(instructor_id, score) for instructor_id, score in cursor.fetchall()]
+
+
+def rebuild(
+    instructor_ids: Optional[Iterable[int]] = None, *, batch_size: int = 500
+) -> int:
+    """
+    Rewrite the search documents of the given instructors, or of all of
+    them, and return how many were written.
+    """
+    if instructor_ids is None:
+        instructor_ids = Instructor.objects.order_by("pk").values_list("pk", flat=True)
+    instructor_ids = list(instructor_ids)
+
+    written = 0
+    for offset in range(0, len(instructor_ids), batch_size):
+        documents = _compute(instructor_ids[offset : offset + batch_size])
+        InstructorSearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["instructor"],
+            update_fields=DOCUMENT_FIELDS,
+        )
+        written += len(documents)
+    return written
+
+
+def _compute(instructor_ids: List[int]) -> List[InstructorSearchDocument]:
+    texts = {
+        pk: ([job_title], [], [])
+        for pk, job_title in Instructor.objects.filter(
+            pk__in=instructor_ids
+        ).values_list("pk", "job_title")
+    }
+
+    for instructor_id, name in Skill.objects.filter(
+        instructor_id__in=texts
+    ).values_list("instructor_id", "name"):
+        texts[instructor_id][0].append(name)
+
+    for instructor_id, major, institution in Education.objects.filter(
+        instructor_id__in=texts
+    ).values_list("instructor_id", "major", "institution"):
+        texts[instructor_id][1].append(major)
+        texts[instructor_id][2].append(institution)
+
+    for instructor_id, job_title, company in Experience.objects.filter(
+        instructor_id__in=texts
+    ).values_list("instructor_id", "job_title", "company"):
+        texts[instructor_id][1].append(job_title)
+        texts[instructor_id][2].append(company)
+
+    now = timezone.now()
+    return [
+        InstructorSearchDocument(
+            instructor_id=pk,
+            headline="\n".join(headline),
+            roles="\n".join(roles),
+            organizations="\n".join(organizations),
+            created_at=now,
+            updated_at=now,
+        )
+        for pk, (headline, roles, organizations) in texts.items()
+    ]
@@ -0,0 +1,127 @@
+"""
+Read-side queries for instructors.
+
+Every selector returns instructors with their user, profile and summary
+joined in and their skills, educations and experiences prefetched, so
+rendering any number of them costs the same four queries. Access the related
+data through the usual managers (``instructor.skills.all()``); filtering or
+ordering them again bypasses the prefetch and queries the database.
+
+``search_instructors`` ranks instructors with the full-text index of
+apps.accounts.search and then loads them the same way.
+"""
+
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from django.db.models import F, Prefetch, QuerySet
+
+from . import search
+from .models import Education, Experience, Instructor, InstructorSummary, Skill
+
+
+def instructor_queryset() -> QuerySet:
+    return Instructor.objects.select_related(
+        "user__profile", "summary"
+    ).prefetch_related(
+        Prefetch("skills", queryset=Skill.objects.order_by("name", "pk")),
+        Prefetch("educations", queryset=Education.objects.order_by("-start", "pk")),
+        # Current jobs first, then the most recent ones.
+        Prefetch(
+            "experiences",
+            queryset=Experience.objects.order_by(
+                F("end").desc(nulls_first=True), "-start", "pk"
+            ),
+        ),
+    )
+
+
+def list_instructors(
+    *,
+    active: Optional[bool] = None,
+    min_skill_level: Optional[str] = None,
+    min_degree: Optional[str] = None,
+    min_experience_years: Optional[float] = None,
+    experience_level: Optional[str] = None,
+) -> QuerySet:
+    """
+    Instructors newest first, optionally only active or inactive ones, or
+    those whose summary reaches the given skill level, degree or years of
+    experience (at experience_level, if given).
+    """
+    queryset = instructor_queryset().order_by("-created_at")
+    if active is not None:
+        queryset = queryset.filter(status=active)
+    if min_skill_level is not None:
+        queryset = queryset.filter(
+            summary__max_skill_rank__gte=InstructorSummary.SKILL_LEVEL_RANKS[
+                min_skill_level
+            ]
+        )
+    if min_degree is not None:
+        queryset = queryset.filter(
+            summary__highest_degree_rank__gte=InstructorSummary.DEGREE_RANKS[min_degree]
+        )
+    if min_experience_years is not None:
+        field = (
+            InstructorSummary.LEVEL_DAYS_FIELDS[experience_level]
+            if experience_level
+            else "experience_days"
+        )
+        queryset = queryset.filter(
+            **{f"summary__{field}__gte": min_experience_years * 365.25}
+        )
+    return queryset
+
+
+def get_instructor(pk: Optional[int] = None, *, uuid: Optional[UUID] = None):
+    """
+    Fetch one instructor by primary key or by its user's uuid. Raises
+    Instructor.DoesNotExist if there is none.
+    """
+    if (pk is None) == (uuid is None):
+        raise TypeError("Pass exactly one of pk and uuid.")
+    if pk is not None:
+        return instructor_queryset().get(pk=pk)
+    return instructor_queryset().get(user__uuid=uuid)
+
+
+def get_instructors(
+    pks: Optional[Iterable[int]] = None, *, uuids: Optional[Iterable[UUID]] = None
+) -> List[Instructor]:
+    """
+    Fetch instructors by primary keys or by their users' uuids, in the order
+    given. Keys without an instructor are skipped.
+    """
+    if (pks is None) == (uuids is None):
+        raise TypeError("Pass exactly one of pks and uuids.")
+
+    if pks is not None:
+        keys = list(pks)
+        found = {
+            instructor.pk: instructor
+            for instructor in instructor_queryset().filter(pk__in=keys)
+        }
+    else:
+        keys = [UUID(str(uuid)) for uuid in uuids]
+        found = {
+            instructor.user.uuid: instructor
+            for instructor in instructor_queryset().filter(user__uuid__in=keys)
+        }
+    return [found[key] for key in keys if key in found]
+
+
+def search_instructors(
+    query: str, *, active: Optional[bool] = None, limit: int = 20
+) -> List[Instructor]:
+    """
+    Instructors matching a full-text query over their job titles, skills,
+    educations and experiences, best match first. Each carries its score as
+    ``search_rank``.
+    """
+    ranked = search.rank(query, active=active, limit=limit)
+    scores = dict(ranked)
+    instructors = get_instructors(pk for pk, _ in ranked)
+    for instructor in instructors:
+        instructor.search_rank = scores[instructor.pk]
+    return instructors
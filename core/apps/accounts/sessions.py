@@ -0,0 +1,163 @@
+"""
+Cache-backed session engine, enabled with
+``SESSION_ENGINE = "apps.accounts.sessions"``.
+
+Sessions live in ``SESSION_CACHE_ALIAS``. With
+``ACCOUNTS_SESSION_WRITE_THROUGH``, the default, every write is also stored
+in the ``django_session`` table and cache misses fall back to it, so
+sessions survive a cache flush, a restart, and a process-local cache that
+other workers can't see. Only turn it off with a shared cache such as Redis.
+
+Writes are skipped when the session data is unchanged since it was loaded.
+Refreshing the expiry of an unchanged session is batched: it is written at
+most once per ``ACCOUNTS_SESSION_REFRESH_INTERVAL`` seconds, which bounds how
+far a sliding expiry can lag behind.
+"""
+
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError, UpdateError
+from django.contrib.sessions.backends.cache import SessionStore as CacheStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+KEY_PREFIX = "apps.accounts.sessions"
+
+
+class SessionStore(CacheStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        # Serialized data and write time of the session as it was loaded.
+        self._loaded = None
+        super().__init__(session_key)
+
+    @property
+    def write_through(self) -> bool:
+        return getattr(settings, "ACCOUNTS_SESSION_WRITE_THROUGH", True)
+
+    @property
+    def refresh_interval(self) -> int:
+        return getattr(settings, "ACCOUNTS_SESSION_REFRESH_INTERVAL", 300)
+
+    def _snapshot(self, data) -> bytes:
+        return self.serializer().dumps(data)
+
+    def is_unchanged(self) -> bool:
+        """
+        Return True if saving would write back the loaded data and its expiry
+        was refreshed recently enough.
+        """
+        if self._loaded is None:
+            return False
+
+        snapshot, written_at = self._loaded
+        return (
+            time.time() - written_at < self.refresh_interval
+            and snapshot == self._snapshot(self._get_session(no_load=True))
+        )
+
+    def load(self):
+        try:
+            entry = self._cache.get(self.cache_key)
+        except Exception:
+            # Some backends (e.g. memcache) raise an exception on invalid
+            # cache keys. If this happens, reset the session. See #17810.
+            entry = None
+
+        if entry is None and self.write_through:
+            entry = self._load_from_db()
+
+        if entry is None:
+            self._session_key = None
+            self._loaded = None
+            return {}
+
+        data, written_at = entry
+        self._loaded = (self._snapshot(data), written_at)
+        return data
+
+    def _load_from_db(self):
+        session = DBStore(self.session_key)._get_session_from_db()
+        if session is None:
+            return None
+
+        data = self.decode(session.session_data)
+        entry = (data, time.time())
+        self._cache.set(
+            self.cache_key, entry, self.get_expiry_age(expiry=session.expire_date)
+        )
+        return entry
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if not must_create and self.is_unchanged():
+            return
+
+        if must_create:
+            func = self._cache.add
+        elif self.exists(self.session_key):
+            func = self._cache.set
+        else:
+            raise UpdateError
+
+        data = self._get_session(no_load=must_create)
+        written_at = time.time()
+        result = func(self.cache_key, (data, written_at), self.get_expiry_age())
+        if must_create and not result:
+            raise CreateError
+
+        self._loaded = (self._snapshot(data), written_at)
+        if self.write_through:
+            self._save_to_db(data, must_create)
+
+    def _save_to_db(self, data, must_create):
+        store = DBStore(self.session_key)
+        store._session_cache = data
+        try:
+            store.save(must_create=must_create)
+        except UpdateError:
+            store.save(must_create=True)
+
+    def exists(self, session_key):
+        return super().exists(session_key) or (
+            self.write_through and DBStore().exists(session_key)
+        )
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+
+        super().delete(session_key)
+        if self.write_through:
+            DBStore().delete(session_key)
+        if session_key == self.session_key:
+            self._loaded = None
+
+    # The cache backend's async API wraps the sync calls in threads as well;
+    # reuse the logic above rather than duplicating it.
+
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    async def asave(self, must_create=False):
+        return await sync_to_async(self.save)(must_create)
+
+    async def aexists(self, session_key):
+        return await sync_to_async(self.exists)(session_key)
+
+    async def adelete(self, session_key=None):
+        return await sync_to_async(self.delete)(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        if getattr(settings, "ACCOUNTS_SESSION_WRITE_THROUGH", True):
+            DBStore.clear_expired()
+
+    @classmethod
+    async def aclear_expired(cls):
+        await sync_to_async(cls.clear_expired)()
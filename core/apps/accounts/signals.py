@@ -1,13 +1,155 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
 
-from .models import Profile
+from . import search, summaries
+from .cache import user_cache
+from .models import (
+    Education,
+    Experience,
+    Instructor,
+    InstructorSummary,
+    Profile,
+    Skill,
+)
 
 User = get_user_model()
 
 
 @receiver(post_save, sender=User)
 def post_save_create_profile(sender, instance, created, **kwargs):
-    if created:
+    # UserManager.create_user() creates the profile in the same transaction.
+    if created and getattr(instance, "_create_profile", True):
         Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_user_profile(sender, instance, **kwargs):
+    user_cache.invalidate(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_cached_user_permissions(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            user_cache.invalidate(instance.pk)
+        return
+
+    # The instance is a group or permission; the affected users are either
+    # given in pk_set or, for a clear, must be read before the rows go away.
+    if action in ("post_add", "post_remove"):
+        user_cache.invalidate(*pk_set)
+    elif action == "pre_clear":
+        related_field = next(
+            field.name
+            for field in sender._meta.fields
+            if field.related_model is type(instance)
+        )
+        user_ids = sender.objects.filter(**{related_field: instance}).values_list(
+            "user_id", flat=True
+        )
+        user_cache.invalidate(*user_ids)
+
+
+@receiver(post_save, sender=Instructor)
+def post_save_create_summary(sender, instance, created, **kwargs):
+    if created:
+        InstructorSummary.objects.create(instructor=instance)
+
+
+@receiver(post_save, sender=Instructor)
+def update_search_document_on_instructor_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    if created or update_fields is None or "job_title" in update_fields:
+        search.rebuild([instance.pk])
+
+
+@receiver(pre_save, sender=Skill)
+@receiver(pre_save, sender=Education)
+@receiver(pre_save, sender=Experience)
+def remember_previous_values(sender, instance, **kwargs):
+    # Read what the summary and the search document depend on in one query.
+    fields = {*summaries.TRACKED_FIELDS[sender], *search.TRACKED_FIELDS[sender]}
+    instance._previous = (
+        sender.objects.filter(pk=instance.pk).values(*fields).first()
+        if instance.pk
+        else None
+    )
+
+
+def _changed(instance, fields) -> bool:
+    previous = getattr(instance, "_previous", None)
+    return previous is None or any(
+        getattr(instance, field) != previous[field] for field in fields
+    )
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=Education)
+@receiver(post_save, sender=Experience)
+def update_summary_on_save(sender, instance, created, **kwargs):
+    fields = summaries.TRACKED_FIELDS[sender]
+    if not _changed(instance, fields):
+        return
+    previous = getattr(instance, "_previous", None)
+    if previous is not None:
+        if sender is Experience:
+            # Experience is recomputed per instructor rather than by deltas.
+            for instructor_id in {previous["instructor_id"], instance.instructor_id}:
+                summaries.refresh_experience(instructor_id)
+            return
+        summaries.remove(sender(**{field: previous[field] for field in fields}))
+    summaries.add(instance)
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=Education)
+@receiver(post_save, sender=Experience)
+def update_search_document_on_save(sender, instance, created, **kwargs):
+    if not _changed(instance, search.TRACKED_FIELDS[sender]):
+        return
+    previous = getattr(instance, "_previous", None)
+    instructor_ids = {instance.instructor_id}
+    if previous is not None:
+        instructor_ids.add(previous["instructor_id"])
+    search.rebuild(instructor_ids)
+
+
+def _deleted_with_instructor(sender, origin) -> bool:
+    # When the instructor itself is being deleted, its summary and search
+    # document go with it.
+    deleted = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin is not None and deleted is not sender
+
+
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=Education)
+@receiver(post_delete, sender=Experience)
+def update_summary_on_delete(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_instructor(sender, origin):
+        summaries.remove(instance)
+
+
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=Education)
+@receiver(post_delete, sender=Experience)
+def update_search_document_on_delete(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_instructor(sender, origin):
+        search.rebuild([instance.instructor_id])
@@ -0,0 +1,205 @@
+"""
+Maintenance of InstructorSummary rows.
+
+Saving or deleting a skill or education applies its contribution to the
+instructor's summary as a single UPDATE with F() expressions, so concurrent
+changes don't overwrite each other. Counts are added and subtracted; the
+highest skill level and degree only grow on their own, so removing a
+contribution recomputes them from that instructor's rows.
+
+Experience is the union of the instructor's job intervals (see
+apps.accounts.intervals), which can't be updated by deltas; a changed
+experience recomputes the instructor's experience columns instead.
+
+``rebuild()`` recomputes summaries from scratch. It runs nightly as a safety
+net, which also moves ongoing jobs forward, and repairs a summary that is
+found missing.
+"""
+
+from datetime import date
+from typing import Iterable, List, Optional
+
+from django.db.models import (
+    Case,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from . import intervals
+from .models import Education, Experience, Instructor, InstructorSummary, Skill
+
+EXPERIENCE_FIELDS = ["experience_days", *InstructorSummary.LEVEL_DAYS_FIELDS.values()]
+SUMMARY_FIELDS = [
+    "skill_count",
+    "max_skill_rank",
+    "highest_degree_rank",
+    *EXPERIENCE_FIELDS,
+    "updated_at",
+]
+
+# The fields each child model contributes through, read before an update so
+# the old contribution can be taken back.
+TRACKED_FIELDS = {
+    Skill: ["instructor_id", "level"],
+    Education: ["instructor_id", "degree"],
+    Experience: ["instructor_id", "level", "start", "end"],
+}
+
+
+def contribution(instance) -> dict:
+    """The amounts a skill or education adds to its instructor's summary."""
+    if isinstance(instance, Skill):
+        return {
+            "skill_count": 1,
+            "max_skill_rank": InstructorSummary.SKILL_LEVEL_RANKS.get(
+                instance.level, 0
+            ),
+        }
+    return {
+        "highest_degree_rank": InstructorSummary.DEGREE_RANKS.get(instance.degree, 0)
+    }
+
+
+def add(instance) -> None:
+    if isinstance(instance, Experience):
+        refresh_experience(instance.instructor_id)
+        return
+
+    changes = contribution(instance)
+    updates = {}
+    if "skill_count" in changes:
+        updates["skill_count"] = F("skill_count") + 1
+    for field in ("max_skill_rank", "highest_degree_rank"):
+        if field in changes:
+            updates[field] = Greatest(F(field), Value(changes[field]))
+    _update(instance.instructor_id, updates)
+
+
+def remove(instance) -> None:
+    if isinstance(instance, Experience):
+        refresh_experience(instance.instructor_id)
+        return
+
+    changes = contribution(instance)
+    updates = {}
+    if "skill_count" in changes:
+        updates["skill_count"] = Greatest(F("skill_count") - 1, Value(0))
+        updates["max_skill_rank"] = _max_rank(
+            Skill, "level", InstructorSummary.SKILL_LEVEL_RANKS
+        )
+    if "highest_degree_rank" in changes:
+        updates["highest_degree_rank"] = _max_rank(
+            Education, "degree", InstructorSummary.DEGREE_RANKS
+        )
+    _update(instance.instructor_id, updates)
+
+
+def refresh_experience(instructor_id: int) -> None:
+    rows = (
+        Experience.objects.filter(instructor_id=instructor_id)
+        .order_by("start")
+        .values_list("instructor_id", "level", "start", "end")
+    )
+    totals = next(intervals.experience_totals(rows, timezone.localdate()), None)
+    days, levels = totals[1:] if totals else (0, {})
+    _update(instructor_id, _experience_fields(days, levels))
+
+
+def _experience_fields(days: int, levels: dict) -> dict:
+    fields = {"experience_days": days}
+    for level, field in InstructorSummary.LEVEL_DAYS_FIELDS.items():
+        fields[field] = levels.get(level, 0)
+    return fields
+
+
+def _max_rank(model, field: str, ranks: dict) -> Coalesce:
+    rank = Case(
+        *(When(**{field: value}, then=Value(r)) for value, r in ranks.items()),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    highest = (
+        model.objects.filter(instructor_id=OuterRef("instructor_id"))
+        .annotate(rank=rank)
+        .order_by("-rank")
+        .values("rank")[:1]
+    )
+    return Coalesce(Subquery(highest), Value(0))
+
+
+def _update(instructor_id: int, updates: dict) -> None:
+    updated = InstructorSummary.objects.filter(instructor_id=instructor_id).update(
+        updated_at=timezone.now(), **updates
+    )
+    if not updated and Instructor.objects.filter(pk=instructor_id).exists():
+        rebuild([instructor_id])
+
+
+def rebuild(
+    instructor_ids: Optional[Iterable[int]] = None, *, batch_size: int = 500
+) -> int:
+    """
+    Recompute the summaries of the given instructors, or of all of them, and
+    return how many were written.
+    """
+    if instructor_ids is None:
+        instructor_ids = Instructor.objects.order_by("pk").values_list("pk", flat=True)
+    instructor_ids = list(instructor_ids)
+
+    today = timezone.localdate()
+    written = 0
+    for offset in range(0, len(instructor_ids), batch_size):
+        batch = instructor_ids[offset : offset + batch_size]
+        summaries = _compute(batch, today)
+        InstructorSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["instructor"],
+            update_fields=SUMMARY_FIELDS,
+        )
+        written += len(summaries)
+    return written
+
+
+def _compute(instructor_ids: List[int], today: date) -> List[InstructorSummary]:
+    now = timezone.now()
+    summaries = {
+        pk: InstructorSummary(instructor_id=pk, created_at=now, updated_at=now)
+        for pk in Instructor.objects.filter(pk__in=instructor_ids).values_list(
+            "pk", flat=True
+        )
+    }
+
+    for instructor_id, level in Skill.objects.filter(
+        instructor_id__in=summaries
+    ).values_list("instructor_id", "level"):
+        summary = summaries[instructor_id]
+        summary.skill_count += 1
+        summary.max_skill_rank = max(
+            summary.max_skill_rank, InstructorSummary.SKILL_LEVEL_RANKS.get(level, 0)
+        )
+
+    for instructor_id, degree in Education.objects.filter(
+        instructor_id__in=summaries
+    ).values_list("instructor_id", "degree"):
+        summary = summaries[instructor_id]
+        summary.highest_degree_rank = max(
+            summary.highest_degree_rank, InstructorSummary.DEGREE_RANKS.get(degree, 0)
+        )
+
+    experiences = (
+        Experience.objects.filter(instructor_id__in=summaries)
+        .order_by("instructor_id", "start")
+        .values_list("instructor_id", "level", "start", "end")
+    )
+    for instructor_id, days, levels in intervals.experience_totals(experiences, today):
+        for field, value in _experience_fields(days, levels).items():
+            setattr(summaries[instructor_id], field, value)
+
+    return list(summaries.values())
@@ -0,0 +1,3 @@
+# Celery's autodiscovery only imports this package, so pull in the modules
+# that define tasks.
+from . import outbox, summaries  # noqa: F401
@@ -0,0 +1,24 @@
+from celery import shared_task
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+
+from .. import outbox
+from ..mail import get_mail_dispatcher
+
+
+@shared_task(ignore_result=True, soft_time_limit=240, time_limit=270)
+def dispatch_outbox():
+    """
+    Send due outbox emails. Scheduled by celery beat; concurrent runs are
+    safe since every batch is claimed with SKIP LOCKED. The time limits stay
+    below ACCOUNTS_OUTBOX_LEASE so a run ends before its claims expire.
+    """
+    return outbox.dispatch(
+        batch_size=getattr(settings, "ACCOUNTS_OUTBOX_BATCH_SIZE", 100),
+        max_batches=getattr(settings, "ACCOUNTS_OUTBOX_MAX_BATCHES", 10),
+    )
+
+
+@worker_process_shutdown.connect
+def close_mail_dispatcher(**kwargs):
+    get_mail_dispatcher().close()
@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .. import summaries
+
+
+@shared_task(ignore_result=True, soft_time_limit=1800, time_limit=1860)
+def rebuild_instructor_summaries():
+    """
+    Recompute every instructor summary. Scheduled nightly by celery beat to
+    correct any drift and move ongoing jobs forward.
+    """
+    return summaries.rebuild()
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+CHANGELISTS = [
+    "user",
+    "profile",
+    "instructor",
+    "applyinstructor",
+    "skill",
+    "education",
+    "experience",
+]
+
+# The model an autocomplete lists, and a field that autocompletes it.
+AUTOCOMPLETES = [("user", "profile", "user"), ("instructor", "skill", "instructor")]
+
+
+@pytest.fixture
+def admin(client, super_user, settings):
+    # The changelist count would otherwise be served from the cache on the
+    # second request.
+    settings.ACCOUNTS_COUNT_CACHE_TIMEOUT = 0
+    client.force_login(super_user)
+    return client
+
+
+def count_queries(client, url, params=None):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return len(queries)
+
+
+def factory_of(request, model_name):
+    name = "apply_instructor" if model_name == "applyinstructor" else model_name
+    return request.getfixturevalue(f"{name}_factory")
+
+
+@pytest.mark.django_db
+class TestQueryCounts:
+    @pytest.mark.parametrize("model_name", CHANGELISTS)
+    def test_changelist(self, admin, request, model_name):
+        factory = factory_of(request, model_name)
+        url = reverse(f"admin:accounts_{model_name}_changelist")
+        factory.create_batch(2)
+        admin.get(url)
+
+        few = count_queries(admin, url)
+        factory.create_batch(8)
+        many = count_queries(admin, url)
+
+        assert few == many
+
+    @pytest.mark.parametrize("model_name", CHANGELISTS)
+    def test_changelist_skips_unfiltered_count(self, admin, model_name):
+        response = admin.get(reverse(f"admin:accounts_{model_name}_changelist"))
+
+        assert response.context["cl"].full_result_count is None
+
+    @pytest.mark.parametrize("model_name,source,field_name", AUTOCOMPLETES)
+    def test_autocomplete(self, admin, request, model_name, source, field_name):
+        factory = factory_of(request, model_name)
+        url = reverse("admin:autocomplete")
+        params = {
+            "app_label": "accounts",
+            "model_name": source,
+            "field_name": field_name,
+        }
+        factory.create_batch(2)
+        admin.get(url, params)
+
+        few = count_queries(admin, url, params)
+        factory.create_batch(8)
+        many = count_queries(admin, url, params)
+
+        assert few == many
+
+    def test_changelist_reads_only_listed_columns(self, admin, skill_factory):
+        skill_factory.create_batch(2)
+
+        response = admin.get(reverse("admin:accounts_skill_changelist"))
+
+        skill = response.context["cl"].result_list[0]
+        assert "updated_at" in skill.get_deferred_fields()
+        assert "resume" in skill.instructor.get_deferred_fields()
+
+    def test_autocomplete_text(self, admin, instructor_factory):
+        instructor = instructor_factory()
+
+        response = admin.get(
+            reverse("admin:autocomplete"),
+            {
+                "app_label": "accounts",
+                "model_name": "skill",
+                "field_name": "instructor",
+            },
+        )
+
+        assert response.json()["results"] == [
+            {"id": str(instructor.pk), "text": str(instructor)}
+        ]
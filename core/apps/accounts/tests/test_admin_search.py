@@ -0,0 +1,95 @@
+import pytest
+from apps.accounts import admin_search
+from apps.accounts.admin import ProfileAdmin, SkillAdmin
+from apps.accounts.models import Profile, Skill, User
+from django.urls import reverse
+
+
+@pytest.fixture
+def reza(profile_factory):
+    return profile_factory(
+        user__email="reza.ahmadi@eduport.ir",
+        user__username="rezaahmadi",
+        first_name="Reza",
+        last_name="Ahmadi",
+    )
+
+
+@pytest.fixture
+def sara(profile_factory):
+    return profile_factory(
+        user__email="sara.karimi@example.org",
+        user__username="sarakarimi",
+        first_name="Sara",
+        last_name="Karimi",
+    )
+
+
+def search(model, search_fields, term):
+    return list(admin_search.search(model.objects.all(), search_fields, term))
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def test_matches_own_and_related_fields(self, reza, sara):
+        fields = ProfileAdmin.search_fields
+
+        assert search(Profile, fields, "ahm") == [reza]
+        assert search(Profile, fields, "sara.k") == [sara]
+
+    def test_matches_every_word(self, reza, sara):
+        fields = ProfileAdmin.search_fields
+
+        assert search(Profile, fields, "reza ahmadi") == [reza]
+        assert search(Profile, fields, "reza karimi") == []
+
+    def test_short_words_match_prefixes(self, reza, sara):
+        assert search(User, ["email", "username"], "re") == [reza.user]
+        assert search(User, ["email", "username"], "za") == []
+
+    def test_quoted_phrase(self, reza):
+        assert search(User, ["email"], '"reza.ahmadi@"') == [reza.user]
+
+    def test_through_two_relations(self, skill_factory, reza):
+        skill = skill_factory(instructor__user=reza.user)
+        skill_factory()
+
+        assert search(Skill, SkillAdmin.search_fields, "reza") == [skill]
+
+    def test_long_words_match_substrings_with_trigrams(self, reza, sara):
+        found = search(User, ["email"], "eduport")
+
+        assert found == ([reza.user] if admin_search.has_trigrams() else [])
+
+
+@pytest.mark.django_db
+class TestAdminSearch:
+    @pytest.fixture
+    def admin(self, client, super_user):
+        client.force_login(super_user)
+        return client
+
+    def test_changelist(self, admin, reza, sara):
+        response = admin.get(
+            reverse("admin:accounts_profile_changelist"), {"q": "reza"}
+        )
+
+        assert list(response.context["cl"].result_list) == [reza]
+
+    def test_instructor_autocomplete(self, admin, instructor_factory, reza):
+        instructor = instructor_factory(user=reza.user)
+        instructor_factory()
+
+        response = admin.get(
+            reverse("admin:autocomplete"),
+            {
+                "app_label": "accounts",
+                "model_name": "skill",
+                "field_name": "instructor",
+                "term": "rezaa",
+            },
+        )
+
+        assert [result["id"] for result in response.json()["results"]] == [
+            str(instructor.pk)
+        ]
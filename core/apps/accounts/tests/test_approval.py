@@ -0,0 +1,201 @@
+import re
+
+import pytest
+from apps.accounts import approval, outbox
+from apps.accounts.models import (
+    ApplyInstructor,
+    Instructor,
+    InstructorSearchDocument,
+    InstructorSummary,
+    OutboxEmail,
+)
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+User = get_user_model()
+
+PASSWORD = "Secret@1234"
+
+
+@pytest.fixture(autouse=True)
+def inline_hashing(settings):
+    settings.ACCOUNTS_HASHING_EXECUTOR = "apps.accounts.hashing.InlineHashingExecutor"
+
+
+@pytest.mark.django_db
+class TestApprove:
+    def test_provisions_users_profiles_and_instructors(self, apply_instructor_factory):
+        application = apply_instructor_factory(pending=True)
+
+        result = approval.approve(ApplyInstructor.objects.all(), "testserver")
+
+        assert result.approved == [application]
+        application.refresh_from_db()
+        assert application.status == ApplyInstructor.STATUS.APPROVED
+
+        instructor = Instructor.objects.select_related("user__profile").get()
+        user = instructor.user
+        assert user.email == application.email
+        assert not user.is_active
+        assert not user.has_usable_password()
+        assert user.profile.first_name == application.first_name
+        assert user.profile.phone == application.phone
+        assert instructor.resume.name == application.resume.name
+        assert InstructorSummary.objects.filter(instructor=instructor).exists()
+        assert InstructorSearchDocument.objects.filter(instructor=instructor).exists()
+
+    def test_queues_approval_emails(self, apply_instructor_factory):
+        apply_instructor_factory.create_batch(3, pending=True)
+
+        approval.approve(ApplyInstructor.objects.all(), "testserver")
+        outbox.dispatch()
+
+        assert len(mail.outbox) == 3
+        assert {message.subject for message in mail.outbox} == {outbox.APPROVAL_SUBJECT}
+        assert "http://testserver/accounts/password/set/" in mail.outbox[0].body
+
+    def test_approved_instructor_sets_password_and_signs_in(
+        self, client, apply_instructor_factory
+    ):
+        application = apply_instructor_factory(pending=True)
+        approval.approve(ApplyInstructor.objects.all(), "testserver")
+        outbox.dispatch()
+        link = re.search(r"http://testserver(\S+)", mail.outbox[0].body).group(1)
+
+        # The link redirects to a URL without the token, like a password reset.
+        response = client.get(link, follow=True)
+        client.post(
+            response.redirect_chain[-1][0],
+            {"new_password1": PASSWORD, "new_password2": PASSWORD},
+        )
+
+        user = User.objects.get(email=application.email)
+        assert user.is_active
+        assert client.login(email=application.email, password=PASSWORD)
+        assert client.get(link, follow=True).context["validlink"] is False
+
+    def test_only_pending_applications(self, apply_instructor_factory):
+        apply_instructor_factory(rejected=True)
+        apply_instructor_factory(approved=True)
+
+        result = approval.approve(ApplyInstructor.objects.all(), "testserver")
+
+        assert result == ([], [])
+        assert not Instructor.objects.exists()
+
+    def test_existing_email_is_left_pending(
+        self, apply_instructor_factory, user_factory
+    ):
+        application = apply_instructor_factory(pending=True)
+        user_factory(email=User.objects.normalize_email(application.email).upper())
+
+        result = approval.approve(ApplyInstructor.objects.all(), "testserver")
+
+        assert result.conflicts == [application]
+        application.refresh_from_db()
+        assert application.status == ApplyInstructor.STATUS.PENDING
+        assert not OutboxEmail.objects.exists()
+
+    def test_constant_queries_per_batch(self, apply_instructor_factory):
+        def count(size):
+            apply_instructor_factory.create_batch(size, pending=True)
+            with CaptureQueriesContext(connection) as queries:
+                approval.approve(ApplyInstructor.objects.all(), "testserver")
+            return len(queries)
+
+        assert count(2) == count(10)
+
+
+@pytest.mark.django_db
+class TestApproveCommand:
+    def test_approves_in_batches(self, apply_instructor_factory, capsys):
+        apply_instructor_factory.create_batch(5, pending=True)
+
+        call_command(
+            "approve_instructor_applications",
+            "--domain",
+            "testserver",
+            "--batch-size",
+            "2",
+        )
+
+        assert Instructor.objects.count() == 5
+        assert "Approved 5 applications, 0 left pending." in capsys.readouterr().out
+
+    def test_selected_applications(self, apply_instructor_factory):
+        first, _ = apply_instructor_factory.create_batch(2, pending=True)
+
+        call_command(
+            "approve_instructor_applications", str(first.pk), "--domain", "testserver"
+        )
+
+        assert list(Instructor.objects.values_list("user__email", flat=True)) == [
+            User.objects.normalize_email(first.email)
+        ]
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(CommandError):
+            call_command(
+                "approve_instructor_applications",
+                "--domain",
+                "testserver",
+                "--batch-size",
+                "0",
+            )
+
+
+@pytest.mark.django_db
+def test_admin_action(client, super_user, apply_instructor_factory):
+    applications = apply_instructor_factory.create_batch(2, pending=True)
+    client.force_login(super_user)
+
+    response = client.post(
+        reverse("admin:accounts_applyinstructor_changelist"),
+        {
+            "action": "approve_selected",
+            "_selected_action": [application.pk for application in applications],
+        },
+        follow=True,
+    )
+
+    assert response.status_code == 200
+    assert Instructor.objects.count() == 2
+    assert "2 applications were approved." in [
+        str(message) for message in response.context["messages"]
+    ]
+
+
+@pytest.mark.django_db
+def test_admin_reject_action(client, super_user, apply_instructor_factory):
+    pending = apply_instructor_factory(pending=True)
+    approved = apply_instructor_factory(approved=True)
+    client.force_login(super_user)
+
+    client.post(
+        reverse("admin:accounts_applyinstructor_changelist"),
+        {"action": "reject_selected", "_selected_action": [pending.pk, approved.pk]},
+    )
+
+    pending.refresh_from_db()
+    approved.refresh_from_db()
+    assert pending.status == ApplyInstructor.STATUS.REJECTED
+    assert approved.status == ApplyInstructor.STATUS.APPROVED
+    assert not Instructor.objects.exists()
+
+
+@pytest.mark.django_db
+def test_admin_status_is_not_editable(client, super_user, apply_instructor_factory):
+    application = apply_instructor_factory(pending=True)
+    client.force_login(super_user)
+
+    response = client.get(reverse("admin:accounts_applyinstructor_changelist"))
+    assert not response.context["cl"].list_editable
+
+    response = client.get(
+        reverse("admin:accounts_applyinstructor_change", args=[application.pk])
+    )
+    assert "status" not in response.context["adminform"].form.fields
@@ -0,0 +1,207 @@
+from unittest import mock
+
+import pytest
+from apps.accounts.authentication import (
+    EmailOrUsernameAuthentication,
+    aauthenticate,
+)
+from apps.accounts.forms import LoginForm
+from asgiref.sync import async_to_sync
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+User = get_user_model()
+
+
+@pytest.fixture
+def hash_calls():
+    """Counts every PBKDF2 run, whether it hashes or verifies a password."""
+    with override_settings(
+        ACCOUNTS_HASHING_EXECUTOR="apps.accounts.hashing.InlineHashingExecutor"
+    ), mock.patch.object(
+        PBKDF2PasswordHasher,
+        "encode",
+        autospec=True,
+        side_effect=PBKDF2PasswordHasher.encode,
+    ) as encode:
+        yield encode
+
+
+@pytest.fixture
+def login_user(user_factory):
+    user = user_factory(normal=True, email="login@test.com", username="login-user")
+    user.set_password("Secret@1234")
+    user.save()
+    return user
+
+
+@pytest.mark.django_db
+class TestGetByLogin:
+    def test_lookup_by_email_is_case_insensitive(self, login_user):
+        assert User.objects.get_by_login("LOGIN@test.com") == login_user
+
+    def test_lookup_by_username_is_case_insensitive(self, login_user):
+        assert User.objects.get_by_login("Login-User") == login_user
+
+    def test_login_field_is_respected(self, login_user):
+        assert User.objects.get_by_login("login-user", "email") is None
+        assert User.objects.get_by_login("login@test.com", "username") is None
+
+    def test_invalid_login_field(self):
+        with pytest.raises(ValueError):
+            User.objects.get_by_login("login", "phone")
+
+    @pytest.mark.parametrize(
+        "fields",
+        [
+            {"email": "Login@test.com", "username": "other"},
+            {"email": "other@test.com", "username": "LOGIN-user"},
+        ],
+    )
+    def test_case_variants_are_rejected(self, login_user, user_factory, fields):
+        with pytest.raises(IntegrityError), transaction.atomic():
+            user_factory(normal=True, **fields)
+
+    def test_filter_by_login(self, login_user, user_factory):
+        other = user_factory(normal=True, email="other@test.com")
+
+        users = User.objects.filter_by_login(
+            "email", ["LOGIN@test.com", "Other@Test.com", "missing@test.com"]
+        )
+
+        assert set(users) == {login_user, other}
+
+    def test_lookup_runs_one_unordered_query(self, login_user):
+        with CaptureQueriesContext(connection) as queries:
+            User.objects.get_by_login("login@test.com")
+
+        assert len(queries) == 1
+        sql = queries[0]["sql"]
+        assert "ORDER BY" not in sql
+        assert '"username"' not in sql.split("WHERE")[1]
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="EXPLAIN output is PostgreSQL only"
+    )
+    def test_lookup_uses_functional_index(self, login_user):
+        with CaptureQueriesContext(connection) as queries:
+            User.objects.get_by_login("login@test.com")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + queries[0]["sql"])
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        assert "user_email_lower_uniq" in plan
+        assert "Sort" not in plan
+
+
+@pytest.mark.django_db
+class TestEmailOrUsernameAuthentication:
+    def test_authenticate_by_email(self, login_user):
+        backend = EmailOrUsernameAuthentication()
+        assert backend.authenticate(None, "login@test.com", "Secret@1234") == login_user
+
+    def test_authenticate_by_username(self, login_user):
+        backend = EmailOrUsernameAuthentication()
+        assert backend.authenticate(None, "login-user", "Secret@1234") == login_user
+
+    def test_authenticate_wrong_password(self, login_user):
+        backend = EmailOrUsernameAuthentication()
+        assert backend.authenticate(None, "login-user", "wrong") is None
+
+    def test_authenticate_unknown_user(self):
+        backend = EmailOrUsernameAuthentication()
+        assert backend.authenticate(None, "nobody", "Secret@1234") is None
+
+    def test_login_form_passes_login_field(self, login_user):
+        form = LoginForm({"login": "LOGIN-USER", "password": "Secret@1234"})
+
+        assert form.is_valid()
+        assert form.get_user() == login_user
+
+    def test_authenticate_with_username_field_kwarg(self, login_user):
+        assert (
+            authenticate(email="login@test.com", password="Secret@1234") == login_user
+        )
+
+    def test_inactive_user_is_rejected(self, login_user):
+        login_user.is_active = False
+        login_user.save()
+
+        assert authenticate(username="login-user", password="Secret@1234") is None
+
+    @pytest.mark.parametrize(
+        "login, password",
+        [
+            ("login@test.com", "Secret@1234"),
+            ("login@test.com", "wrong-password"),
+            ("login-user", "wrong-password"),
+            ("nobody@test.com", "wrong-password"),
+            ("nobody", "wrong-password"),
+        ],
+    )
+    def test_password_is_hashed_once_per_attempt(
+        self, login_user, hash_calls, login, password
+    ):
+        hash_calls.reset_mock()
+        authenticate(username=login, password=password)
+
+        assert hash_calls.call_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncAuthentication:
+    @pytest.fixture(autouse=True)
+    def no_sync_authenticate(self):
+        with mock.patch.object(
+            EmailOrUsernameAuthentication,
+            "authenticate",
+            autospec=True,
+            side_effect=AssertionError("authenticate() was called"),
+        ):
+            yield
+
+    @pytest.mark.parametrize("login", ["LOGIN@test.com", "login-user"])
+    def test_aauthenticate(self, login_user, login):
+        user = async_to_sync(aauthenticate)(username=login, password="Secret@1234")
+
+        assert user == login_user
+        assert user.backend == (
+            "apps.accounts.authentication.EmailOrUsernameAuthentication"
+        )
+
+    @pytest.mark.parametrize(
+        "login, password",
+        [
+            ("login@test.com", "Secret@1234"),
+            ("login-user", "wrong-password"),
+            ("nobody@test.com", "wrong-password"),
+        ],
+    )
+    def test_password_is_hashed_once_per_attempt(
+        self, login_user, hash_calls, login, password
+    ):
+        hash_calls.reset_mock()
+        async_to_sync(aauthenticate)(username=login, password=password)
+
+        assert hash_calls.call_count == 1
+
+    def test_failure_is_signalled(self, login_user):
+        with mock.patch(
+            "apps.accounts.authentication.user_login_failed.asend"
+        ) as asend:
+            user = async_to_sync(aauthenticate)(username="nobody", password="wrong")
+
+        assert user is None
+        asend.assert_called_once()
+        assert asend.call_args.kwargs["credentials"]["password"] != "wrong"
+
+    def test_login_form(self, login_user):
+        form = LoginForm({"login": "login-user", "password": "Secret@1234"})
+
+        assert async_to_sync(form.ais_valid)()
+        assert form.get_user() == login_user
@@ -0,0 +1,103 @@
+import pytest
+from apps.accounts.cache import LocalLRUCache, user_cache
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+
+User = get_user_model()
+
+
+class TestLocalLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = LocalLRUCache(maxsize=2, timeout=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert lru.get("a") == 1
+        assert lru.get("b") is None
+        assert lru.get("c") == 3
+
+    def test_expired_entries_are_dropped(self):
+        lru = LocalLRUCache(maxsize=2, timeout=-1)
+        lru.set("a", 1)
+
+        assert lru.get("a") is None
+
+
+@pytest.mark.django_db
+class TestUserCache:
+    def test_second_lookup_hits_the_cache(
+        self, user_with_profile, django_assert_num_queries
+    ):
+        user = user_with_profile.user
+
+        with django_assert_num_queries(1):
+            cached = user_cache.get(user.pk)
+            assert cached.profile.pk == user_with_profile.pk
+
+        with django_assert_num_queries(0):
+            assert user_cache.get(str(user.pk)) == user
+
+    def test_shared_cache_is_used_when_local_is_empty(
+        self, normal_user, django_assert_num_queries
+    ):
+        user_cache.get(normal_user.pk)
+        user_cache.clear_local()
+
+        with django_assert_num_queries(0):
+            assert user_cache.get(normal_user.pk) == normal_user
+
+    def test_each_lookup_returns_a_new_instance(self, normal_user):
+        assert user_cache.get(normal_user.pk) is not user_cache.get(normal_user.pk)
+
+    def test_missing_or_invalid_user(self):
+        assert user_cache.get(0) is None
+        assert user_cache.get("not-a-pk") is None
+
+    def test_save_invalidates(self, normal_user):
+        user_cache.get(normal_user.pk)
+        normal_user.username = "renamed"
+        normal_user.save()
+
+        assert cache.get(user_cache.make_key(normal_user.pk)) is None
+        assert user_cache.get(normal_user.pk).username == "renamed"
+
+    def test_delete_invalidates(self, normal_user):
+        pk = normal_user.pk
+        user_cache.get(pk)
+        normal_user.delete()
+
+        assert user_cache.get(pk) is None
+
+    def test_profile_change_invalidates(self, user_with_profile):
+        user_cache.get(user_with_profile.user_id)
+        user_with_profile.first_name = "changed"
+        user_with_profile.save()
+
+        cached = user_cache.get(user_with_profile.user_id)
+        assert cached.profile.first_name == "changed"
+
+    def test_group_change_invalidates(self, normal_user):
+        group = Group.objects.create(name="teachers")
+        user_cache.get(normal_user.pk)
+
+        normal_user.groups.add(group)
+        assert cache.get(user_cache.make_key(normal_user.pk)) is None
+
+        user_cache.get(normal_user.pk)
+        group.user_set.clear()
+        assert cache.get(user_cache.make_key(normal_user.pk)) is None
+
+    def test_permission_change_invalidates(self, normal_user):
+        permission = Permission.objects.first()
+        user_cache.get(normal_user.pk)
+
+        permission.user_set.add(normal_user)
+        assert cache.get(user_cache.make_key(normal_user.pk)) is None
+
+    def test_backend_rejects_inactive_cached_user(self, not_active_user):
+        from apps.accounts.authentication import EmailOrUsernameAuthentication
+
+        assert EmailOrUsernameAuthentication().get_user(not_active_user.pk) is None
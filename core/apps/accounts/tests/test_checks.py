@@ -0,0 +1,49 @@
+import pytest
+from apps.accounts.checks import check_shared_cache
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+SHARED = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/0",
+    }
+}
+
+
+@pytest.fixture
+def production(settings):
+    settings.DEBUG = False
+    settings.ACCOUNTS_USER_CACHE_ALIAS = "default"
+    return settings
+
+
+class TestSharedCacheCheck:
+    def test_process_local_cache_is_reported(self, production):
+        production.CACHES = LOCMEM
+        production.ACCOUNTS_SESSION_WRITE_THROUGH = True
+
+        (warning,) = check_shared_cache(None)
+
+        assert warning.id == "accounts.W001"
+        assert "the user cache" in warning.msg
+        assert "sessions" not in warning.msg
+
+    def test_sessions_without_write_through_are_reported(self, production):
+        production.CACHES = LOCMEM
+        production.ACCOUNTS_SESSION_WRITE_THROUGH = False
+
+        (warning,) = check_shared_cache(None)
+
+        assert "sessions" in warning.msg
+
+    def test_shared_cache_passes(self, production):
+        production.CACHES = SHARED
+        production.ACCOUNTS_SESSION_WRITE_THROUGH = False
+
+        assert check_shared_cache(None) == []
+
+    def test_debug_passes(self, settings):
+        settings.DEBUG = True
+        settings.CACHES = LOCMEM
+
+        assert check_shared_cache(None) == []
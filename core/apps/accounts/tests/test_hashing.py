@@ -0,0 +1,125 @@
+from concurrent.futures import Future
+from unittest import mock
+
+import pytest
+from apps.accounts import hashing
+from apps.accounts.forms import LoginForm
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password
+from django.test import override_settings
+
+
+@pytest.fixture
+def inline_executor():
+    with override_settings(
+        ACCOUNTS_HASHING_EXECUTOR="apps.accounts.hashing.InlineHashingExecutor"
+    ):
+        yield hashing.get_hashing_executor()
+
+
+@pytest.fixture
+def process_executor():
+    executor = hashing.ProcessPoolHashingExecutor(workers=1, max_queue=2)
+    yield executor
+    executor.shutdown()
+
+
+class TestInlineHashingExecutor:
+    def test_make_and_verify_password(self, inline_executor):
+        encoded = hashing.make_password("Secret@1234")
+
+        assert check_password("Secret@1234", encoded)
+        assert hashing.verify_password("Secret@1234", encoded) == (True, False)
+        assert hashing.verify_password("wrong", encoded) == (False, False)
+
+    def test_unusable_password_is_not_hashed(self, inline_executor):
+        encoded = hashing.make_password(None)
+
+        assert encoded.startswith("!")
+        assert inline_executor.metrics.hashes == 0
+
+    def test_metrics_are_recorded(self, inline_executor):
+        hashing.make_password("Secret@1234")
+        snapshot = inline_executor.metrics.snapshot()
+
+        assert snapshot["hashes"] == 1
+        assert snapshot["hash_seconds_avg"] > 0
+        assert snapshot["rejected"] == 0
+
+    def test_async_hashing(self, inline_executor):
+        encoded = async_to_sync(hashing.amake_password)("Secret@1234")
+
+        assert async_to_sync(hashing.averify_password)("Secret@1234", encoded) == (
+            True,
+            False,
+        )
+
+
+class TestProcessPoolHashingExecutor:
+    def test_hashes_in_worker_process(self, process_executor):
+        encoded = process_executor.make_password("Secret@1234")
+
+        assert process_executor.verify_password("Secret@1234", encoded) == (
+            True,
+            False,
+        )
+        assert process_executor.metrics.snapshot()["hashes"] == 2
+
+    def test_make_passwords_waits_for_free_slots(self, process_executor):
+        encoded = process_executor.make_passwords(["Secret@1234"] * 3 + [None])
+
+        assert all(check_password("Secret@1234", value) for value in encoded[:3])
+        assert encoded[3].startswith("!")
+
+    def test_rejects_when_queue_is_full(self, process_executor):
+        # Jobs that never finish keep holding their queue slot.
+        with mock.patch.object(
+            process_executor.pool, "submit", side_effect=lambda *a: Future()
+        ):
+            process_executor.submit(hashing._make_password, "a")
+            process_executor.submit(hashing._make_password, "b")
+
+            with pytest.raises(hashing.HashingQueueFull):
+                process_executor.submit(hashing._make_password, "c")
+
+        assert process_executor.metrics.rejected == 1
+
+
+@pytest.mark.django_db
+class TestUserPasswordHashing:
+    def test_set_password_uses_executor(self, normal_user, inline_executor):
+        normal_user.set_password("Secret@1234")
+
+        assert normal_user.check_password("Secret@1234")
+        assert inline_executor.metrics.hashes == 2
+
+    def test_outdated_hash_is_upgraded(self, normal_user, inline_executor):
+        normal_user.password = PBKDF2PasswordHasher().encode(
+            "Secret@1234", "salt", iterations=1000
+        )
+        normal_user.save()
+
+        assert normal_user.check_password("Secret@1234")
+        normal_user.refresh_from_db()
+        assert normal_user.password.split("$")[1] == str(
+            PBKDF2PasswordHasher.iterations
+        )
+
+    def test_async_check_password(self, normal_user, inline_executor):
+        async_to_sync(normal_user.aset_password)("Secret@1234")
+
+        assert async_to_sync(normal_user.acheck_password)("Secret@1234")
+        assert not async_to_sync(normal_user.acheck_password)("wrong")
+
+    def test_login_form_reports_busy_executor(self, normal_user):
+        normal_user.set_password("Secret@1234")
+        normal_user.save()
+
+        busy = mock.Mock(spec=hashing.BaseHashingExecutor)
+        busy.verify_password.side_effect = hashing.HashingQueueFull
+
+        with mock.patch.object(hashing, "get_hashing_executor", return_value=busy):
+            form = LoginForm({"login": normal_user.email, "password": "Secret@1234"})
+            assert not form.is_valid()
+
+        assert "busy" in str(form.non_field_errors())
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+from apps.accounts import importing
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+User = get_user_model()
+
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="COPY needs PostgreSQL"
+)
+
+
+@pytest.fixture(autouse=True)
+def inline_hashing(settings):
+    settings.ACCOUNTS_HASHING_EXECUTOR = "apps.accounts.hashing.InlineHashingExecutor"
+
+
+def write_csv(path, rows):
+    header = ["email", "username", "password", "first_name", "phone"]
+    lines = [",".join(header)] + [
+        ",".join(row.get(column, "") for column in header) for row in rows
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return str(path)
+
+
+def read_report(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.django_db
+class TestImportUsers:
+    @pytest.mark.parametrize(
+        "method", ["bulk", pytest.param("copy", marks=requires_postgres)]
+    )
+    def test_imports_users_and_profiles(self, tmp_path, method):
+        path = write_csv(
+            tmp_path / "users.csv",
+            [
+                {
+                    "email": "one@EXAMPLE.com",
+                    "username": "one",
+                    "password": "Secret_123",
+                    "first_name": "One",
+                    "phone": "09123456789",
+                },
+                {"email": "two@example.com"},
+            ],
+        )
+
+        call_command("import_users", path, "--method", method, "--activate")
+
+        one = User.objects.select_related("profile").get(email="one@example.com")
+        assert one.username == "one"
+        assert one.is_active is True
+        assert one.check_password("Secret_123")
+        assert one.profile.first_name == "One"
+        assert one.profile.phone == "09123456789"
+        assert one.profile.is_public is False
+
+        two = User.objects.select_related("profile").get(email="two@example.com")
+        assert two.username.startswith("two-")
+        assert two.has_usable_password() is False
+        assert two.profile.first_name is None
+
+    def test_rejected_rows_are_reported(self, tmp_path, normal_user):
+        path = write_jsonl(
+            tmp_path / "users.jsonl",
+            [
+                {"email": "not-an-email"},
+                {"email": "weak@example.com", "password": "password"},
+                {"email": "phone@example.com", "phone": "12345"},
+                {"email": normal_user.email.upper()},
+                {"email": "twice@example.com"},
+                {"email": "Twice@example.com"},
+                {"email": "ok@example.com"},
+            ],
+        )
+
+        call_command("import_users", path, "--method", "bulk")
+
+        assert set(User.objects.values_list("email", flat=True)) == {
+            normal_user.email,
+            "twice@example.com",
+            "ok@example.com",
+        }
+        report = read_report(path + ".errors.jsonl")
+        assert [(entry["line"], list(entry["errors"])) for entry in report] == [
+            (1, ["email"]),
+            (2, ["password"]),
+            (3, ["phone"]),
+            (4, ["email"]),
+            (6, ["email"]),
+        ]
+        assert report[3]["errors"]["email"] == ["Email already exists."]
+
+    def test_malformed_lines_are_reported(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        path.write_text(
+            '{"email": "one@example.com"}\n'
+            '{"email": "broken@example.com"\n'
+            '["list@example.com"]\n'
+            '{"email": "two@example.com"}\n'
+        )
+
+        call_command("import_users", str(path), "--method", "bulk")
+
+        assert set(User.objects.values_list("email", flat=True)) == {
+            "one@example.com",
+            "two@example.com",
+        }
+        report = read_report(f"{path}.errors.jsonl")
+        assert [(entry["line"], list(entry["errors"])) for entry in report] == [
+            (2, ["__all__"]),
+            (3, ["__all__"]),
+        ]
+        assert report[0]["errors"]["__all__"][0].startswith("Invalid JSON")
+        assert report[1]["errors"]["__all__"] == ["Expected a JSON object."]
+
+    def test_batches_and_progress(self, tmp_path, capsys):
+        path = write_jsonl(
+            tmp_path / "users.jsonl",
+            [{"email": f"user{i}@example.com"} for i in range(5)],
+        )
+
+        call_command("import_users", path, "--batch-size", "2", "--method", "bulk")
+
+        assert User.objects.count() == 5
+        output = capsys.readouterr().out
+        assert "Batch 3: 1 imported, 0 rejected (5 rows processed)." in output
+        assert "Imported 5 users, rejected 0." in output
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        path = write_jsonl(
+            tmp_path / "users.jsonl",
+            [{"email": f"user{i}@example.com"} for i in range(4)],
+        )
+        importing.Checkpoint(path + ".checkpoint").save(2)
+
+        call_command("import_users", path, "--batch-size", "2", "--method", "bulk")
+
+        assert set(User.objects.values_list("email", flat=True)) == {
+            "user2@example.com",
+            "user3@example.com",
+        }
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command("import_users", str(tmp_path / "missing.csv"))
@@ -0,0 +1,139 @@
+import pytest
+from apps.accounts import admin_search
+from apps.accounts.models import (
+    ApplyInstructor,
+    Education,
+    Experience,
+    Instructor,
+    Profile,
+    Skill,
+    User,
+)
+from apps.accounts.pagination import ORDERING
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="EXPLAIN output is PostgreSQL only"
+    ),
+]
+
+
+def keyset_page(queryset):
+    # The query behind a page after the first, see apps.accounts.pagination.
+    if not isinstance(queryset, QuerySet):
+        queryset = queryset.objects.all()
+    now = timezone.now()
+    return queryset.filter(
+        Q(created_at__lte=now) & (Q(created_at__lt=now) | Q(pk__lt=1000))
+    ).order_by(*ORDERING)[:51]
+
+
+def plan(queryset):
+    # The test tables are tiny, so the planner would rightly pick sequential
+    # or bitmap scans; disabling them shows whether an index fits the query,
+    # including its ORDER BY.
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+    return queryset.explain()
+
+
+@pytest.fixture
+def rows(instructor_factory, skill_factory, education_factory, experience_factory):
+    # Once autovacuum has analysed the empty tables the planner expects one
+    # row from any scan, and two fitting indexes can tie. A few rows make
+    # the more selective index the cheaper one again.
+    instructor = instructor_factory()
+    for factory in (skill_factory, education_factory, experience_factory):
+        factory.create_batch(10, instructor=instructor)
+
+
+@pytest.mark.parametrize(
+    "queryset, index",
+    [
+        (lambda: User.objects.all()[:50], "user_created_idx"),
+        (
+            lambda: Profile.objects.filter(is_public=True).order_by("-created_at")[:50],
+            "profile_public_created_idx",
+        ),
+        (
+            lambda: Instructor.objects.filter(status=True).order_by("-created_at")[:50],
+            "instructor_status_created_idx",
+        ),
+        (
+            lambda: ApplyInstructor.objects.filter(
+                status=ApplyInstructor.STATUS.PENDING
+            ).order_by("created_at")[:50],
+            "apply_status_created_idx",
+        ),
+        (
+            lambda: Skill.objects.filter(level=Skill.Level.ADVANCED),
+            "skill_level_idx",
+        ),
+        (
+            lambda: Education.objects.filter(institution="University of Tehran"),
+            "education_institution_idx",
+        ),
+        (
+            lambda: Experience.objects.filter(company="Eduport"),
+            "experience_company_idx",
+        ),
+        (lambda: Experience.objects.all()[:50], "experience_created_idx"),
+        (lambda: keyset_page(User), "user_created_idx"),
+        (lambda: keyset_page(Instructor), "instructor_created_idx"),
+        (lambda: keyset_page(ApplyInstructor), "apply_created_idx"),
+        (
+            lambda: keyset_page(Instructor.objects.filter(status=True)),
+            "instructor_status_created_idx",
+        ),
+    ],
+)
+@pytest.mark.usefixtures("rows")
+def test_hot_query_uses_index(queryset, index):
+    explained = plan(queryset())
+
+    assert index in explained
+    assert "Sort" not in explained
+
+
+SEARCHED = [
+    (model, name)
+    for model, fields in admin_search.INDEXED_FIELDS.items()
+    for name in fields
+]
+
+
+@pytest.mark.parametrize("model, name", SEARCHED)
+def test_admin_search_prefix_uses_index(model, name):
+    queryset = model.objects.filter(**{f"{name}__istartswith": "ab"}).order_by()
+
+    explained = plan(queryset)
+
+    assert f"{model._meta.db_table}_{name}_prefix" in explained
+
+
+@pytest.mark.parametrize("model, name", SEARCHED)
+def test_admin_search_substring_uses_trigram_index(model, name):
+    if not admin_search.has_trigrams():
+        pytest.skip("No pg_trgm on this database")
+    with connection.cursor() as cursor:
+        # GIN indexes are only read by bitmap scans.
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    queryset = model.objects.filter(**{f"{name}__icontains": "abc"}).order_by()
+
+    assert f"{model._meta.db_table}_{name}_trgm" in queryset.explain()
+
+
+def test_user_uuid_has_a_single_index():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s",
+            [User._meta.db_table],
+        )
+        definitions = [row[0] for row in cursor.fetchall()]
+
+    assert len([d for d in definitions if "(uuid)" in d]) == 1
@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+import pytest
+from apps.accounts.intervals import experience_totals
+
+TODAY = date(2024, 1, 1)
+
+
+@pytest.mark.parametrize(
+    "intervals, expected",
+    [
+        ([(0, 10)], 10),
+        ([(0, 10), (20, 25)], 15),
+        ([(0, 10), (5, 15)], 15),
+        ([(0, 30), (5, 10), (12, 20)], 30),
+        ([(0, 10), (10, 20)], 20),
+    ],
+)
+def test_experience_totals_merges_intervals(intervals, expected):
+    # Intervals are day offsets from TODAY, sorted by start.
+    rows = [
+        (1, "MID", TODAY + timedelta(start), TODAY + timedelta(end))
+        for start, end in intervals
+    ]
+
+    assert list(experience_totals(rows, TODAY)) == [(1, expected, {"MID": expected})]
+
+
+def test_experience_totals_counts_overlaps_once():
+    rows = [
+        (1, "JUNIOR", date(2020, 1, 1), date(2021, 1, 1)),
+        (1, "JUNIOR", date(2020, 7, 1), date(2021, 7, 1)),
+        (1, "SENIOR", date(2021, 1, 1), date(2022, 1, 1)),
+        (2, "MID", date(2023, 12, 1), None),
+    ]
+
+    assert list(experience_totals(rows, TODAY)) == [
+        (1, 731, {"JUNIOR": 547, "SENIOR": 365}),
+        (2, 31, {"MID": 31}),
+    ]
+
+
+def test_experience_totals_ignores_end_before_start():
+    rows = [(1, "MID", date(2020, 1, 2), date(2020, 1, 1))]
+
+    assert list(experience_totals(rows, TODAY)) == [(1, 0, {"MID": 0})]
+
+
+def test_experience_totals_without_rows():
+    assert list(experience_totals([], TODAY)) == []
@@ -0,0 +1,204 @@
+import os
+import smtplib
+import socket
+from unittest import mock
+
+import pytest
+from apps.accounts.mail import (
+    MailDispatcher,
+    render_verification_emails,
+    template_cache,
+)
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocMemBackend
+from django.template import Context, Template
+from django.template.loader import render_to_string
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+
+class FlakyBackend(LocMemBackend):
+    """Drops the connection on the first send and refuses one recipient."""
+
+    opened = 0
+    failures = 0
+
+    def open(self):
+        type(self).opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if type(self).failures:
+            type(self).failures -= 1
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        if any("refused@example.com" in message.to for message in messages):
+            raise smtplib.SMTPRecipientsRefused({"refused@example.com": (550, b"")})
+        return super().send_messages(messages)
+
+
+BACKEND = f"{__name__}.FlakyBackend"
+
+
+@pytest.fixture
+def flaky_backend():
+    FlakyBackend.opened = 0
+    FlakyBackend.failures = 0
+    return FlakyBackend
+
+
+def message(to="user@example.com"):
+    return EmailMessage("Subject", "Body", "support@eduport.com", [to])
+
+
+class TestMailDispatcher:
+    def test_batch_is_sent_over_one_connection(self, flaky_backend):
+        dispatcher = MailDispatcher(backend=BACKEND)
+
+        results = dispatcher.send([message(), message(), message()])
+
+        assert [result.sent for result in results] == [True, True, True]
+        assert len(mail.outbox) == 3
+        assert flaky_backend.opened == 1
+
+    def test_reconnects_when_the_server_drops_the_connection(self, flaky_backend):
+        flaky_backend.failures = 1
+        dispatcher = MailDispatcher(backend=BACKEND)
+
+        results = dispatcher.send([message(), message()])
+
+        assert [result.sent for result in results] == [True, True]
+        assert flaky_backend.opened == 2
+
+    def test_gives_up_after_retries(self, flaky_backend):
+        flaky_backend.failures = 5
+        dispatcher = MailDispatcher(backend=BACKEND, retries=1)
+
+        (result,) = dispatcher.send([message()])
+
+        assert result.sent is False
+        assert isinstance(result.error, smtplib.SMTPServerDisconnected)
+
+    def test_reports_outcome_per_message(self, flaky_backend):
+        dispatcher = MailDispatcher(backend=BACKEND)
+
+        results = dispatcher.send([message(), message("refused@example.com")])
+
+        assert [result.sent for result in results] == [True, False]
+        assert isinstance(results[1].error, smtplib.SMTPRecipientsRefused)
+        assert flaky_backend.opened == 1
+
+
+@pytest.fixture
+def email_templates(settings, tmp_path):
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [tmp_path],
+        }
+    ]
+    template_cache.clear()
+    yield tmp_path
+    template_cache.clear()
+
+
+@pytest.mark.django_db
+class TestRenderVerificationEmails:
+    def test_batch_matches_full_render(self, user_factory):
+        users = user_factory.create_batch(3)
+
+        messages = render_verification_emails(
+            users, "testserver", "Activate", "emails/account_verification_email.html"
+        )
+
+        for user, message in zip(users, messages):
+            assert message.to == [user.email]
+            assert message.content_subtype == "html"
+            assert message.body == render_to_string(
+                "emails/account_verification_email.html",
+                {
+                    "user": user,
+                    "domain": "testserver",
+                    "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+                    "token": default_token_generator.make_token(user),
+                },
+            )
+
+    def test_template_is_compiled_once(self, email_templates, user_factory):
+        (email_templates / "mail.html").write_text("{{ uid }}/{{ token }}")
+        users = user_factory.create_batch(2)
+
+        with mock.patch.object(
+            template_cache, "_compile", wraps=template_cache._compile
+        ) as compile:
+            render_verification_emails(users, "testserver", "Activate", "mail.html")
+            render_verification_emails(users, "testserver", "Activate", "mail.html")
+
+        assert compile.call_count == 1
+
+    def test_template_is_recompiled_when_changed(self, email_templates, user_factory):
+        path = email_templates / "mail.html"
+        path.write_text("old {{ uid }}")
+        (user,) = user_factory.create_batch(1)
+        render_verification_emails([user], "testserver", "Activate", "mail.html")
+
+        path.write_text("new {{ uid }}")
+        os.utime(path, (0, 0))
+        (message,) = render_verification_emails(
+            [user], "testserver", "Activate", "mail.html"
+        )
+
+        assert message.body.startswith("new ")
+
+    @pytest.mark.parametrize(
+        "template",
+        [
+            "{{ user.email }} {{ uid }}/{{ token }}",
+            "{% if user %}hi{% endif %} {{ uid|upper }}/{{ token }}",
+            "{{ uid|upper }}/{{ token }}",
+        ],
+    )
+    def test_falls_back_to_full_render(self, email_templates, user_factory, template):
+        (email_templates / "mail.html").write_text(template)
+        users = user_factory.create_batch(2)
+
+        messages = render_verification_emails(
+            users, "testserver", "Activate", "mail.html"
+        )
+
+        for user, message in zip(users, messages):
+            full = Template(template).render(
+                Context(
+                    {
+                        "user": user,
+                        "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+                        "token": default_token_generator.make_token(user),
+                    }
+                )
+            )
+            assert message.body == full
+
+
+def smtp_server_available():
+    try:
+        socket.create_connection(
+            (settings.EMAIL_HOST, int(settings.EMAIL_PORT)), timeout=1
+        ).close()
+    except OSError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(
+    not smtp_server_available(), reason="No SMTP server (e.g. mailhog) to talk to"
+)
+def test_dispatcher_against_smtp_server():
+    dispatcher = MailDispatcher(backend="django.core.mail.backends.smtp.EmailBackend")
+    with mock.patch.object(smtplib, "SMTP", wraps=smtplib.SMTP) as smtp:
+        results = dispatcher.send([message(f"user{i}@example.com") for i in range(3)])
+    dispatcher.close()
+
+    assert all(result.sent for result in results)
+    assert smtp.call_count == 1
@@ -1,5 +1,6 @@
 import pytest
 from apps.accounts import models
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
@@ -111,6 +112,66 @@ class TestUserManager:
             _("Superusers must have 'is_superuser' attribute set to True.")
         )
 
+    def test_create_user_creates_profile_in_one_transaction(
+        self, user_manager, django_assert_num_queries
+    ):
+        # SAVEPOINT, user INSERT, profile INSERT, RELEASE SAVEPOINT
+        with django_assert_num_queries(4):
+            user = user_manager.create_user(
+                username="test", email="test@test.com", profile={"first_name": "T"}
+            )
+
+        assert models.Profile.objects.get(user=user).first_name == "T"
+
+    def test_create_user_rolls_back_when_profile_fails(self, user_manager):
+        with pytest.raises(TypeError):
+            user_manager.create_user(
+                username="test", email="test@test.com", profile={"unknown": 1}
+            )
+
+        assert not User.objects.filter(email="test@test.com").exists()
+
+    def test_acreate_user_creates_profile(self, user_manager):
+        user = async_to_sync(user_manager.acreate_user)(
+            username="test", email="test@test.com", password="test"
+        )
+
+        assert user.has_usable_password() is True
+        assert models.Profile.objects.filter(user=user).count() == 1
+
+    def test_bulk_create_users(self, user_manager, django_assert_max_num_queries):
+        with django_assert_max_num_queries(4):
+            users = user_manager.bulk_create_users(
+                [
+                    {
+                        "username": "one",
+                        "email": "one@test.com",
+                        "password": "test",
+                        "profile": {"first_name": "One"},
+                    },
+                    {"username": "two", "email": "TWO@TEST.com", "is_active": True},
+                ]
+            )
+
+        one, two = (User.objects.select_related("profile").get(pk=u.pk) for u in users)
+        assert one.check_password("test")
+        assert one.profile.first_name == "One"
+        assert two.email == "TWO@test.com"
+        assert two.is_active is True
+        assert two.has_usable_password() is False
+        assert two.profile.first_name is None
+
+    def test_bulk_create_users_validates_every_user(self, user_manager):
+        with pytest.raises(ValueError):
+            user_manager.bulk_create_users(
+                [
+                    {"username": "one", "email": "one@test.com"},
+                    {"username": "two", "email": "not-an-email"},
+                ]
+            )
+
+        assert not User.objects.exists()
+
 
 @pytest.mark.django_db
 class TestUser:
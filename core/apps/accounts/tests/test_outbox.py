@@ -0,0 +1,178 @@
+import smtplib
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from apps.accounts import outbox
+from apps.accounts.mail import DeliveryResult
+from apps.accounts.models import OutboxEmail
+from apps.accounts.tasks.outbox import dispatch_outbox
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.fixture
+def queued(user_factory):
+    def queue(count=1):
+        return [
+            outbox.queue_verification_email(user, "testserver")
+            for user in user_factory.create_batch(count)
+        ]
+
+    return queue
+
+
+def failing_send(messages):
+    return [
+        DeliveryResult(message, False, smtplib.SMTPServerDisconnected())
+        for message in messages
+    ]
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_dispatch_sends_due_emails_in_batches(self, queued, settings):
+        settings.ACCOUNTS_OUTBOX_BATCH_SIZE = 2
+        emails = queued(3)
+
+        assert dispatch_outbox() == 3
+
+        assert len(mail.outbox) == 3
+        assert {message.to[0] for message in mail.outbox} == {
+            email.user.email for email in emails
+        }
+        assert set(OutboxEmail.objects.values_list("status", flat=True)) == {
+            OutboxEmail.Status.SENT
+        }
+
+    def test_dispatch_outbox_command_drains_the_outbox(self, queued):
+        queued(3)
+
+        call_command("dispatch_outbox", "--batch-size", "2")
+
+        assert len(mail.outbox) == 3
+        assert not OutboxEmail.objects.exclude(status=OutboxEmail.Status.SENT)
+
+    def test_stats(self, queued):
+        assert outbox.stats() == {
+            "pending": 0,
+            "due": 0,
+            "oldest_due_age_seconds": 0.0,
+        }
+
+        first, second, sent = queued(3)
+        OutboxEmail.objects.filter(pk=first.pk).update(
+            available_at=timezone.now() - timedelta(minutes=5)
+        )
+        OutboxEmail.objects.filter(pk=second.pk).update(
+            available_at=timezone.now() + timedelta(hours=1)
+        )
+        OutboxEmail.objects.filter(pk=sent.pk).update(status=OutboxEmail.Status.SENT)
+
+        stats = outbox.stats()
+        assert (stats["pending"], stats["due"]) == (2, 1)
+        assert 300 <= stats["oldest_due_age_seconds"] < 360
+
+    def test_stats_command(self, queued, capsys):
+        queued(2)
+
+        call_command("dispatch_outbox", "--stats")
+
+        assert capsys.readouterr().out.startswith("2 emails waiting, 2 due")
+        assert not mail.outbox
+
+    def test_claim_marks_emails_as_sending(self, queued):
+        (email,) = queued()
+
+        (claimed,) = outbox.claim(10)
+
+        assert claimed.pk == email.pk
+        assert claimed.status == OutboxEmail.Status.SENDING
+        assert claimed.attempts == 1
+        assert claimed.available_at > timezone.now()
+        assert outbox.claim(10) == []
+
+    def test_expired_lease_is_claimed_again(self, queued):
+        queued()
+        outbox.claim(10)
+        OutboxEmail.objects.update(available_at=timezone.now())
+
+        (claimed,) = outbox.claim(10)
+
+        assert claimed.attempts == 2
+
+    def test_emails_not_yet_due_are_skipped(self, queued):
+        queued()
+        OutboxEmail.objects.update(available_at=timezone.now() + timedelta(hours=1))
+
+        assert outbox.dispatch() == 0
+
+    def test_failed_email_is_retried_with_backoff(self, queued, settings):
+        settings.ACCOUNTS_OUTBOX_RETRY_DELAY = 10
+        queued()
+
+        with mock.patch.object(
+            outbox.get_mail_dispatcher(), "send", side_effect=failing_send
+        ):
+            outbox.dispatch(max_batches=1)
+            email = OutboxEmail.objects.get()
+            assert email.status == OutboxEmail.Status.PENDING
+            assert "SMTPServerDisconnected" in email.last_error
+            first_delay = email.available_at - timezone.now()
+
+            OutboxEmail.objects.update(available_at=timezone.now())
+            outbox.dispatch(max_batches=1)
+            second_delay = OutboxEmail.objects.get().available_at - timezone.now()
+
+        assert timedelta(seconds=9) < first_delay <= timedelta(seconds=10)
+        assert timedelta(seconds=19) < second_delay <= timedelta(seconds=20)
+
+    def test_email_fails_after_max_attempts(self, queued, settings):
+        settings.ACCOUNTS_OUTBOX_MAX_ATTEMPTS = 1
+        queued()
+
+        with mock.patch.object(
+            outbox.get_mail_dispatcher(), "send", side_effect=failing_send
+        ):
+            outbox.dispatch()
+
+        assert OutboxEmail.objects.get().status == OutboxEmail.Status.FAILED
+
+    def test_backend_exception_is_retried(self, queued, settings):
+        settings.ACCOUNTS_OUTBOX_MAX_ATTEMPTS = 2
+        queued()
+
+        with mock.patch.object(
+            outbox.get_mail_dispatcher(), "send", side_effect=OSError("refused")
+        ):
+            outbox.dispatch(max_batches=1)
+            email = OutboxEmail.objects.get()
+            assert email.status == OutboxEmail.Status.PENDING
+            assert "refused" in email.last_error
+
+            OutboxEmail.objects.update(available_at=timezone.now())
+            outbox.dispatch(max_batches=1)
+
+        assert OutboxEmail.objects.get().status == OutboxEmail.Status.FAILED
+
+    def test_render_error_fails_only_its_group(self, queued):
+        broken, sent = queued(2)
+        OutboxEmail.objects.filter(pk=broken.pk).update(template="emails/missing.html")
+
+        outbox.dispatch(max_batches=1)
+
+        assert len(mail.outbox) == 1
+        broken.refresh_from_db()
+        assert broken.status == OutboxEmail.Status.PENDING
+        assert "missing.html" in broken.last_error
+        sent.refresh_from_db()
+        assert sent.status == OutboxEmail.Status.SENT
+
+    def test_retry_delay_is_capped(self, settings):
+        settings.ACCOUNTS_OUTBOX_RETRY_DELAY = 30
+        settings.ACCOUNTS_OUTBOX_RETRY_DELAY_MAX = 100
+
+        assert outbox.retry_delay(1) == timedelta(seconds=30)
+        assert outbox.retry_delay(2) == timedelta(seconds=60)
+        assert outbox.retry_delay(5) == timedelta(seconds=100)
@@ -0,0 +1,239 @@
+from datetime import timedelta
+
+import pytest
+from apps.accounts.admin import UserAdmin
+from apps.accounts.models import Instructor, Skill, User
+from apps.accounts.pagination import (
+    ApproximateCountPaginator,
+    InvalidCursor,
+    KeysetPaginator,
+)
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+
+@pytest.fixture
+def users(user_factory):
+    # Five of them share a created_at, so pages have to split ties by id.
+    now = timezone.now()
+    created = [now - timedelta(minutes=i) for i in range(7)] + [now] * 5
+    return sorted(
+        (user_factory(created_at=at) for at in created),
+        key=lambda user: (user.created_at, user.pk),
+        reverse=True,
+    )
+
+
+def walk(paginator):
+    page = paginator.page()
+    pages = [list(page)]
+    while page.next_cursor:
+        page = paginator.page(page.next_cursor)
+        pages.append(list(page))
+    return page, pages
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    def test_pages_forward_through_every_row_once(self, users):
+        last, pages = walk(KeysetPaginator(User.objects.all(), per_page=5))
+
+        assert [len(page) for page in pages] == [5, 5, 2]
+        assert [user for page in pages for user in page] == users
+        assert last.has_previous() and not last.has_next()
+
+    def test_pages_back(self, users):
+        paginator = KeysetPaginator(User.objects.all(), per_page=5)
+        last, _ = walk(paginator)
+
+        middle = paginator.page(last.previous_cursor)
+        first = paginator.page(middle.previous_cursor)
+
+        assert list(middle) == users[5:10]
+        assert list(first) == users[:5]
+        assert not first.has_previous() and first.previous_cursor is None
+
+    def test_page_back_to_start_is_refilled(self, users):
+        paginator = KeysetPaginator(User.objects.all(), per_page=5)
+        second = paginator.page(paginator.page().next_cursor)
+        users[0].delete()
+
+        first = paginator.page(second.previous_cursor)
+
+        assert list(first) == users[1:6]
+        assert not first.has_previous()
+
+    def test_respects_filters(self, users):
+        active = User.objects.filter(pk__in=[user.pk for user in users[::2]])
+
+        _, pages = walk(KeysetPaginator(active, per_page=4))
+
+        assert [user for page in pages for user in page] == users[::2]
+
+    def test_empty(self):
+        page = KeysetPaginator(User.objects.all(), per_page=5).page()
+
+        assert len(page) == 0
+        assert page.next_cursor is None and page.previous_cursor is None
+
+    def test_deep_pages_use_no_offset(self, users):
+        paginator = KeysetPaginator(User.objects.all(), per_page=2)
+        cursor = paginator.page(paginator.page().next_cursor).next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            paginator.page(cursor)
+
+        assert "OFFSET" not in queries[0]["sql"]
+
+    @pytest.mark.parametrize("cursor", ["garbage", "a:b:c", "WyJ4Il0:1t:abc"])
+    def test_rejects_bad_cursors(self, cursor):
+        with pytest.raises(InvalidCursor):
+            KeysetPaginator(User.objects.all(), per_page=5).page(cursor)
+
+    def test_rejects_cursor_of_another_model(self, users, instructor_factory):
+        cursor = KeysetPaginator(User.objects.all(), per_page=5).page().next_cursor
+
+        with pytest.raises(InvalidCursor):
+            KeysetPaginator(Instructor.objects.all(), per_page=5).page(cursor)
+
+
+@pytest.mark.django_db
+class TestKeysetChangeList:
+    @pytest.fixture
+    def admin(self, client, super_user, monkeypatch):
+        monkeypatch.setattr(UserAdmin, "list_per_page", 5)
+        client.force_login(super_user)
+        return client
+
+    def test_pages_by_cursor(self, admin, users):
+        url = reverse("admin:accounts_user_changelist")
+        admin_users = User.objects.count()
+
+        response = admin.get(url)
+        cl = response.context["cl"]
+        seen = list(cl.result_list)
+        while cl.keyset_page.has_next():
+            response = admin.get(url + cl.next_page_url)
+            cl = response.context["cl"]
+            seen.extend(cl.result_list)
+
+        assert response.status_code == 200
+        assert cl.result_count == admin_users
+        assert seen == list(User.objects.order_by("-created_at", "-pk"))
+
+    def test_invalid_cursor_redirects(self, admin):
+        url = reverse("admin:accounts_user_changelist")
+
+        response = admin.get(url, {"cursor": "garbage"})
+
+        assert response.status_code == 302
+        assert response.url.endswith("?e=1")
+
+    def test_sorting_by_column_uses_page_numbers(self, admin, users):
+        url = reverse("admin:accounts_user_changelist")
+
+        response = admin.get(url, {"o": "1"})
+
+        assert response.context["cl"].keyset_page is None
+
+    def test_links_drop_the_cursor(self, admin, users):
+        url = reverse("admin:accounts_user_changelist")
+        first = admin.get(url).context["cl"]
+
+        cl = admin.get(url + first.next_page_url).context["cl"]
+
+        assert "cursor" in cl.next_page_url
+        assert "cursor" not in cl.get_query_string({"is_active__exact": 1})
+        assert "cursor" not in cl.first_page_url
+
+    def test_list_editable_page(self, admin, instructor_factory):
+        instructors = instructor_factory.create_batch(3)
+        url = reverse("admin:accounts_instructor_changelist")
+
+        response = admin.get(url)
+
+        assert response.status_code == 200
+        assert len(response.context["cl"].formset.forms) == len(instructors)
+
+    def test_renders_cursor_links(self, admin, users):
+        url = reverse("admin:accounts_user_changelist")
+        first = admin.get(url)
+
+        second = admin.get(url + first.context["cl"].next_page_url)
+
+        assert "?cursor=" in first.content.decode()
+        assert "Previous" in second.content.decode()
+
+
+def analyze(model):
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Row estimates are PostgreSQL only"
+)
+
+
+@pytest.mark.django_db
+class TestApproximateCountPaginator:
+    def test_small_results_are_counted_exactly(self, users):
+        paginator = ApproximateCountPaginator(User.objects.all(), 5)
+
+        assert paginator.count == len(users)
+        assert not paginator.approximate
+
+    @postgresql_only
+    def test_table_estimate(self, users, settings):
+        settings.ACCOUNTS_APPROXIMATE_COUNT_THRESHOLD = 1
+        analyze(User)
+
+        paginator = ApproximateCountPaginator(User.objects.all(), 5)
+
+        assert paginator.count == len(users)
+        assert paginator.approximate
+
+    @postgresql_only
+    def test_filtered_estimate(self, skill_factory, settings):
+        settings.ACCOUNTS_APPROXIMATE_COUNT_THRESHOLD = 1
+        skill_factory.create_batch(20, advanced=True)
+        analyze(Skill)
+
+        paginator = ApproximateCountPaginator(
+            Skill.objects.filter(level=Skill.Level.ADVANCED), 5
+        )
+
+        assert paginator.approximate
+        assert 1 <= paginator.count <= 20
+
+    @postgresql_only
+    def test_pages_past_an_underestimate(self, users, settings):
+        settings.ACCOUNTS_APPROXIMATE_COUNT_THRESHOLD = 1
+        analyze(User)
+        rows = User.objects.order_by("-created_at", "-pk")
+        paginator = ApproximateCountPaginator(rows, 5)
+        # As if the estimate were stale.
+        paginator.count, paginator._approximate = 5, True
+
+        assert list(paginator.page(3)) == list(rows[10:])
+
+    def test_count_is_cached(self, users, django_assert_num_queries):
+        ApproximateCountPaginator(User.objects.all(), 5).count
+
+        with django_assert_num_queries(0):
+            assert ApproximateCountPaginator(User.objects.all(), 5).count == len(users)
+
+    def test_admin_skips_the_full_count(self, client, super_user, skill_factory):
+        skill_factory.create_batch(3)
+        client.force_login(super_user)
+
+        response = client.get(
+            reverse("admin:accounts_skill_changelist"), {"level__exact": "BASIC"}
+        )
+
+        assert response.context["cl"].full_result_count is None
+
+    def test_empty_result(self):
+        assert ApproximateCountPaginator(User.objects.filter(pk__in=[]), 5).count == 0
@@ -0,0 +1,109 @@
+import pytest
+from apps.accounts import search, selectors
+from apps.accounts.models import InstructorSearchDocument
+from django.core.management import call_command
+
+
+def ids(query, **kwargs):
+    return [pk for pk, _ in search.rank(query, **kwargs)]
+
+
+@pytest.fixture
+def teacher(instructor_factory, skill_factory, education_factory):
+    instructor = instructor_factory(job_title="Mathematics Teacher")
+    skill_factory(instructor=instructor, name="Algebra")
+    education_factory(
+        instructor=instructor, major="Physics", institution="Cairo University"
+    )
+    return instructor
+
+
+@pytest.mark.django_db
+class TestInstructorSearch:
+    def test_document_follows_changes(self, teacher, skill_factory):
+        skill = skill_factory(instructor=teacher, name="Python")
+
+        assert ids("python") == [teacher.pk]
+
+        skill.name = "Rust"
+        skill.save()
+
+        assert ids("python") == []
+        assert ids("rust") == [teacher.pk]
+
+        skill.delete()
+
+        assert ids("rust") == []
+
+    def test_instructor_job_title(self, teacher):
+        teacher.job_title = "Chemist"
+        teacher.save(update_fields=["job_title"])
+
+        assert ids("chemist") == [teacher.pk]
+        assert ids("teacher") == []
+
+    def test_experience_and_education(self, teacher, experience_factory):
+        experience_factory(instructor=teacher, job_title="Tutor", company="Acme")
+
+        assert ids("acme tutor") == [teacher.pk]
+        assert ids("cairo physics") == [teacher.pk]
+        assert ids("acme cairo algebra") == [teacher.pk]
+        assert ids("acme chemistry") == []
+
+    def test_stemming_and_prefix(self, teacher):
+        assert ids("teaching") == [teacher.pk]
+        assert ids("mathemat") == [teacher.pk]
+        assert ids("teacher alg") == [teacher.pk]
+
+    def test_ranks_by_weight(self, teacher, instructor_factory):
+        # "Physics" is the teacher's major but the other's job title.
+        physicist = instructor_factory(job_title="Physics Lecturer")
+
+        assert ids("physics") == [physicist.pk, teacher.pk]
+
+    def test_active_filter(self, instructor_factory):
+        active = instructor_factory(job_title="Designer", active=True)
+        inactive = instructor_factory(job_title="Designer", not_active=True)
+
+        assert ids("designer", active=True) == [active.pk]
+        assert ids("designer", active=False) == [inactive.pk]
+
+    def test_empty_query(self, teacher):
+        assert ids("  --  ") == []
+
+    def test_moved_skill_updates_both_documents(
+        self, teacher, instructor_factory, skill_factory
+    ):
+        other = instructor_factory(job_title="Chemist")
+        skill = skill_factory(instructor=teacher, name="Python")
+
+        skill.instructor = other
+        skill.save()
+
+        assert ids("python") == [other.pk]
+
+    def test_deleting_instructor_deletes_document(self, teacher):
+        teacher.delete()
+
+        assert not InstructorSearchDocument.objects.exists()
+        assert ids("teacher") == []
+
+    def test_rebuild_command(self, teacher):
+        InstructorSearchDocument.objects.update(headline="", roles="")
+
+        call_command("rebuild_search_documents", "--batch-size", "1")
+
+        assert ids("algebra") == [teacher.pk]
+
+    def test_search_instructors(
+        self, teacher, instructor_factory, django_assert_num_queries
+    ):
+        instructor_factory(job_title="Mathematics Lecturer")
+
+        # The ranking, then the four queries of the other selectors.
+        with django_assert_num_queries(5):
+            found = selectors.search_instructors("mathematics", limit=5)
+            [skill.name for instructor in found for skill in instructor.skills.all()]
+
+        assert len(found) == 2
+        assert found[0].search_rank >= found[1].search_rank > 0
@@ -0,0 +1,105 @@
+from datetime import date
+
+import pytest
+from apps.accounts import selectors
+from apps.accounts.models import Instructor
+
+# Instructors with user and profile, then skills, educations and experiences.
+QUERIES = 4
+
+
+def render(instructor):
+    return (
+        str(instructor),
+        instructor.user.profile.get_full_name(),
+        [skill.name for skill in instructor.skills.all()],
+        [education.major for education in instructor.educations.all()],
+        [experience.company for experience in instructor.experiences.all()],
+    )
+
+
+@pytest.fixture
+def hydrated(
+    instructor_factory,
+    profile_factory,
+    skill_factory,
+    education_factory,
+    experience_factory,
+):
+    def create(count):
+        instructors = instructor_factory.create_batch(count)
+        for instructor in instructors:
+            profile_factory(user=instructor.user)
+            skill_factory.create_batch(2, instructor=instructor)
+            education_factory.create_batch(2, instructor=instructor)
+            experience_factory.create_batch(2, instructor=instructor)
+        return instructors
+
+    return create
+
+
+@pytest.mark.django_db
+class TestInstructorSelectors:
+    @pytest.mark.parametrize("count", [1, 10])
+    def test_list_costs_constant_queries(
+        self, hydrated, count, django_assert_num_queries
+    ):
+        hydrated(count)
+
+        with django_assert_num_queries(QUERIES):
+            rendered = [render(i) for i in selectors.list_instructors()]
+
+        assert len(rendered) == count
+        assert all(len(skills) == 2 for _, _, skills, _, _ in rendered)
+
+    def test_list_filters_by_status(self, instructor_factory):
+        active = instructor_factory(active=True)
+        instructor_factory(not_active=True)
+
+        assert list(selectors.list_instructors(active=True)) == [active]
+
+    def test_get_instructor_by_pk_and_uuid(self, hydrated, django_assert_num_queries):
+        (instructor,) = hydrated(1)
+
+        with django_assert_num_queries(QUERIES):
+            render(selectors.get_instructor(instructor.pk))
+        with django_assert_num_queries(QUERIES):
+            render(selectors.get_instructor(uuid=instructor.user.uuid))
+
+    def test_get_instructor_missing(self):
+        with pytest.raises(Instructor.DoesNotExist):
+            selectors.get_instructor(0)
+
+    def test_get_instructor_needs_one_key(self):
+        with pytest.raises(TypeError):
+            selectors.get_instructor()
+
+    def test_get_instructors_keeps_order(self, hydrated, django_assert_num_queries):
+        first, second, third = hydrated(3)
+
+        with django_assert_num_queries(QUERIES):
+            by_pk = selectors.get_instructors([third.pk, 0, first.pk])
+            [render(instructor) for instructor in by_pk]
+        with django_assert_num_queries(QUERIES):
+            by_uuid = selectors.get_instructors(
+                uuids=[str(second.user.uuid), third.user.uuid]
+            )
+
+        assert by_pk == [third, first]
+        assert by_uuid == [second, third]
+
+    def test_experiences_current_first(self, instructor_factory, experience_factory):
+        instructor = instructor_factory()
+        past = experience_factory(
+            instructor=instructor, start=date(2020, 1, 1), end=date(2022, 1, 1)
+        )
+        older = experience_factory(
+            instructor=instructor, start=date(2015, 1, 1), end=date(2022, 1, 1)
+        )
+        current = experience_factory(
+            instructor=instructor, start=date(2010, 1, 1), still_working=True
+        )
+
+        instructor = selectors.get_instructor(instructor.pk)
+
+        assert list(instructor.experiences.all()) == [current, past, older]
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from apps.accounts.sessions import SessionStore
+from django.contrib.sessions.backends.base import UpdateError
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+
+def create_session(**data):
+    session = SessionStore()
+    session.update(data)
+    session.create()
+    return SessionStore(session.session_key)
+
+
+class TestSessionStore:
+    @pytest.fixture(autouse=True)
+    def cache_only(self, settings):
+        settings.ACCOUNTS_SESSION_WRITE_THROUGH = False
+
+    def test_round_trip(self):
+        session = create_session(foo="bar")
+
+        assert session["foo"] == "bar"
+
+    def test_unchanged_session_is_not_written(self):
+        session = create_session(foo="bar")
+        session["foo"] = "bar"
+
+        with mock.patch.object(cache, "set") as cache_set:
+            session.save()
+
+        cache_set.assert_not_called()
+
+    def test_changed_session_is_written(self):
+        session = create_session(foo="bar")
+        session["foo"] = "baz"
+        session.save()
+
+        assert SessionStore(session.session_key)["foo"] == "baz"
+
+    @override_settings(ACCOUNTS_SESSION_REFRESH_INTERVAL=0)
+    def test_unchanged_session_expiry_is_refreshed_after_interval(self):
+        session = create_session(foo="bar")
+        session.load()
+
+        with mock.patch.object(cache, "set") as cache_set:
+            session.save()
+
+        cache_set.assert_called_once()
+
+    def test_deleted_session_is_not_resurrected(self):
+        session = create_session(foo="bar")
+        assert session["foo"] == "bar"
+        SessionStore(session.session_key).delete()
+        session["foo"] = "baz"
+
+        with pytest.raises(UpdateError):
+            session.save()
+        assert not SessionStore().exists(session.session_key)
+
+    def test_cycle_key_keeps_data(self):
+        session = create_session(foo="bar")
+        old_key = session.session_key
+        session.cycle_key()
+
+        assert session.session_key != old_key
+        assert not session.exists(old_key)
+        assert SessionStore(session.session_key)["foo"] == "bar"
+
+
+@pytest.mark.django_db
+class TestWriteThrough:
+    def test_is_the_default(self, settings):
+        del settings.ACCOUNTS_SESSION_WRITE_THROUGH
+
+        assert SessionStore().write_through
+
+    def test_save_writes_to_database(self):
+        session = create_session(foo="bar")
+
+        stored = Session.objects.get(session_key=session.session_key)
+        assert session.decode(stored.session_data) == {"foo": "bar"}
+
+    def test_load_falls_back_to_database(self):
+        session = create_session(foo="bar")
+        cache.clear()
+
+        assert SessionStore(session.session_key)["foo"] == "bar"
+        assert cache.get(session.cache_key) is not None
+
+    def test_delete_removes_database_row(self):
+        session = create_session(foo="bar")
+        session.delete()
+
+        assert not Session.objects.filter(session_key=session.session_key).exists()
+
+
+@pytest.mark.django_db
+class TestPurgeSessions:
+    @pytest.fixture
+    def sessions(self):
+        now = timezone.now()
+        Session.objects.bulk_create(
+            Session(
+                session_key=f"session{i}",
+                session_data="",
+                expire_date=now + timedelta(days=1 if i % 2 else -1),
+            )
+            for i in range(10)
+        )
+
+    def test_deletes_expired_sessions_in_chunks(self, sessions, capsys):
+        call_command("purge_sessions", "--chunk-size", "2")
+
+        assert Session.objects.count() == 5
+        assert not Session.objects.filter(expire_date__lt=timezone.now()).exists()
+        assert capsys.readouterr().out.count("so far") == 3
+
+    def test_all_deletes_every_session(self, sessions):
+        call_command("purge_sessions", "--all")
+
+        assert not Session.objects.exists()
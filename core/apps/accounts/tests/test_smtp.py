@@ -0,0 +1,153 @@
+import smtplib
+import time
+
+import pytest
+from apps.accounts.mail import MailDispatcher
+from apps.accounts.mail.backends import AsyncSMTPEmailBackend
+from apps.accounts.mail.testing import SMTPStandIn
+from django.core.mail import EmailMessage
+
+BACKEND = "apps.accounts.mail.backends.AsyncSMTPEmailBackend"
+
+
+@pytest.fixture
+def server():
+    with SMTPStandIn() as server:
+        yield server
+
+
+def message(to="user@example.com", body="Hello"):
+    return EmailMessage("Subject", body, "support@eduport.com", [to])
+
+
+def backend(server, **kwargs):
+    kwargs.setdefault("pool_size", 4)
+    return AsyncSMTPEmailBackend(
+        host=server.host, port=server.port, use_tls=False, use_ssl=False, **kwargs
+    )
+
+
+class TestAsyncSMTPEmailBackend:
+    def test_sends_messages(self, server):
+        connection = backend(server)
+
+        sent = connection.send_messages(
+            [message(f"user{i}@example.com") for i in range(10)]
+        )
+
+        assert sent == 10
+        assert sorted(received.recipients[0] for received in server.messages) == sorted(
+            f"user{i}@example.com" for i in range(10)
+        )
+        assert server.messages[0].mail_from == "support@eduport.com"
+
+    def test_body_is_dot_stuffed(self, server):
+        backend(server).send_messages([message(body="first\n.second\n.")])
+
+        assert b"\r\n.second\r\n.\r\n" in server.messages[0].data
+
+    def test_sessions_are_capped_and_reused(self, server):
+        connection = backend(server, pool_size=3)
+        connection.open()
+        connection.send_messages([message() for _ in range(12)])
+        connection.send_messages([message() for _ in range(12)])
+        connection.close()
+
+        assert len(server.messages) == 24
+        assert server.connections == 3
+        assert server.max_concurrent == 3
+
+    @pytest.mark.parametrize("method", ["PLAIN", "LOGIN"])
+    def test_authenticates(self, server, method):
+        server.credentials = ("mailer", "secret")
+        server.auth_methods = (method,)
+        connection = backend(server, username="mailer", password="secret")
+
+        assert connection.send_messages([message()]) == 1
+
+    def test_wrong_credentials(self, server):
+        server.credentials = ("mailer", "secret")
+        connection = backend(server, username="mailer", password="wrong")
+
+        (error,) = connection.send_batch([message()])
+
+        assert isinstance(error, smtplib.SMTPAuthenticationError)
+        with pytest.raises(smtplib.SMTPAuthenticationError):
+            connection.send_messages([message()])
+
+    def test_reports_each_message(self, server):
+        server.refuse = {"refused@example.com"}
+
+        errors = backend(server).send_batch(
+            [message(), message("refused@example.com"), message()]
+        )
+
+        assert errors[0] is None and errors[2] is None
+        assert isinstance(errors[1], smtplib.SMTPRecipientsRefused)
+        assert len(server.messages) == 2
+
+    def test_reconnects_after_disconnect(self, server):
+        connection = backend(server, pool_size=1)
+        connection.open()
+        connection.send_messages([message()])
+        server.drop_next = True
+        connection.send_messages([message()])
+        connection.close()
+
+        assert len(server.messages) == 2
+        assert server.connections == 2
+
+    def test_rate_limits_per_domain(self, server):
+        connection = backend(server, rate_limits={"slow.example": 20})
+
+        started = time.monotonic()
+        connection.send_messages(
+            [message(f"user{i}@slow.example") for i in range(5)]
+            + [message(f"user{i}@fast.example") for i in range(20)]
+        )
+        elapsed = time.monotonic() - started
+
+        assert len(server.messages) == 25
+        assert elapsed >= 0.2
+
+    def test_rate_limits_survive_reopening(self, server):
+        connection = backend(server, rate_limits={"slow.example": 10})
+
+        started = time.monotonic()
+        for _ in range(2):
+            # Each call opens and closes the pool.
+            connection.send_messages(
+                [message(f"user{i}@slow.example") for i in range(3)]
+            )
+        elapsed = time.monotonic() - started
+
+        # Six messages at 10 per second; limits reset on open would allow 0.4s.
+        assert elapsed >= 0.45
+
+    def test_close_stops_and_closes_the_loop(self, server):
+        connection = backend(server)
+        connection.open()
+        loop, thread = connection._loop, connection._thread
+        connection.send_messages([message()])
+
+        connection.close()
+
+        assert not thread.is_alive()
+        assert loop.is_closed()
+
+
+def test_dispatcher_sends_batches_through_the_pool(server, settings):
+    settings.EMAIL_HOST = server.host
+    settings.EMAIL_PORT = server.port
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_USE_SSL = False
+    settings.ACCOUNTS_MAIL_POOL_SIZE = 2
+    server.refuse = {"refused@example.com"}
+    dispatcher = MailDispatcher(backend=BACKEND)
+
+    results = dispatcher.send([message(), message("refused@example.com"), message()])
+    dispatcher.close()
+
+    assert dispatcher.sends_batches
+    assert [result.sent for result in results] == [True, False, True]
+    assert server.connections == 2
@@ -0,0 +1,218 @@
+from datetime import date, timedelta
+from importlib import import_module
+
+import pytest
+from apps.accounts import selectors, summaries
+from apps.accounts.models import (
+    Education,
+    Experience,
+    InstructorSummary,
+    Skill,
+)
+from django.apps import apps
+from django.core.management import call_command
+from django.utils import timezone
+
+
+def summary(instructor):
+    return InstructorSummary.objects.get(instructor=instructor)
+
+
+def as_tuple(row):
+    return (
+        row.skill_count,
+        row.max_skill_rank,
+        row.highest_degree_rank,
+        row.experience_days,
+    )
+
+
+@pytest.fixture
+def instructor(instructor_factory):
+    return instructor_factory()
+
+
+@pytest.mark.django_db
+class TestInstructorSummary:
+    def test_created_with_instructor(self, instructor):
+        assert as_tuple(summary(instructor)) == (0, 0, 0, 0)
+
+    def test_skills_update_count_and_level(self, instructor, skill_factory):
+        skill_factory(instructor=instructor, basic=True)
+        advanced = skill_factory(instructor=instructor, advanced=True)
+
+        assert summary(instructor).skill_count == 2
+        assert summary(instructor).max_skill_level == Skill.Level.ADVANCED
+
+        advanced.delete()
+
+        assert summary(instructor).skill_count == 1
+        assert summary(instructor).max_skill_level == Skill.Level.BASIC
+
+    def test_changed_skill_level(self, instructor, skill_factory):
+        skill = skill_factory(instructor=instructor, advanced=True)
+
+        skill.level = Skill.Level.INTERMEDIATE
+        skill.save()
+
+        assert summary(instructor).skill_count == 1
+        assert summary(instructor).max_skill_level == Skill.Level.INTERMEDIATE
+
+    def test_skill_moved_to_another_instructor(
+        self, instructor, instructor_factory, skill_factory
+    ):
+        other = instructor_factory()
+        skill = skill_factory(instructor=instructor)
+
+        skill.instructor = other
+        skill.save()
+
+        assert summary(instructor).skill_count == 0
+        assert summary(other).skill_count == 1
+
+    def test_highest_degree(self, instructor, education_factory):
+        education_factory(instructor=instructor, bachelor=True)
+        doctorate = education_factory(instructor=instructor, doctorate=True)
+
+        assert summary(instructor).highest_degree == Education.Degree.DOCTORATE
+
+        doctorate.delete()
+
+        assert summary(instructor).highest_degree == Education.Degree.BACHELOR
+
+    def test_experience_days(self, instructor, experience_factory):
+        experience = experience_factory(
+            instructor=instructor, start=date(2020, 1, 1), end=date(2021, 1, 1)
+        )
+        experience_factory(
+            instructor=instructor,
+            start=timezone.localdate() - timedelta(days=10),
+            still_working=True,
+        )
+
+        assert summary(instructor).experience_days == 366 + 10
+
+        experience.end = date(2020, 2, 1)
+        experience.save()
+
+        assert summary(instructor).experience_days == 31 + 10
+
+    def test_overlapping_experience_counts_once(self, instructor, experience_factory):
+        experience_factory(
+            instructor=instructor,
+            level=Experience.Level.JUNIOR,
+            start=date(2020, 1, 1),
+            end=date(2021, 1, 1),
+        )
+        part_time = experience_factory(
+            instructor=instructor,
+            level=Experience.Level.SENIOR,
+            start=date(2020, 7, 1),
+            end=date(2021, 7, 1),
+        )
+
+        row = summary(instructor)
+        assert row.experience_days == 547
+        assert (row.junior_days, row.senior_days, row.mid_days) == (366, 365, 0)
+
+        part_time.delete()
+
+        row = summary(instructor)
+        assert (row.experience_days, row.senior_days) == (366, 0)
+
+    def test_unrelated_change_is_ignored(
+        self, instructor, skill_factory, django_assert_num_queries
+    ):
+        skill = skill_factory(instructor=instructor)
+
+        # The previous values are read, nothing is written to the summary or
+        # the search document.
+        with django_assert_num_queries(2):
+            skill.save()
+
+    def test_deleting_instructor_deletes_summary(self, instructor, skill_factory):
+        skill_factory(instructor=instructor)
+
+        instructor.delete()
+
+        assert not InstructorSummary.objects.exists()
+
+    def test_missing_summary_is_rebuilt(self, instructor, skill_factory):
+        InstructorSummary.objects.all().delete()
+
+        skill_factory(instructor=instructor, advanced=True)
+
+        assert as_tuple(summary(instructor)) == (1, 3, 0, 0)
+
+    def test_rebuild_matches_incremental_updates(
+        self,
+        instructor_factory,
+        skill_factory,
+        education_factory,
+        experience_factory,
+    ):
+        instructors = instructor_factory.create_batch(3)
+        for instructor in instructors:
+            skill_factory.create_batch(3, instructor=instructor)
+            education_factory.create_batch(2, instructor=instructor)
+            experience_factory.create_batch(2, instructor=instructor)
+        incremental = [as_tuple(summary(i)) for i in instructors]
+
+        InstructorSummary.objects.update(skill_count=99, experience_days=0)
+        call_command("rebuild_instructor_summaries", "--batch-size", "2")
+
+        assert [as_tuple(summary(i)) for i in instructors] == incremental
+
+    def test_list_instructors_filters_on_summary(
+        self, instructor_factory, skill_factory, education_factory
+    ):
+        expert = instructor_factory()
+        skill_factory(instructor=expert, advanced=True)
+        education_factory(instructor=expert, master=True)
+        novice = instructor_factory()
+        skill_factory(instructor=novice, basic=True)
+
+        assert list(
+            selectors.list_instructors(min_skill_level=Skill.Level.INTERMEDIATE)
+        ) == [expert]
+        assert list(
+            selectors.list_instructors(min_degree=Education.Degree.BACHELOR)
+        ) == [expert]
+        assert set(selectors.list_instructors(min_experience_years=0)) == {
+            expert,
+            novice,
+        }
+        assert not selectors.list_instructors(
+            min_experience_years=1, experience_level=Experience.Level.SENIOR
+        )
+
+    def test_rebuild_subset(self, instructor, instructor_factory):
+        instructor_factory()
+
+        assert summaries.rebuild([instructor.pk]) == 1
+
+    def test_backfill_migration_matches_rebuild(
+        self,
+        instructor_factory,
+        skill_factory,
+        education_factory,
+        experience_factory,
+    ):
+        migration = import_module(
+            "apps.accounts.migrations.0014_backfill_instructor_summaries"
+        )
+        instructors = instructor_factory.create_batch(3)
+        for instructor in instructors:
+            skill_factory.create_batch(3, instructor=instructor)
+            education_factory.create_batch(2, instructor=instructor)
+            experience_factory.create_batch(3, instructor=instructor)
+        fields = ["instructor_id", *summaries.SUMMARY_FIELDS[:-1]]
+        rebuilt = list(InstructorSummary.objects.order_by("pk").values_list(*fields))
+
+        InstructorSummary.objects.exclude(instructor=instructors[0]).delete()
+        InstructorSummary.objects.update(skill_count=99)
+        migration.backfill(apps, None)
+
+        backfilled = list(InstructorSummary.objects.order_by("pk").values_list(*fields))
+        assert backfilled[0][1] == 99
+        assert backfilled[1:] == rebuilt[1:]
@@ -0,0 +1,27 @@
+import pytest
+from apps.accounts.tasks.outbox import dispatch_outbox
+from apps.accounts.tasks.summaries import rebuild_instructor_summaries
+from config.celery import app
+
+
+def route(task):
+    return app.amqp.router.route({}, task.name)["queue"].name
+
+
+@pytest.mark.parametrize(
+    "task, queue",
+    [
+        (dispatch_outbox, "mail"),
+        (rebuild_instructor_summaries, "bulk"),
+    ],
+)
+def test_tasks_are_routed_to_their_queue(task, queue):
+    assert route(task) == queue
+
+
+def test_unrouted_tasks_use_the_default_queue():
+    assert app.amqp.router.route({}, "apps.other.tasks.job")["queue"].name == "default"
+
+
+def test_fire_and_forget_tasks_store_no_result():
+    assert dispatch_outbox.ignore_result
@@ -0,0 +1,318 @@
+from unittest import mock
+
+import pytest
+from apps.accounts import outbox, views
+from apps.accounts.authentication import EmailOrUsernameAuthentication
+from apps.accounts.models import OutboxEmail
+from apps.accounts.tokens import set_password_token_generator
+from asgiref.sync import async_to_sync
+from django.contrib.auth import SESSION_KEY, get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.tokens import default_token_generator
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import DatabaseError
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+User = get_user_model()
+
+PASSWORD = "Secret@1234"
+
+
+@pytest.fixture
+def active_user(user_factory):
+    user = user_factory(normal=True, email="view@test.com", username="view-user")
+    user.set_password(PASSWORD)
+    user.save()
+    return user
+
+
+def async_request(method, path, data=None):
+    request = getattr(AsyncRequestFactory(), method)(path, data)
+    SessionMiddleware(lambda request: None).process_request(request)
+    AuthenticationMiddleware(lambda request: None).process_request(request)
+    request._messages = FallbackStorage(request)
+    return request
+
+
+def activation_path(user):
+    return reverse(
+        "accounts_app:activate",
+        kwargs={
+            "uidb64": urlsafe_base64_encode(force_bytes(user.pk)),
+            "token": default_token_generator.make_token(user),
+        },
+    )
+
+
+def set_password_path(user, token_generator=set_password_token_generator):
+    return reverse(
+        "accounts_app:set-password",
+        kwargs={
+            "uidb64": urlsafe_base64_encode(force_bytes(user.pk)),
+            "token": token_generator.make_token(user),
+        },
+    )
+
+
+def register_data(email="new@test.com"):
+    return {
+        "email": email,
+        "password1": PASSWORD,
+        "password2": PASSWORD,
+        "terms_agreed": True,
+    }
+
+
+@pytest.mark.django_db
+class TestSyncViews:
+    def test_login(self, client, active_user):
+        response = client.post(
+            reverse("accounts_app:sign-in"),
+            {"login": active_user.email, "password": PASSWORD},
+        )
+
+        assert response.status_code == 302
+        assert client.session[SESSION_KEY] == str(active_user.pk)
+
+    def test_login_with_wrong_password(self, client, active_user):
+        response = client.post(
+            reverse("accounts_app:sign-in"),
+            {"login": active_user.email, "password": "Wrong@1234"},
+        )
+
+        assert response.status_code == 200
+        assert SESSION_KEY not in client.session
+
+    def test_register(self, client):
+        response = client.post(reverse("accounts_app:sign-up"), register_data())
+
+        assert response.status_code == 302
+        user = User.objects.get(email="new@test.com")
+        assert user.check_password(PASSWORD)
+        assert user.outbox_emails.get().status == OutboxEmail.Status.PENDING
+
+    def test_register_existing_email_in_other_case(self, client, active_user):
+        response = client.post(
+            reverse("accounts_app:sign-up"), register_data("View@test.com")
+        )
+
+        assert response.status_code == 200
+        assert User.objects.count() == 1
+
+    def test_register_rolls_back_user_without_outbox_email(self, client):
+        with mock.patch.object(
+            views.outbox, "queue_verification_email", side_effect=DatabaseError
+        ):
+            with pytest.raises(DatabaseError):
+                client.post(reverse("accounts_app:sign-up"), register_data())
+
+        assert not User.objects.filter(email="new@test.com").exists()
+
+    def test_activate(self, client, not_active_user):
+        response = client.get(activation_path(not_active_user))
+
+        assert response.status_code == 302
+        not_active_user.refresh_from_db()
+        assert not_active_user.is_active
+
+    def test_resend_activation_is_queued_once_per_window(
+        self, client, not_active_user, django_assert_num_queries
+    ):
+        path = reverse("accounts_app:re-activate")
+
+        with django_assert_num_queries(2):
+            response = client.post(path, {"email": not_active_user.email})
+        client.post(path, {"email": not_active_user.email})
+
+        assert response.status_code == 302
+        email = OutboxEmail.objects.get()
+        assert email.user == not_active_user
+        assert email.template == outbox.VERIFICATION_TEMPLATE
+
+    def test_resend_activation_email_in_other_case(self, client, not_active_user):
+        response = client.post(
+            reverse("accounts_app:re-activate"),
+            {"email": not_active_user.email.upper()},
+        )
+
+        assert response.status_code == 302
+        assert OutboxEmail.objects.get().user == not_active_user
+
+    def test_resend_activation_after_window(self, client, settings, not_active_user):
+        settings.ACCOUNTS_RESEND_ACTIVATION_WINDOW = -1
+        path = reverse("accounts_app:re-activate")
+
+        client.post(path, {"email": not_active_user.email})
+        client.post(path, {"email": not_active_user.email})
+
+        assert OutboxEmail.objects.count() == 2
+
+    def test_resend_activation_for_active_user(self, client, active_user):
+        response = client.post(
+            reverse("accounts_app:re-activate"), {"email": active_user.email}
+        )
+
+        assert response.status_code == 302
+        assert not OutboxEmail.objects.exists()
+
+
+@pytest.mark.django_db
+class TestSetPassword:
+    @pytest.fixture
+    def provisioned_user(self, user_factory):
+        user = user_factory(normal=True, email="set@test.com", is_active=False)
+        user.set_unusable_password()
+        user.save()
+        return user
+
+    def set_password(self, client, path):
+        response = client.get(path, follow=True)
+        if not response.context["validlink"]:
+            return response
+        return client.post(
+            response.redirect_chain[-1][0],
+            {"new_password1": PASSWORD, "new_password2": PASSWORD},
+        )
+
+    def test_sets_password_and_activates(self, client, provisioned_user):
+        response = self.set_password(client, set_password_path(provisioned_user))
+
+        assert response.status_code == 302
+        provisioned_user.refresh_from_db()
+        assert provisioned_user.is_active
+        assert client.login(email=provisioned_user.email, password=PASSWORD)
+
+    def test_link_is_single_use(self, client, provisioned_user):
+        path = set_password_path(provisioned_user)
+        self.set_password(client, path)
+
+        assert client.get(path, follow=True).context["validlink"] is False
+
+    def test_wrong_token(self, client, provisioned_user):
+        path = reverse(
+            "accounts_app:set-password",
+            kwargs={
+                "uidb64": urlsafe_base64_encode(force_bytes(provisioned_user.pk)),
+                "token": "abc-def",
+            },
+        )
+
+        assert client.get(path, follow=True).context["validlink"] is False
+
+    def test_activation_token_is_rejected(self, client, provisioned_user):
+        path = set_password_path(provisioned_user, default_token_generator)
+
+        assert client.get(path, follow=True).context["validlink"] is False
+
+    def test_user_with_password_is_rejected(self, client, active_user):
+        response = client.get(set_password_path(active_user), follow=True)
+
+        assert response.context["validlink"] is False
+
+    def test_set_password_token_does_not_activate(self, client, provisioned_user):
+        client.get(
+            reverse(
+                "accounts_app:activate",
+                kwargs={
+                    "uidb64": urlsafe_base64_encode(force_bytes(provisioned_user.pk)),
+                    "token": set_password_token_generator.make_token(provisioned_user),
+                },
+            )
+        )
+
+        provisioned_user.refresh_from_db()
+        assert not provisioned_user.is_active
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncViews:
+    def test_views_are_async(self):
+        assert views.AsyncLoginView.view_is_async
+        assert views.AsyncRegisterView.view_is_async
+        assert views.AsyncActivateAccountView.view_is_async
+
+    def test_login_page(self):
+        request = async_request("get", "/accounts/sign-in/")
+        response = async_to_sync(views.AsyncLoginView.as_view())(request)
+
+        assert response.status_code == 200
+
+    def test_login(self, active_user):
+        request = async_request(
+            "post",
+            "/accounts/sign-in/",
+            {"login": active_user.username, "password": PASSWORD, "remember": "on"},
+        )
+        response = async_to_sync(views.AsyncLoginView.as_view())(request)
+
+        assert response.status_code == 302
+        assert request.session[SESSION_KEY] == str(active_user.pk)
+        assert request.session.get_expiry_age() == 1209600
+
+    def test_login_does_not_authenticate_synchronously(self, active_user):
+        request = async_request(
+            "post",
+            "/accounts/sign-in/",
+            {"login": active_user.email, "password": PASSWORD},
+        )
+        with mock.patch.object(
+            EmailOrUsernameAuthentication, "authenticate", autospec=True
+        ) as authenticate:
+            response = async_to_sync(views.AsyncLoginView.as_view())(request)
+
+        assert response.status_code == 302
+        authenticate.assert_not_called()
+
+    def test_login_with_wrong_password(self, active_user):
+        request = async_request(
+            "post",
+            "/accounts/sign-in/",
+            {"login": active_user.username, "password": "Wrong@1234"},
+        )
+        response = async_to_sync(views.AsyncLoginView.as_view())(request)
+
+        assert response.status_code == 200
+        assert SESSION_KEY not in request.session
+
+    def test_register(self):
+        request = async_request("post", "/accounts/sign-up/", register_data())
+        response = async_to_sync(views.AsyncRegisterView.as_view())(request)
+
+        assert response.status_code == 302
+        user = User.objects.get(email="new@test.com")
+        assert user.check_password(PASSWORD)
+        assert user.outbox_emails.count() == 1
+
+    def test_register_existing_email(self, active_user):
+        request = async_request(
+            "post", "/accounts/sign-up/", register_data(active_user.email.upper())
+        )
+        response = async_to_sync(views.AsyncRegisterView.as_view())(request)
+
+        assert response.status_code == 200
+        assert not OutboxEmail.objects.exists()
+
+    def test_activate(self, not_active_user):
+        request = async_request("get", activation_path(not_active_user))
+        uidb64, token = request.path.strip("/").split("/")[-2:]
+        response = async_to_sync(views.AsyncActivateAccountView.as_view())(
+            request, uidb64=uidb64, token=token
+        )
+
+        assert response.status_code == 302
+        not_active_user.refresh_from_db()
+        assert not_active_user.is_active
+
+    def test_activate_with_invalid_token(self, not_active_user):
+        request = async_request("get", "/")
+        response = async_to_sync(views.AsyncActivateAccountView.as_view())(
+            request, uidb64="MQ", token="invalid"
+        )
+
+        assert response.status_code == 302
+        not_active_user.refresh_from_db()
+        assert not not_active_user.is_active
@@ -0,0 +1,14 @@
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+
+
+class SetPasswordTokenGenerator(PasswordResetTokenGenerator):
+    """
+    Tokens for the links that let a provisioned user without a password
+    choose one. Their own salt keeps activation and password reset tokens
+    from being accepted in their place, and the other way round.
+    """
+
+    key_salt = "apps.accounts.tokens.SetPasswordTokenGenerator"
+
+
+set_password_token_generator = SetPasswordTokenGenerator()
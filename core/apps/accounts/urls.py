@@ -1,24 +1,47 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import (
     ActivateAccountView,
+    AsyncActivateAccountView,
+    AsyncLoginView,
+    AsyncRegisterView,
     LoginView,
     LogoutView,
     RegisterView,
     ResendActivateEmailView,
+    SetPasswordView,
 )
 
 app_name = "accounts_app"
 
+if settings.ACCOUNTS_ASYNC_VIEWS:
+    login_view, register_view, activate_view = (
+        AsyncLoginView,
+        AsyncRegisterView,
+        AsyncActivateAccountView,
+    )
+else:
+    login_view, register_view, activate_view = (
+        LoginView,
+        RegisterView,
+        ActivateAccountView,
+    )
+
 
 urlpatterns = [
-    path("sign-in/", LoginView.as_view(), name="sign-in"),
+    path("sign-in/", login_view.as_view(), name="sign-in"),
     path("sign-out/", LogoutView.as_view(), name="sign-out"),
-    path("sign-up/", RegisterView.as_view(), name="sign-up"),
+    path("sign-up/", register_view.as_view(), name="sign-up"),
     path(
         "verify/activate/<uidb64>/<token>/",
-        ActivateAccountView.as_view(),
+        activate_view.as_view(),
         name="activate",
     ),
     path("verify/resend/", ResendActivateEmailView.as_view(), name="re-activate"),
+    path(
+        "password/set/<uidb64>/<token>/",
+        SetPasswordView.as_view(),
+        name="set-password",
+    ),
 ]
@@ -13,3 +13,33 @@ def validate_phone(value):
 
     if not phone_regex.match(value):
         raise ValidationError(_("Please enter a valid phone number."))
+
+
+def validate_password_strength(value):
+    """
+    Validates that the password is at least 8 characters long, mixes upper
+    and lower case letters and uses at least one of the special characters
+    @ # $ % ! _, with no other symbols.
+    """
+
+    if len(value) < 8:
+        raise ValidationError(_("Password must be at least 8 characters long."))
+
+    if not any(char.isupper() for char in value):
+        raise ValidationError(_("Password must contain at least one uppercase letter."))
+
+    if not any(char.islower() for char in value):
+        raise ValidationError(_("Password must contain at least one lowercase letter."))
+
+    special_chars = "@#$%!_"
+    if not any(char in special_chars for char in value):
+        raise ValidationError(
+            _("Password must contain at least one special character (@ # $ % ! _).")
+        )
+
+    if not re.fullmatch(r"[a-zA-Z0-9@#$%!_]+", value):
+        raise ValidationError(
+            _(
+                "Password can only contain English letters, numbers, and special characters (@ # $ % ! _)."
+            )
+        )
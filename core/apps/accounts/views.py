@@ -1,18 +1,22 @@
-import uuid
-
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth import get_user_model, login, logout
+from django.contrib.auth import alogin, get_user_model, login, logout
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.tokens import default_token_generator
+from django.contrib.auth.views import PasswordResetConfirmView
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 from django.utils.http import urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
 from django.views import View
 
-from .forms import LoginForm, RegisterForm, ResendActivateForm
-from .tasks.mail import send_verification_email
+from . import outbox
+from .forms import LoginForm, RegisterForm, ResendActivateForm, SetPasswordForm
+from .hashing import HashingQueueFull
+from .tokens import set_password_token_generator
 
 # Create your views here.
 
@@ -75,22 +79,24 @@ class RegisterView(View):
             cleaned_data = form.cleaned_data
 
             email = cleaned_data.get("email")
-            username = self._generate_username(email)
+            username = User.objects.generate_username(email)
             password = cleaned_data.get("password1")
 
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                password=password,
-            )
-
-            # send verification email
-            mail_subject = "Please activate your account"
-            email_template = "emails/account_verification_email.html"
-            send_verification_email.delay(
-                user.pk, get_current_site(request).domain, mail_subject, email_template
-            )
-            #  send_verification_email.delay(user.pk, get_current_site(request).domain, mail_subject, email_template)
+            # The verification email is written to the outbox in the same
+            # transaction as the user and sent by the dispatch_outbox task.
+            try:
+                User.objects.create_user(
+                    username=username,
+                    email=email,
+                    password=password,
+                    on_create=self.queue_verification_email(request),
+                )
+            except HashingQueueFull:
+                form.add_error(
+                    None,
+                    _("The server is busy right now. Please try again in a moment."),
+                )
+                return render(request, self.template_name, context={"form": form})
 
             messages.success(
                 request,
@@ -102,9 +108,9 @@ class RegisterView(View):
 
         return render(request, self.template_name, context={"form": form})
 
-    def _generate_username(self, email):
-        base_username = email.split("@")[0]
-        return f"{base_username}-{uuid.uuid4().hex[:8]}"
+    def queue_verification_email(self, request):
+        domain = get_current_site(request).domain
+        return lambda user: outbox.queue_verification_email(user, domain)
 
 
 class ActivateAccountView(View):
@@ -131,6 +137,34 @@ class ActivateAccountView(View):
         return redirect("home_app:home")
 
 
+class SetPasswordView(PasswordResetConfirmView):
+    """
+    Lets a user choose a password from an emailed link, such as an
+    instructor provisioned from an approved application, who has none. The
+    link proves the email address, so the account is activated too.
+
+    Links are signed by set_password_token_generator, so activation links
+    aren't accepted, and users who already have a password are refused.
+    """
+
+    form_class = SetPasswordForm
+    template_name = "accounts/set_password.html"
+    success_url = reverse_lazy("accounts_app:sign-in")
+    token_generator = set_password_token_generator
+
+    def get_user(self, uidb64):
+        user = super().get_user(uidb64)
+        if user is not None and user.has_usable_password():
+            return None
+        return user
+
+    def form_valid(self, form):
+        form.user.is_active = True
+        response = super().form_valid(form)
+        messages.success(self.request, _("Your password is set. You can sign in now."))
+        return response
+
+
 class ResendActivateEmailView(View):
     template_name = "accounts/resend_activate.html"
     success_url = reverse_lazy("accounts_app:sign-in")
@@ -146,7 +180,7 @@ class ResendActivateEmailView(View):
     def post(self, request):
         form = ResendActivateForm(request.POST)
         if form.is_valid():
-            user = User.objects.get(email=form.cleaned_data.get("email"))
+            user = form.get_user()
 
             if user.is_active:
                 messages.info(
@@ -154,14 +188,7 @@ class ResendActivateEmailView(View):
                 )
                 return redirect(self.success_url)
 
-            # send verification email
-            mail_subject = "Please activate your account"
-            email_template = "emails/account_verification_email.html"
-
-            send_verification_email(
-                user.pk, get_current_site(request).domain, mail_subject, email_template
-            )
-            #  send_verification_email.delay(user.pk, get_current_site(request).domain, mail_subject, email_template)
+            self._enqueue_verification_email(user, get_current_site(request).domain)
 
             messages.success(
                 request,
@@ -170,3 +197,123 @@ class ResendActivateEmailView(View):
             return redirect(self.success_url)
 
         return render(request, self.template_name, context={"form": form})
+
+    def _enqueue_verification_email(self, user, domain):
+        # The email goes through the outbox like the one sent on sign-up.
+        # Repeated resends within the window collapse into the email that is
+        # already queued.
+        key = f"accounts:resend-activation:{user.pk}"
+        window = getattr(settings, "ACCOUNTS_RESEND_ACTIVATION_WINDOW", 60)
+        if not cache.add(key, True, window):
+            return
+
+        try:
+            outbox.queue_verification_email(user, domain)
+        except Exception:
+            cache.delete(key)
+            raise
+
+
+# Async variants of the views above, used when ACCOUNTS_ASYNC_VIEWS is set and
+# the project is served through config.asgi. Template rendering stays
+# synchronous and is run in a thread explicitly.
+
+arender = sync_to_async(render)
+
+
+class AsyncLoginView(LoginView):
+    async def get(self, request):
+        user = await request.auser()
+        if user.is_authenticated:
+            messages.info(request, _("You are already logged in!"))
+            return redirect(self.success_url)
+
+        form = LoginForm()
+        return await arender(request, self.template_name, context={"form": form})
+
+    async def post(self, request):
+        form = LoginForm(request.POST)
+        if await form.ais_valid():
+            user = form.get_user()
+            if user:
+                await alogin(request, user)
+
+                if form.cleaned_data.get("remember"):
+                    await request.session.aset_expiry(1209600)
+                else:
+                    await request.session.aset_expiry(0)
+
+                messages.success(request, _("You're logged in!"))
+
+                return redirect(self.success_url)
+
+        return await arender(request, self.template_name, context={"form": form})
+
+
+class AsyncRegisterView(RegisterView):
+    async def get(self, request):
+        user = await request.auser()
+        if user.is_authenticated:
+            messages.info(request, _("You are already logged in!"))
+            return redirect(self.success_url)
+        form = RegisterForm()
+        return await arender(request, self.template_name, context={"form": form})
+
+    async def post(self, request):
+        form = RegisterForm(request.POST)
+
+        if await form.ais_valid():
+            cleaned_data = form.cleaned_data
+
+            email = cleaned_data.get("email")
+            username = User.objects.generate_username(email)
+            password = cleaned_data.get("password1")
+
+            try:
+                await User.objects.acreate_user(
+                    username=username,
+                    email=email,
+                    password=password,
+                    on_create=self.queue_verification_email(request),
+                )
+            except HashingQueueFull:
+                form.add_error(
+                    None,
+                    _("The server is busy right now. Please try again in a moment."),
+                )
+                return await arender(
+                    request, self.template_name, context={"form": form}
+                )
+
+            messages.success(
+                request,
+                _(
+                    "Your account has been created. Please check your email to verify your account."
+                ),
+            )
+            return redirect(self.success_url)
+
+        return await arender(request, self.template_name, context={"form": form})
+
+
+class AsyncActivateAccountView(ActivateAccountView):
+    async def get(self, request, uidb64, token):
+        if (await request.auser()).is_authenticated:
+            messages.info(request, "You are already logged in.")
+            return redirect("home_app:home")
+
+        try:
+            uid = urlsafe_base64_decode(uidb64).decode()
+            user = await User.objects.aget(pk=uid)
+        except (TypeError, ValueError, OverflowError, User.DoesNotExist):
+            user = None
+
+        if user and default_token_generator.check_token(user, token):
+            user.is_active = True
+            await user.asave()
+            messages.success(request, "Congratulations! Your account is activated.")
+
+        else:
+            messages.error(request, "Invalid activation link.")
+
+        return redirect("home_app:home")
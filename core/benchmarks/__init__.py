@@ -0,0 +1,30 @@
+"""
+Standalone benchmarks for the project.
+
+Each module is runnable from the ``core`` directory against the configured
+database, for example::
+
+    python -m benchmarks.bench_authentication --help
+
+Benchmarks write their fixtures inside a transaction that is rolled back
+before they exit.
+"""
+
+import os
+import time
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+    import django
+
+    django.setup()
+
+
+def measure(func, iterations):
+    """Runs func the given number of times and returns the elapsed seconds."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return time.perf_counter() - started
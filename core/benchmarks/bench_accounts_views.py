@@ -0,0 +1,169 @@
+"""
+Concurrent sign-ins and sign-ups per process: the sync views behind the WSGI
+handler against the async views behind the ASGI handler.
+
+Both paths go through the full middleware stack via Django's test clients,
+with the given number of requests in flight at once: a thread pool drives
+the WSGI handler, asyncio.gather() the ASGI one. Sign-ups write their
+verification emails to the outbox, which isn't dispatched. Fixture users and
+registered accounts, with their outbox emails, are deleted before exiting.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from . import setup
+
+PASSWORD = "Secret@1234"
+
+
+def build_urlconf(views, asynchronous):
+    from django.urls import include, path
+
+    prefix = "Async" if asynchronous else ""
+    accounts = [
+        path(
+            "sign-in/", getattr(views, f"{prefix}LoginView").as_view(), name="sign-in"
+        ),
+        path("sign-out/", views.LogoutView.as_view(), name="sign-out"),
+        path(
+            "sign-up/",
+            getattr(views, f"{prefix}RegisterView").as_view(),
+            name="sign-up",
+        ),
+        path(
+            "verify/activate/<uidb64>/<token>/",
+            getattr(views, f"{prefix}ActivateAccountView").as_view(),
+            name="activate",
+        ),
+        path(
+            "verify/resend/",
+            views.ResendActivateEmailView.as_view(),
+            name="re-activate",
+        ),
+    ]
+    urlconf = types.ModuleType(f"{__name__}.{prefix.lower() or 'sync'}_urls")
+    urlconf.urlpatterns = [
+        path("", include("apps.home.urls")),
+        path("accounts/", include((accounts, "accounts_app"))),
+    ]
+    return urlconf
+
+
+def run_wsgi(requests, concurrency):
+    from django.db import connection
+    from django.test import Client
+
+    local = threading.local()
+
+    def call(request):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        path, data = request
+        response = local.client.post(path, data)
+        local.client.cookies.clear()
+        assert response.status_code == 302, response.status_code
+
+    def close(_):
+        connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, requests))
+        list(pool.map(close, range(concurrency)))
+    return time.perf_counter() - started
+
+
+def run_asgi(requests, concurrency):
+    from django.test import AsyncClient
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(request):
+            async with semaphore:
+                path, data = request
+                response = await AsyncClient().post(path, data)
+                assert response.status_code == 302, response.status_code
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call(request) for request in requests))
+        return time.perf_counter() - started
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts import views
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+
+    User = get_user_model()
+    run_id = uuid.uuid4().hex[:8]
+    domain = f"bench-{run_id}.test"
+
+    user = User.objects.create_user(
+        username=f"bench-{run_id}",
+        email=f"login@{domain}",
+        password=PASSWORD,
+        is_active=True,
+    )
+    counter = iter(range(10**9))
+
+    def sign_ins():
+        return [
+            ("/accounts/sign-in/", {"login": user.email, "password": PASSWORD})
+            for _ in range(args.requests)
+        ]
+
+    def sign_ups():
+        return [
+            (
+                "/accounts/sign-up/",
+                {
+                    "email": f"user{next(counter)}@{domain}",
+                    "password1": PASSWORD,
+                    "password2": PASSWORD,
+                    "terms_agreed": "on",
+                },
+            )
+            for _ in range(args.requests)
+        ]
+
+    handlers = {
+        "WSGI (sync views)": (run_wsgi, False),
+        "ASGI (async views)": (run_asgi, True),
+    }
+
+    print(f"{args.requests} requests, {args.concurrency} in flight")
+    print(f"{'handler':<22}{'sign-ins/s':>14}{'sign-ups/s':>14}")
+    try:
+        for name, (run, asynchronous) in handlers.items():
+            with override_settings(
+                ALLOWED_HOSTS=["testserver"],
+                ROOT_URLCONF=build_urlconf(views, asynchronous),
+            ):
+                logins = run(sign_ins(), args.concurrency)
+                registrations = run(sign_ups(), args.concurrency)
+            print(
+                f"{name:<22}{args.requests / logins:>14.1f}"
+                f"{args.requests / registrations:>14.1f}"
+            )
+    finally:
+        User.objects.filter(email__endswith=f"@{domain}").delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Time taken by the row counts of a user changelist: exact COUNT(*) against
+the estimates of apps.accounts.pagination.ApproximateCountPaginator.
+
+"table" counts every user, which the estimate reads from pg_class.reltuples;
+"filtered" counts active users, which the estimate takes from EXPLAIN. The
+count cache is bypassed. Fixture users are written inside a transaction that
+is rolled back before exiting. PostgreSQL only.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+
+from . import setup
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts.pagination import estimate_count
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+
+    if connection.vendor != "postgresql":
+        parser.exit(1, "Row estimates need PostgreSQL.\n")
+
+    User = get_user_model()
+    run_id = uuid.uuid4().hex[:8]
+
+    with transaction.atomic():
+        User.objects.bulk_create(
+            (
+                User(
+                    email=f"count{index}-{run_id}@bench.test",
+                    username=f"count{index}-{run_id}",
+                    password="!",
+                    is_active=index % 3 != 0,
+                )
+                for index in range(args.users)
+            ),
+            batch_size=10_000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+
+        querysets = {
+            "table": User.objects.all(),
+            "filtered": User.objects.filter(is_active=True),
+        }
+        print(f"{args.users} users, median of {args.repeat}")
+        print(
+            f"{'count':<10}{'exact ms':>10}{'rows':>10}{'estimate ms':>13}{'rows':>10}"
+        )
+        for name, queryset in querysets.items():
+            exact_ms, exact = timed(queryset.count, args.repeat)
+            estimate_ms, estimate = timed(lambda: estimate_count(queryset), args.repeat)
+            print(
+                f"{name:<10}{exact_ms:>10.2f}{exact:>10}"
+                f"{estimate_ms:>13.2f}{estimate:>10}"
+            )
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Latency of admin searches as they are typed, one keystroke at a time: the
+admin's own search against apps.accounts.admin_search.
+
+Each search is the query a changelist or autocomplete page runs, the first
+20 matches newest first, for every prefix of a few words taken from the
+fixture. "admin" is ModelAdmin.get_search_results() without the search
+indexes, "indexed" is admin_search.search() with them. Fixture users,
+profiles, instructors and skills are written inside a transaction that is
+rolled back before exiting.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from . import setup
+
+FIRST_NAMES = (
+    "james mary robert patricia john jennifer michael linda david elizabeth "
+    "william barbara richard susan joseph jessica thomas sarah charles karen "
+    "reza sara ali maryam mohammad zahra hossein fatemeh mehdi narges"
+).split()
+LAST_NAMES = (
+    "smith johnson williams brown jones garcia miller davis rodriguez martinez "
+    "hernandez lopez gonzalez wilson anderson taylor moore jackson martin lee "
+    "ahmadi hosseini karimi rahimi moradi jafari rezaei mousavi sadeghi"
+).split()
+DOMAINS = "gmail.com yahoo.com outlook.com eduport.ir example.org".split()
+SKILLS = "python rust physics algebra biology history design marketing".split()
+
+SEARCHES = {
+    # (admin, the words typed)
+    "user autocomplete": ("user", ["hernandez", "reza"]),
+    "instructor autocomplete": ("instructor", ["moradi", "marketing"]),
+    "profile changelist": ("profile", ["jafari"]),
+    "skill changelist": ("skill", ["outlook"]),
+}
+
+
+def keystrokes(word):
+    return [word[:length] for length in range(1, len(word) + 1)]
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--instructors", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts import admin_search
+    from apps.accounts.admin import (
+        InstructorAdmin,
+        ProfileAdmin,
+        SkillAdmin,
+        UserAdmin,
+    )
+    from apps.accounts.models import Instructor, Profile, Skill
+    from django.contrib import admin
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    User = get_user_model()
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+    now = timezone.now()
+    admins = {
+        "user": admin.ModelAdmin(User, admin.site),
+        "profile": admin.ModelAdmin(Profile, admin.site),
+        "instructor": admin.ModelAdmin(Instructor, admin.site),
+        "skill": admin.ModelAdmin(Skill, admin.site),
+    }
+    search_fields = {
+        "user": UserAdmin.search_fields,
+        "profile": ProfileAdmin.search_fields,
+        "instructor": InstructorAdmin.search_fields,
+        "skill": SkillAdmin.search_fields,
+    }
+
+    def admin_results(name, term):
+        model_admin = admins[name]
+        model_admin.search_fields = search_fields[name]
+        queryset, _ = model_admin.get_search_results(
+            None, model_admin.model.objects.all(), term
+        )
+        return list(queryset.order_by("-created_at", "-pk")[:20])
+
+    def indexed_results(name, term):
+        queryset = admin_search.search(
+            admins[name].model.objects.all(), search_fields[name], term
+        )
+        return list(queryset.order_by("-created_at", "-pk")[:20])
+
+    with transaction.atomic():
+        # The indexes are built after loading, as they would be on an
+        # existing table, and dropped again by the rollback.
+        admin_search.uninstall(connection)
+        names = [
+            (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(args.users)
+        ]
+        for start in range(0, args.users, 50_000):
+            users = User.objects.bulk_create(
+                User(
+                    email=f"{first}.{last}{index}-{run_id}@{rng.choice(DOMAINS)}",
+                    username=f"{first}{last}{index}",
+                    password="!",
+                    created_at=now - timedelta(seconds=index),
+                )
+                for index, (first, last) in enumerate(
+                    names[start : start + 50_000], start
+                )
+            )
+            Profile.objects.bulk_create(
+                Profile(
+                    user=user,
+                    first_name=first,
+                    last_name=last,
+                    phone=f"0912{rng.randrange(10**7):07d}",
+                )
+                for user, (first, last) in zip(users, names[start : start + 50_000])
+            )
+            if start == 0:
+                instructors = Instructor.objects.bulk_create(
+                    Instructor(
+                        user=user,
+                        birthdate=date(1990, 1, 1),
+                        experience_year=5,
+                        job_title=f"{rng.choice(SKILLS)} teacher",
+                        job_start_date=date(2015, 1, 1),
+                        resume="Instructor_resume/bench.pdf",
+                    )
+                    for user in users[: args.instructors]
+                )
+                Skill.objects.bulk_create(
+                    Skill(
+                        instructor=instructor,
+                        name=rng.choice(SKILLS),
+                        level=Skill.Level.BASIC,
+                    )
+                    for instructor in instructors
+                    for _ in range(2)
+                )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        print(
+            f"{args.users} users and profiles, {len(instructors)} instructors, "
+            f"median of {args.repeat} ({connection.vendor})"
+        )
+        results = {}
+        for label, func in (("admin", admin_results), ("indexed", indexed_results)):
+            if label == "indexed":
+                with connection.cursor() as cursor:
+                    if connection.vendor == "postgresql":
+                        # Indexes can't be built under pending foreign key
+                        # checks.
+                        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                    admin_search.install(connection)
+                    cursor.execute("ANALYZE")
+            for search, (name, words) in SEARCHES.items():
+                for word in words:
+                    for term in keystrokes(word):
+                        results[label, search, term] = timed(
+                            lambda: func(name, term), args.repeat
+                        )
+
+        print(f"{'search':<24}{'term':<12}{'admin ms':>10}{'indexed ms':>12}")
+        for search, (name, words) in SEARCHES.items():
+            for word in words:
+                for term in keystrokes(word):
+                    print(
+                        f"{search:<24}{term:<12}"
+                        f"{results['admin', search, term]:>10.2f}"
+                        f"{results['indexed', search, term]:>12.2f}"
+                    )
+        worst = {
+            label: max(ms for key, ms in results.items() if key[0] == label)
+            for label in ("admin", "indexed")
+        }
+        print(
+            f"slowest keystroke: admin {worst['admin']:.2f} ms, "
+            f"indexed {worst['indexed']:.2f} ms"
+        )
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
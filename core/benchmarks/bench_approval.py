@@ -0,0 +1,100 @@
+"""
+Time taken to approve instructor applications: one at a time, the way a
+reviewer's approval would provision each applicant, against the batches of
+apps.accounts.approval.
+
+"one by one" creates each user and profile with create_user(), its
+instructor with save(), which fills in the summary and search document
+through the post_save signals, and its outbox email, then marks the
+application approved. "batched" is approval.approve(). Fixture applications
+are written inside a transaction that is rolled back before exiting.
+"""
+
+import argparse
+import time
+import uuid
+
+from . import setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--applications", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts import approval, outbox
+    from apps.accounts.models import ApplyInstructor, Instructor
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+
+    User = get_user_model()
+    run_id = uuid.uuid4().hex[:8]
+
+    def create_applications(label):
+        return ApplyInstructor.objects.bulk_create(
+            ApplyInstructor(
+                first_name="Bench",
+                last_name=f"Applicant{index}",
+                phone=f"09{label}{index:08d}",
+                gender=ApplyInstructor.Gender.FEMALE,
+                email=f"apply{index}-{label}-{run_id}@bench.test",
+                address="Tehran",
+                resume="Instructor_resume/bench.pdf",
+            )
+            for index in range(args.applications)
+        )
+
+    def one_by_one(applications):
+        for application in applications:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=application.email,
+                    username=User.objects.generate_username(application.email),
+                    is_active=False,
+                    profile={
+                        "first_name": application.first_name,
+                        "last_name": application.last_name,
+                        "phone": application.phone,
+                        "gender": application.gender,
+                        "full_address": application.address,
+                    },
+                )
+                Instructor.objects.create(user=user, resume=application.resume.name)
+                outbox.queue_approval_emails([user], "bench.test")
+                application.status = ApplyInstructor.STATUS.APPROVED
+                application.save(update_fields=["status", "updated_at"])
+
+    def batched(applications):
+        approval.approve(
+            ApplyInstructor.objects.filter(pk__in=[a.pk for a in applications]),
+            "bench.test",
+            batch_size=args.batch_size,
+        )
+
+    with transaction.atomic():
+        print(
+            f"{args.applications} applications, batches of {args.batch_size} "
+            f"({connection.vendor})"
+        )
+        print(f"{'approval':<14}{'seconds':>10}{'per application ms':>22}")
+        # Digits after the 09 prefix keep the two sets' phones apart.
+        for label, digit, func in (
+            ("one by one", 1, one_by_one),
+            ("batched", 2, batched),
+        ):
+            applications = create_applications(digit)
+            started = time.perf_counter()
+            func(applications)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:<14}{elapsed:>10.2f}"
+                f"{elapsed * 1000 / args.applications:>22.2f}"
+            )
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Login attempts per second on a single core, before and after consolidating
+the authentication backends.
+
+"before" replays the old backend chain: ModelBackend followed by the
+original OR-query EmailOrUsernameAuthentication, so a failed login by email
+hashes the password twice. "after" is the consolidated backend.
+"""
+
+import argparse
+
+from . import measure, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--attempts", type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts.authentication import EmailOrUsernameAuthentication
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.backends import BaseBackend, ModelBackend
+    from django.db import transaction
+    from django.db.models import Q
+
+    User = get_user_model()
+
+    class LegacyEmailOrUsernameAuthentication(BaseBackend):
+        def authenticate(self, request, username, password=None, **kwargs):
+            user = User.objects.filter(Q(email=username) | Q(username=username)).first()
+            if user and user.check_password(password):
+                return user
+            return None
+
+    chains = {
+        "before": [ModelBackend(), LegacyEmailOrUsernameAuthentication()],
+        "after": [EmailOrUsernameAuthentication()],
+    }
+    scenarios = {
+        "success by email": ("bench@test.com", "Secret@1234"),
+        "wrong password by email": ("bench@test.com", "wrong-password"),
+        "wrong password by username": ("bench-user", "wrong-password"),
+        "unknown email": ("nobody@test.com", "wrong-password"),
+    }
+
+    def authenticate(backends, login, password):
+        # Same short-circuiting as django.contrib.auth.authenticate().
+        for backend in backends:
+            user = backend.authenticate(None, username=login, password=password)
+            if user is not None:
+                return user
+
+    with transaction.atomic():
+        User.objects.create_user(
+            username="bench-user",
+            email="bench@test.com",
+            password="Secret@1234",
+            is_active=True,
+        )
+
+        print(f"{'scenario':<28}{'before':>12}{'after':>12}  attempts/s/core")
+        for name, (login, password) in scenarios.items():
+            rates = []
+            for backends in chains.values():
+                elapsed = measure(
+                    lambda: authenticate(backends, login, password), args.attempts
+                )
+                rates.append(args.attempts / elapsed)
+            print(f"{name:<28}{rates[0]:>12.1f}{rates[1]:>12.1f}")
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
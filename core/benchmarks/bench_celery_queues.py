@@ -0,0 +1,114 @@
+"""
+End-to-end latency per Celery queue under a mixed load.
+
+A burst of slow bulk tasks is published together with short tasks on the
+mail queue, and every task records how long it waited between publishing
+and starting. "shared" runs one worker that consumes every queue, as before
+the queues were split; "dedicated" runs a worker for the mail queue and
+another for bulk and default, as in production.
+
+Workers run in this process. The broker defaults to the in-memory transport
+and can be pointed at a real one with --broker.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+from . import setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--broker", default="memory://")
+    parser.add_argument("--bulk-tasks", type=int, default=200)
+    parser.add_argument("--bulk-duration", type=float, default=0.02)
+    parser.add_argument("--mail-tasks", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    setup()
+
+    from celery.contrib.testing.worker import start_worker
+    from config.celery import app
+
+    app.conf.update(
+        broker_url=args.broker,
+        result_backend=None,
+        broker_transport_options={"polling_interval": 0.01},
+    )
+
+    latencies = defaultdict(list)
+    finished = threading.Semaphore(0)
+
+    @app.task(name="benchmarks.record", ignore_result=True)
+    def record(queue, published, duration=0):
+        latencies[queue].append(time.time() - published)
+        time.sleep(duration)
+        finished.release()
+
+    layouts = {
+        "shared": [["mail", "bulk", "default"]],
+        "dedicated": [["mail"], ["bulk", "default"]],
+    }
+
+    for layout, workers in layouts.items():
+        latencies.clear()
+        with _workers(start_worker, app, workers, args.concurrency):
+            # Interleave the mail tasks with the bulk burst.
+            every = max(args.bulk_tasks // max(args.mail_tasks, 1), 1)
+            mail_sent = 0
+            for number in range(args.bulk_tasks):
+                record.apply_async(
+                    ("bulk", time.time(), args.bulk_duration), queue="bulk"
+                )
+                if number % every == 0 and mail_sent < args.mail_tasks:
+                    record.apply_async(("mail", time.time()), queue="mail")
+                    mail_sent += 1
+
+            for _ in range(args.bulk_tasks + mail_sent):
+                finished.acquire()
+
+        print(f"{layout}:")
+        for queue, values in sorted(latencies.items()):
+            p50, p95 = (
+                statistics.quantiles(values, n=20, method="inclusive")[i]
+                for i in (9, 18)
+            )
+            print(
+                f"  {queue:>5}: p50 {p50 * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms"
+                f"  max {max(values) * 1000:8.1f} ms"
+            )
+
+
+class _workers:
+    # Each worker group is `concurrency` solo workers, which take one message
+    # at a time like prefork children. Thread pools in the blocking worker
+    # loop only ack every 2 seconds, which would dominate the numbers.
+
+    def __init__(self, start_worker, app, queue_groups, concurrency):
+        self.contexts = [
+            start_worker(
+                app,
+                pool="solo",
+                queues=queues,
+                perform_ping_check=False,
+                loglevel="WARNING",
+            )
+            for queues in queue_groups
+            for _ in range(concurrency)
+        ]
+
+    def __enter__(self):
+        for context in self.contexts:
+            context.__enter__()
+
+    def __exit__(self, *exc_info):
+        for context in reversed(self.contexts):
+            context.__exit__(*exc_info)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Instructors' experience computed per second from synthetic job rows.
+
+"sum" adds up each job's duration, as the summary used to, and counts
+overlapping jobs twice. "union" runs the sort-and-sweep of
+apps.accounts.intervals.experience_totals, overall and per level. Rows are
+generated in memory in the order the database returns them, so the numbers
+exclude database time.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from . import setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--jobs-per-instructor", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts.intervals import experience_totals
+    from apps.accounts.models import Experience
+
+    rng = random.Random(args.seed)
+    levels = Experience.Level.values
+    today = date(2024, 1, 1)
+    first = date(2000, 1, 1).toordinal()
+    rows = []
+    for index in range(args.rows):
+        start = date.fromordinal(first + rng.randrange(8000))
+        end = (
+            None
+            if rng.random() < 0.1
+            else start + timedelta(days=rng.randrange(1, 1500))
+        )
+        rows.append((index // args.jobs_per_instructor, rng.choice(levels), start, end))
+    rows.sort(key=lambda row: (row[0], row[2]))
+    instructors = rows[-1][0] + 1
+
+    def summed():
+        totals = {}
+        for instructor_id, _, start, end in rows:
+            days = ((end or today) - start).days
+            totals[instructor_id] = totals.get(instructor_id, 0) + max(days, 0)
+        return totals
+
+    def union():
+        return {pk: days for pk, days, _ in experience_totals(rows, today)}
+
+    for name, func in (("sum", summed), ("union", union)):
+        started = time.perf_counter()
+        totals = func()
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:>5}: {instructors / elapsed:10.0f} instructors/s, "
+            f"{len(rows) / elapsed:10.0f} rows/s, "
+            f"{sum(totals.values()) / instructors / 365.25:5.1f} years on average"
+        )
+
+
+if __name__ == "__main__":
+    main()
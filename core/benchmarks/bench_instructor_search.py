@@ -0,0 +1,142 @@
+"""
+Instructor searches per second: the admin's icontains lookups against the
+full-text index of apps.accounts.search.
+
+"icontains" ORs case-insensitive substring matches over the instructor's job
+title and its skills, educations and experiences, as the admin search_fields
+do, and takes the first page of distinct instructors. "full-text" ranks the
+same words with search.rank(). Fixture instructors are written inside a
+transaction that is rolled back before exiting.
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import date
+
+from . import setup
+
+WORDS = (
+    "python rust physics algebra biology history design marketing finance "
+    "chemistry music drawing statistics databases networks security robotics "
+    "economics literature philosophy teaching nursing accounting law"
+).split()
+COMPANIES = "acme globex initech umbrella hooli stark wayne wonka".split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instructors", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts import search
+    from apps.accounts.models import Education, Experience, Instructor, Skill
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+    from django.db.models import Q
+
+    User = get_user_model()
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+    queries = [
+        " ".join(rng.sample(WORDS, rng.choice((1, 1, 2)))) for _ in range(args.queries)
+    ]
+
+    def icontains(query):
+        condition = Q()
+        for word in query.split():
+            condition &= (
+                Q(job_title__icontains=word)
+                | Q(skills__name__icontains=word)
+                | Q(educations__major__icontains=word)
+                | Q(educations__institution__icontains=word)
+                | Q(experiences__job_title__icontains=word)
+                | Q(experiences__company__icontains=word)
+            )
+        return list(
+            Instructor.objects.filter(condition)
+            .distinct()
+            .order_by("-created_at")
+            .values_list("pk", flat=True)[:20]
+        )
+
+    def full_text(query):
+        return search.rank(query, limit=20)
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            User(
+                email=f"search{index}-{run_id}@bench.test",
+                username=f"search{index}-{run_id}",
+                password="!",
+            )
+            for index in range(args.instructors)
+        )
+        instructors = Instructor.objects.bulk_create(
+            Instructor(
+                user=user,
+                birthdate=date(1990, 1, 1),
+                experience_year=5,
+                job_title=f"{rng.choice(WORDS)} teacher",
+                job_start_date=date(2015, 1, 1),
+                resume="Instructor_resume/bench.pdf",
+            )
+            for user in users
+        )
+        for model, build in (
+            (
+                Skill,
+                lambda i: Skill(
+                    instructor=i, name=rng.choice(WORDS), level=Skill.Level.BASIC
+                ),
+            ),
+            (
+                Education,
+                lambda i: Education(
+                    instructor=i,
+                    major=rng.choice(WORDS),
+                    degree=Education.Degree.BACHELOR,
+                    institution=f"{rng.choice(WORDS)} university",
+                    start=date(2008, 1, 1),
+                ),
+            ),
+            (
+                Experience,
+                lambda i: Experience(
+                    instructor=i,
+                    job_title=f"{rng.choice(WORDS)} lecturer",
+                    company=rng.choice(COMPANIES),
+                    level=Experience.Level.MID,
+                    start=date(2012, 1, 1),
+                ),
+            ),
+        ):
+            model.objects.bulk_create(build(i) for i in instructors for _ in range(2))
+        search.rebuild(instructor.pk for instructor in instructors)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        print(
+            f"{args.instructors} instructors, {args.queries} queries "
+            f"({connection.vendor})"
+        )
+        for name, func in (("icontains", icontains), ("full-text", full_text)):
+            func(queries[0])
+            started = time.perf_counter()
+            for query in queries:
+                func(query)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>10}: {args.queries / elapsed:8.1f} queries/s, "
+                f"{elapsed / args.queries * 1000:7.2f} ms/query"
+            )
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
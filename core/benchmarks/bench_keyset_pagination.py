@@ -0,0 +1,88 @@
+"""
+Latency of user listing pages by depth: OFFSET pagination against keyset
+pagination over (created_at, id).
+
+"offset" fetches the page through django.core.paginator.Paginator, as the
+admin used to, without its COUNT(*). "keyset" fetches it through
+apps.accounts.pagination.KeysetPaginator from the cursor a client would
+hold on the previous page. Fixture users are written inside a transaction
+that is rolled back before exiting.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from . import setup
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=120_000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts.pagination import FORWARD, ORDERING, KeysetPaginator
+    from django.contrib.auth import get_user_model
+    from django.core.paginator import Paginator
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    User = get_user_model()
+    run_id = uuid.uuid4().hex[:8]
+    now = timezone.now()
+
+    with transaction.atomic():
+        User.objects.bulk_create(
+            (
+                User(
+                    email=f"page{index}-{run_id}@bench.test",
+                    username=f"page{index}-{run_id}",
+                    password="!",
+                    created_at=now - timedelta(seconds=index),
+                )
+                for index in range(args.users)
+            ),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        queryset = User.objects.order_by(*ORDERING)
+        offset = Paginator(queryset, args.per_page)
+        keyset = KeysetPaginator(queryset, args.per_page)
+        # Pages are reached by offset here only to find the cursors.
+        boundaries = {
+            number: offset.page(number - 1)[-1] for number in args.pages if number > 1
+        }
+
+        print(
+            f"{User.objects.count()} users, {args.per_page} per page, "
+            f"median of {args.repeat} ({connection.vendor})"
+        )
+        print(f"{'page':>6}{'offset ms':>12}{'keyset ms':>12}")
+        for number in args.pages:
+            cursor = keyset.cursor(boundaries[number], FORWARD) if number > 1 else None
+            offset_ms = timed(lambda: list(offset.page(number)), args.repeat)
+            keyset_ms = timed(lambda: list(keyset.page(cursor)), args.repeat)
+            print(f"{number:>6}{offset_ms:>12.2f}{keyset_ms:>12.2f}")
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Messages sent per second through AsyncSMTPEmailBackend at several pool sizes.
+
+Mail goes to an in-process SMTP stand-in that waits --latency seconds before
+every reply, which imitates the round trips to a remote relay. "smtplib" is
+Django's SMTP backend sending the same messages one by one over a single
+connection, as the worker did before.
+"""
+
+import argparse
+
+from . import measure, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.accounts.mail.backends import AsyncSMTPEmailBackend
+    from apps.accounts.mail.testing import SMTPStandIn
+    from django.core.mail import EmailMessage
+    from django.core.mail.backends.smtp import EmailBackend
+
+    messages = [
+        EmailMessage(
+            "Please activate your account",
+            "<p>Activate</p>",
+            "noreply@test.com",
+            [f"user{number}@test.com"],
+        )
+        for number in range(args.messages)
+    ]
+
+    with SMTPStandIn(latency=args.latency) as server:
+        options = {
+            "host": server.host,
+            "port": server.port,
+            "username": "",
+            "password": "",
+            "timeout": 10,
+        }
+        backends = [("smtplib", EmailBackend(use_tls=False, use_ssl=False, **options))]
+        backends += [
+            (f"pool={size}", AsyncSMTPEmailBackend(pool_size=size, **options))
+            for size in args.pool_sizes
+        ]
+
+        for name, backend in backends:
+            backend.open()
+            try:
+                backend.send_messages(messages)
+                elapsed = measure(lambda: backend.send_messages(messages), args.rounds)
+            finally:
+                backend.close()
+            rate = args.messages * args.rounds / elapsed
+            print(f"{name:>8}: {rate:10.0f} messages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,10 @@ import os
 
 from celery import Celery
 
-# TODO: change this in production stage.
+# The environment decides which settings module is used (production sets
+# DJANGO_SETTINGS_MODULE=config.settings.production); local is the fallback.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
 
 app = Celery("config")
-app.config_from_object("config.settings.local", namespace="CELERY")
+app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
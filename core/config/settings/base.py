@@ -13,8 +13,10 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from os import path
 from pathlib import Path
 
+from celery.schedules import crontab
 from decouple import config
 from django.contrib.messages import constants as messages
+from kombu import Queue
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -67,6 +69,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# Route sign-in, sign-up and activation to their native async views. Enable
+# when serving config.asgi.application.
+ACCOUNTS_ASYNC_VIEWS = config("ACCOUNTS_ASYNC_VIEWS", cast=bool, default=False)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -87,6 +93,16 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashes run off the request thread, in a bounded process pool.
+ACCOUNTS_HASHING_EXECUTOR = config(
+    "ACCOUNTS_HASHING_EXECUTOR",
+    default="apps.accounts.hashing.ProcessPoolHashingExecutor",
+)
+ACCOUNTS_HASHING_WORKERS = config("ACCOUNTS_HASHING_WORKERS", cast=int, default=2)
+ACCOUNTS_HASHING_MAX_QUEUE = config("ACCOUNTS_HASHING_MAX_QUEUE", cast=int, default=64)
+ACCOUNTS_HASHING_START_METHOD = "forkserver"
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -116,12 +132,115 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 CELERY_BROKER_URL = config("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND")
+CELERY_RESULT_EXPIRES = 3600
+CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+
+# Verification mail is latency sensitive and gets its own queue, so the
+# outbox dispatch never waits behind bulk or background jobs. In production run one worker
+# per group, e.g.:
+#   celery -A config.celery worker -Q mail -c 8
+#   celery -A config.celery worker -Q bulk,default -c 2
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_QUEUES = (
+    Queue("mail", routing_key="mail"),
+    Queue("bulk", routing_key="bulk"),
+    Queue("default", routing_key="default"),
+)
+CELERY_TASK_ROUTES = {
+    "apps.accounts.tasks.outbox.dispatch_outbox": {"queue": "mail"},
+    "apps.accounts.tasks.summaries.rebuild_instructor_summaries": {"queue": "bulk"},
+}
+# Priorities order tasks within a queue (RabbitMQ: 0-10, higher runs first).
+CELERY_TASK_QUEUE_MAX_PRIORITY = 10
+CELERY_TASK_DEFAULT_PRIORITY = 5
+
+# Workers take one task at a time and acknowledge it once it has run, so a
+# long task doesn't hold prefetched messages back from idle workers and a
+# killed worker's task is redelivered.
+CELERY_WORKER_PREFETCH_MULTIPLIER = config(
+    "CELERY_WORKER_PREFETCH_MULTIPLIER", cast=int, default=1
+)
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_TASK_SOFT_TIME_LIMIT = 60
+CELERY_TASK_TIME_LIMIT = 90
+
+# Backend used by the mail dispatcher (defaults to EMAIL_BACKEND). Set it to
+# apps.accounts.mail.backends.AsyncSMTPEmailBackend to send each batch over a
+# pool of concurrent SMTP sessions, rate limited per recipient domain
+# (messages per second, e.g. {"gmail.com": 20}).
+ACCOUNTS_MAIL_BACKEND = config("ACCOUNTS_MAIL_BACKEND", default=None)
+ACCOUNTS_MAIL_POOL_SIZE = config("ACCOUNTS_MAIL_POOL_SIZE", cast=int, default=8)
+ACCOUNTS_MAIL_DOMAIN_RATE_LIMITS = {}
+ACCOUNTS_MAIL_DEFAULT_DOMAIN_RATE = None
+
+# Activation email resends for the same user within this many seconds are
+# dropped in favour of the one already queued.
+ACCOUNTS_RESEND_ACTIVATION_WINDOW = 60
+
+# Emails written to the outbox are sent by the dispatch_outbox task, in
+# batches, with exponential backoff (in seconds) between failed attempts.
+ACCOUNTS_OUTBOX_BATCH_SIZE = 100
+ACCOUNTS_OUTBOX_MAX_BATCHES = 10
+ACCOUNTS_OUTBOX_MAX_ATTEMPTS = 5
+ACCOUNTS_OUTBOX_RETRY_DELAY = 30
+ACCOUNTS_OUTBOX_RETRY_DELAY_MAX = 3600
+ACCOUNTS_OUTBOX_LEASE = 300
+
+CELERY_BEAT_SCHEDULE = {
+    "dispatch-outbox": {
+        "task": "apps.accounts.tasks.outbox.dispatch_outbox",
+        "schedule": config("ACCOUNTS_OUTBOX_POLL_INTERVAL", cast=float, default=5.0),
+    },
+    "rebuild-instructor-summaries": {
+        "task": "apps.accounts.tasks.summaries.rebuild_instructor_summaries",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
 
 AUTH_USER_MODEL = "accounts.User"
 
 
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+
+SESSION_ENGINE = "apps.accounts.sessions"
+SESSION_CACHE_ALIAS = "default"
+# Also store sessions in django_session so they survive a cache flush or
+# restart, and are seen by every worker while the cache above is the
+# process-local default. Only turn off with a shared cache backend.
+ACCOUNTS_SESSION_WRITE_THROUGH = config(
+    "ACCOUNTS_SESSION_WRITE_THROUGH", cast=bool, default=True
+)
+# Unchanged sessions get their expiry refreshed at most this often (seconds).
+ACCOUNTS_SESSION_REFRESH_INTERVAL = 300
+
+# Users resolved on every authenticated request are kept in the shared cache
+# above, with a short-lived in-process LRU in front of it.
+ACCOUNTS_USER_CACHE_ALIAS = "default"
+ACCOUNTS_USER_CACHE_TIMEOUT = config(
+    "ACCOUNTS_USER_CACHE_TIMEOUT", cast=int, default=300
+)
+ACCOUNTS_USER_CACHE_LOCAL_SIZE = 1024
+ACCOUNTS_USER_CACHE_LOCAL_TIMEOUT = 5
+ACCOUNTS_USER_CACHE_SELECT_PROFILE = True
+
+# Admin changelists of large tables show the planner's row estimate instead
+# of an exact COUNT(*) once it reaches this many rows, and keep either count
+# in the cache above for a few seconds.
+ACCOUNTS_APPROXIMATE_COUNT_THRESHOLD = config(
+    "ACCOUNTS_APPROXIMATE_COUNT_THRESHOLD", cast=int, default=100_000
+)
+ACCOUNTS_COUNT_CACHE_TIMEOUT = 30
+
+
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
     "apps.accounts.authentication.EmailOrUsernameAuthentication",
 ]
 
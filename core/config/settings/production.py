@@ -25,3 +25,18 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+
+
+# Cache
+# Sessions, the user cache and activation resend coalescing must be shared by
+# every worker process; the process-local default of base.py would split
+# them. See the accounts.W001 check.
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.redis.RedisCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION"),
+    }
+}
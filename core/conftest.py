@@ -1,4 +1,6 @@
 import pytest
+from apps.accounts import admin_search, search
+from apps.accounts.cache import user_cache
 from apps.accounts.tests.factories import (
     ApplyInstructorFactory,
     EducationFactory,
@@ -9,6 +11,8 @@ from apps.accounts.tests.factories import (
     UserFactory,
 )
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from pytest_factoryboy import register
 
 register(UserFactory)
@@ -20,6 +24,24 @@ register(EducationFactory)
 register(ExperienceFactory)
 
 
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    # The test database is built from the models, without the full-text
+    # and admin search indexes that the migrations add.
+    with django_db_blocker.unblock():
+        search.install(connection)
+        admin_search.install(connection)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+    user_cache.clear_local()
+    yield
+    cache.clear()
+    user_cache.clear_local()
+
+
 # ------------------- User -----------------
 @pytest.fixture
 def normal_user(user_factory):
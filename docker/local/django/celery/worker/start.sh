@@ -5,4 +5,4 @@ set -o nounset
 
 cd /app
 
-exec watchfiles celery.__main__.main  --args '-A config.celery worker -l INFO'
\ No newline at end of file
+exec watchfiles celery.__main__.main  --args '-A config.celery worker -B -l INFO'
\ No newline at end of file